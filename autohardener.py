@@ -6,6 +6,8 @@ Single‑file hardener that enforces a canonical FastAPI `app/main.py`
 inside a target project directory.
 
 - Embedded template for app/main.py
+- Declarative multi-file rules (.veil/harden.yaml) with stat/hash change detection
+- Fleet scan (--scan ROOT): parallel drift report as JSON, with a hash cache
 - Unified diff output
 - Dry‑run vs write mode
 - Linux‑native paths only
@@ -14,8 +16,15 @@ inside a target project directory.
 import argparse
 import datetime
 import difflib
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 
 # ---------------------------------------------------------------------------
@@ -92,46 +101,406 @@ def compute_diff(current: str, desired: str, rel_path: Path) -> str:
     return "".join(diff)
 
 
-def ensure_main(target_root: Path, dry_run: bool) -> Tuple[bool, bool]:
+# ---------------------------------------------------------------------------
+# Rule engine
+# ---------------------------------------------------------------------------
+#
+# Rules are declared per project in .veil/harden.yaml (or --rules FILE):
+#
+#   templates:
+#     gitignore:
+#       file: templates/gitignore        # relative to the rules file
+#     banner:
+#       content: "# 🔱 Veil service\n"
+#   rules:
+#     - path: app/main.py
+#       template: fastapi_main           # built-in, see BUILTIN_TEMPLATES
+#     - path: .gitignore
+#       template: gitignore
+#     - glob: "services/*/README.md"     # only files that already exist
+#       template: banner
+#
+# Without a rules file the single built-in app/main.py rule applies.
+#
+# Fast path: .veil/harden_state.json keeps (inode, size, mtime_ns, sha256) of
+# every file last seen matching its template. A file whose stat data is
+# unchanged costs one stat(); a file is read and hashed only when its stat
+# changed, and diffed only when its hash differs from the template's.
+
+RULES_REL_PATH = Path(".veil/harden.yaml")
+STATE_REL_PATH = Path(".veil/harden_state.json")
+STATE_VERSION = 1
+
+# An mtime this close to the moment it was recorded may still change without
+# a visible stat difference (coarse timestamps), so such stamps are not trusted.
+RACY_WINDOW_NS = 2_000_000_000
+
+BUILTIN_TEMPLATES: Dict[str, str] = {"fastapi_main": MAIN_TEMPLATE}
+
+
+@dataclass(frozen=True)
+class Rule:
+    """Enforce `template` on one path (relative to the target root)."""
+    path: Path
+    template: str
+    template_name: str = ""
+
+    @property
+    def digest(self) -> str:
+        return _sha256(self.template.encode("utf-8"))
+
+
+@dataclass(frozen=True)
+class RuleResult:
+    rule: Rule
+    changed: bool
+    created: bool
+    diff: str = ""
+
+
+DEFAULT_RULES = (Rule(MAIN_REL_PATH, MAIN_TEMPLATE, "fastapi_main"),)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _template_text(name: str, spec: Any, base: Path) -> str:
+    if isinstance(spec, str):
+        return spec
+    if not isinstance(spec, dict) or ("file" in spec) == ("content" in spec):
+        raise ValueError(f"Template {name!r} needs exactly one of 'file' or 'content'")
+    if "content" in spec:
+        return str(spec["content"])
+    return (base / str(spec["file"])).read_text(encoding="utf-8")
+
+
+def _inside(target_root: Path, rel: Path) -> bool:
+    """Whether target_root / rel, symlinks resolved, is still under target_root."""
+    return (target_root / rel).resolve().is_relative_to(target_root.resolve())
+
+
+def load_rules(target_root: Path, rules_path: Optional[Path] = None) -> List[Rule]:
     """
-    Ensure app/main.py matches MAIN_TEMPLATE.
+    Rules for a target: rules_path, else <target>/.veil/harden.yaml, else
+    DEFAULT_RULES. Glob rules are expanded against existing files.
 
-    Returns:
-        (changed, created)
+    Raises:
+        ValueError: a malformed rule, or one that reaches outside target_root
+    """
+    if rules_path is None:
+        rules_path = target_root / RULES_REL_PATH
+        if not rules_path.exists():
+            return list(DEFAULT_RULES)
+
+    import yaml  # only needed for declarative rules
+
+    try:
+        data = yaml.safe_load(rules_path.read_text(encoding="utf-8")) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"Rules file is not valid YAML: {rules_path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Rules file must be a mapping: {rules_path}")
+    base = rules_path.parent
+    templates = dict(BUILTIN_TEMPLATES)
+    for name, spec in (data.get("templates") or {}).items():
+        templates[str(name)] = _template_text(str(name), spec, base)
+
+    rules: Dict[Path, Rule] = {}
+    for i, raw in enumerate(data.get("rules") or []):
+        if not isinstance(raw, dict) or ("path" in raw) == ("glob" in raw):
+            raise ValueError(f"Rule #{i + 1} in {rules_path} needs exactly one of 'path' or 'glob'")
+        name = str(raw.get("template", ""))
+        if "content" in raw:
+            template = str(raw["content"])
+        elif name in templates:
+            template = templates[name]
+        else:
+            raise ValueError(f"Rule #{i + 1} in {rules_path}: unknown template {name!r}")
+
+        key = "path" if "path" in raw else "glob"
+        rel = Path(str(raw[key]))
+        if rel.is_absolute() or ".." in rel.parts:
+            raise ValueError(f"Rule #{i + 1} in {rules_path}: {key} must stay inside the target: {rel}")
+        if key == "path":
+            paths = [rel]
+        else:
+            paths = sorted(p.relative_to(target_root) for p in target_root.glob(str(rel)) if p.is_file())
+            for p in paths:
+                # Matches may still lead out through a symlink.
+                if not _inside(target_root, p):
+                    raise ValueError(f"Rule #{i + 1} in {rules_path}: {p} resolves outside the target")
+        for rel in paths:
+            # A later rule for the same path wins.
+            rules[rel] = Rule(rel, template, name)
+    return list(rules.values())
+
+
+class _StampCache:
+    """
+    (inode, size, mtime_ns) -> sha256 stamps of files, persisted as JSON.
+
+    Used per target for the files last seen matching their template, and by
+    the fleet scan for every file it hashed. Thread-safe.
     """
-    target_path = target_root / MAIN_REL_PATH
-    rel_display = MAIN_REL_PATH
 
-    # Ensure parent directory exists
-    target_path.parent.mkdir(parents=True, exist_ok=True)
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        self._lock = threading.Lock()
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == STATE_VERSION and isinstance(data.get("files"), dict):
+                self.files = data["files"]
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def lookup(self, key: str, st: os.stat_result) -> Optional[str]:
+        """The cached hash if the file's stat data is unchanged (and not racy)."""
+        e = self.files.get(key)
+        if (
+            e is not None
+            and e.get("ino") == st.st_ino
+            and e.get("size") == st.st_size
+            and e.get("mtime_ns") == st.st_mtime_ns
+            and e.get("checked_ns", 0) - st.st_mtime_ns > RACY_WINDOW_NS
+        ):
+            return e.get("sha256")
+        return None
+
+    def store(self, key: str, st: os.stat_result, digest: str) -> None:
+        with self._lock:
+            self.files[key] = {
+                "ino": st.st_ino,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "sha256": digest,
+                "checked_ns": time.time_ns(),
+            }
+            self.dirty = True
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            if self.files.pop(key, None) is not None:
+                self.dirty = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self.dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_text(json.dumps({"version": STATE_VERSION, "files": self.files}, sort_keys=True), encoding="utf-8")
+            tmp.replace(self.path)
+            self.dirty = False
+
+
+def _apply_rule(target_root: Path, rule: Rule, dry_run: bool, state: _StampCache, label: str) -> RuleResult:
+    target_path = target_root / rule.path
+    desired = rule.template.encode("utf-8")
+    digest = rule.digest
 
-    if target_path.exists():
-        current = target_path.read_text(encoding="utf-8")
-        if current == MAIN_TEMPLATE:
-            return False, False
+    try:
+        st: Optional[os.stat_result] = target_path.stat()
+    except FileNotFoundError:
+        st = None
+
+    if st is not None:
+        if state.lookup(str(rule.path), st) == digest:
+            return RuleResult(rule, False, False)
+        # A size mismatch already proves a change; only same-size files need hashing.
+        current = target_path.read_bytes()
+        if st.st_size == len(desired) and _sha256(current) == digest:
+            state.store(str(rule.path), st, digest)
+            return RuleResult(rule, False, False)
+        current_text = current.decode("utf-8", errors="replace")
+    else:
+        current_text = ""
+
+    state.forget(str(rule.path))
+    diff = compute_diff(current_text, rule.template, Path(label) / rule.path if label else rule.path)
+    if not dry_run:
+        if not _inside(target_root, rule.path):
+            raise ValueError(f"Refusing to write {rule.path}: it resolves outside {target_root}")
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        target_path.write_bytes(desired)
+        state.store(str(rule.path), target_path.stat(), digest)
+    return RuleResult(rule, True, st is None, diff)
+
+
+def apply_rules(
+    target_root: Path,
+    dry_run: bool,
+    rules: Optional[Sequence[Rule]] = None,
+    *,
+    label: str = "",
+) -> List[RuleResult]:
+    """
+    Enforce every rule on a target without printing anything.
+
+    Safe to call in-process and from several threads at once (one target each).
+    In dry-run mode nothing is written, including the stat/hash state.
+
+    Args:
+        rules: defaults to load_rules(target_root)
+        label: prefix for the file names in diffs (e.g. the target path)
+    """
+    if rules is None:
+        rules = load_rules(target_root)
+    state = _StampCache(target_root / STATE_REL_PATH)
+    results = [_apply_rule(target_root, rule, dry_run, state, label) for rule in rules]
+    if not dry_run:
+        state.save()
+    return results
+
+
+def apply_main(target_root: Path, dry_run: bool) -> Tuple[bool, bool, str]:
+    """
+    Bring app/main.py in line with MAIN_TEMPLATE without printing anything.
+
+    Returns:
+        (changed, created, diff)
+    """
+    (r,) = apply_rules(target_root, dry_run, DEFAULT_RULES)
+    return r.changed, r.created, r.diff
 
-        log(f"[DIFF] {rel_display}")
-        diff = compute_diff(current, MAIN_TEMPLATE, rel_display)
-        print(diff, end="")
 
+def ensure_rules(target_root: Path, dry_run: bool, rules: Optional[Sequence[Rule]] = None) -> List[RuleResult]:
+    """
+    Apply every rule, printing the diff of each changed file.
+    """
+    results = apply_rules(target_root, dry_run, rules)
+    for r in results:
+        if not r.changed:
+            continue
+        target_path = target_root / r.rule.path
+        log(f"[DIFF] {r.rule.path}")
+        print(r.diff, end="")
         if dry_run:
             log(f"[DRY‑RUN] Would write {target_path}")
         else:
-            target_path.write_text(MAIN_TEMPLATE, encoding="utf-8")
             log(f"[WRITE] Wrote {target_path}")
-        return True, False
+    return results
 
-    # File does not exist — create it
-    log(f"[DIFF] {rel_display}")
-    diff = compute_diff("", MAIN_TEMPLATE, rel_display)
-    print(diff, end="")
 
-    if dry_run:
-        log(f"[DRY‑RUN] Would write {target_path}")
-    else:
-        target_path.write_text(MAIN_TEMPLATE, encoding="utf-8")
-        log(f"[WRITE] Wrote {target_path}")
-    return True, True
+def ensure_main(target_root: Path, dry_run: bool) -> Tuple[bool, bool]:
+    """
+    Ensure app/main.py matches MAIN_TEMPLATE, printing the diff.
+
+    Returns:
+        (changed, created)
+    """
+    (r,) = ensure_rules(target_root, dry_run, DEFAULT_RULES)
+    return r.changed, r.created
+
+
+# ---------------------------------------------------------------------------
+# Fleet scan
+# ---------------------------------------------------------------------------
+#
+# --scan ROOT finds every service under ROOT (a directory with app/main.py or
+# a .veil/harden.yaml) and reports drift from the templates without writing
+# anything to the services. Hashes are cached across scans in SCAN_CACHE_PATH,
+# keyed by absolute path, so a repeat scan of an unchanged fleet is one stat()
+# per enforced file.
+
+SCAN_CACHE_PATH = Path("/opt/veil_os/cache/harden_scan.json")
+
+# Never descended into while looking for services.
+SCAN_SKIP_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv", ".tox", ".mypy_cache"})
+
+SCAN_REPORT_VERSION = 1
+
+
+def find_services(root: Path) -> List[Path]:
+    """Service directories under root (root included), in sorted order."""
+    found: List[Path] = []
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            entries = list(os.scandir(d))
+        except OSError:
+            continue
+        names = {e.name for e in entries}
+        if ("app" in names and (d / MAIN_REL_PATH).is_file()) or (".veil" in names and (d / RULES_REL_PATH).is_file()):
+            found.append(d)
+        for e in entries:
+            if e.name not in SCAN_SKIP_DIRS and not e.name.startswith(".") and e.is_dir(follow_symlinks=False):
+                stack.append(Path(e.path))
+    return sorted(found)
+
+
+def scan_service(service: Path, cache: _StampCache) -> Dict[str, Any]:
+    """Drift of one service's files against its rules (read-only)."""
+    files: List[Dict[str, Any]] = []
+    stats = {"hashed": 0, "cached": 0}
+    try:
+        rules = load_rules(service)
+    except (OSError, ValueError) as e:
+        return {"path": str(service), "error": f"{type(e).__name__}: {e}", "drift": 0, "files": []}
+
+    for rule in rules:
+        path = service / rule.path
+        entry: Dict[str, Any] = {"path": str(rule.path), "template": rule.template_name or None}
+        try:
+            st = path.stat()
+            key = str(path)
+            digest = cache.lookup(key, st)
+            if digest is None:
+                digest = _sha256(path.read_bytes())
+                cache.store(key, st, digest)
+                stats["hashed"] += 1
+            else:
+                stats["cached"] += 1
+        except FileNotFoundError:
+            entry["status"] = "missing"
+            files.append(entry)
+            continue
+        except OSError as e:
+            entry.update(status="error", error=str(e))
+            files.append(entry)
+            continue
+        entry.update(status="ok" if digest == rule.digest else "drift", sha256=digest)
+        files.append(entry)
+
+    drift = sum(f["status"] != "ok" for f in files)
+    return {"path": str(service), "drift": drift, "files": files, **stats}
+
+
+def scan_fleet(root: Path, *, workers: Optional[int] = None, cache_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Scan every service under root in parallel and return a JSON-ready report:
+    {"version", "root", "generated_at", "duration_ms", "summary", "services"}.
+    """
+    started = time.perf_counter()
+    cache = _StampCache(SCAN_CACHE_PATH if cache_path is None else cache_path)
+    services = find_services(root)
+    workers = max(1, min(workers or (os.cpu_count() or 1) * 4, len(services) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda svc: scan_service(svc, cache), services))
+    try:
+        cache.save()
+    except OSError as e:
+        log(f"⚠️ Scan cache not saved ({cache.path}): {e}")
+
+    summary = {
+        "services": len(results),
+        "drifted": sum(1 for r in results if r["drift"]),
+        "errors": sum(1 for r in results if "error" in r),
+        "files": sum(len(r["files"]) for r in results),
+        "hashed": sum(r.get("hashed", 0) for r in results),
+        "cached": sum(r.get("cached", 0) for r in results),
+    }
+    return {
+        "version": SCAN_REPORT_VERSION,
+        "root": str(root),
+        "generated_at": _now_iso(),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "summary": summary,
+        "services": results,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -142,21 +511,51 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Veil Sentinel Auto‑Hardener (FastAPI main.py generator)"
     )
-    parser.add_argument(
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
         "--target",
-        required=True,
         help="Linux-native target project root directory (e.g. /home/user/veil_os/projects/my_service)",
     )
+    mode.add_argument(
+        "--scan",
+        metavar="ROOT",
+        help="Report template drift of every service under ROOT as JSON (writes nothing)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
         help="Show diffs but do not write any files",
     )
+    parser.add_argument(
+        "--rules",
+        help=f"Rules file (default: <target>/{RULES_REL_PATH} if present, else app/main.py only)",
+    )
+    parser.add_argument("--report", help="--scan: write the JSON report here instead of stdout")
+    parser.add_argument("--cache", help=f"--scan: hash cache file (default: {SCAN_CACHE_PATH})")
+    parser.add_argument("--workers", type=int, help="--scan: services scanned at once")
     return parser.parse_args()
 
 
+def _run_scan(args: argparse.Namespace) -> int:
+    root = Path(args.scan).resolve()
+    if not root.is_dir():
+        raise SystemExit(f"Scan root is not a directory: {root}")
+    report = scan_fleet(root, workers=args.workers, cache_path=Path(args.cache) if args.cache else None)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.report:
+        Path(args.report).write_text(text + "\n", encoding="utf-8")
+        s = report["summary"]
+        log(f"🔱 Scanned {s['services']} service(s): {s['drifted']} drifted, {s['errors']} error(s) -> {args.report}")
+    else:
+        print(text)
+    return 1 if report["summary"]["drifted"] or report["summary"]["errors"] else 0
+
+
 def main() -> None:
     args = parse_args()
+    if args.scan:
+        raise SystemExit(_run_scan(args))
+
     target_root = Path(args.target).resolve()
 
     log("🔱 Starting Veil Sentinel Hardening Pass")
@@ -168,10 +567,11 @@ def main() -> None:
     if not target_root.is_dir():
         raise SystemExit(f"Target path is not a directory: {target_root}")
 
-    changed, created = ensure_main(target_root, dry_run=args.dry_run)
+    rules = load_rules(target_root, Path(args.rules).resolve() if args.rules else None)
+    results = ensure_rules(target_root, dry_run=args.dry_run, rules=rules)
 
-    if not changed:
-        log("No changes required for app/main.py")
+    if not any(r.changed for r in results):
+        log(f"No changes required ({len(results)} file(s) checked)")
 
     log("🔱 Hardening complete")
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+`veil` CLI startup cost: `python -X importtime` of veil.cli plus wall time of
+cheap subcommands, each in a fresh interpreter.
+
+    python benchmarks/cli_startup.py
+    python benchmarks/cli_startup.py --budget-ms 60 --json   # CI: exit 1 over budget
+
+Tracked budget: `veil --help` and `veil orchestrator list` in tens of
+milliseconds; importing veil.cli must not load yaml, the ledger or the compiler.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+COMMANDS = {
+    "veil --help": ["-m", "veil.cli", "--help"],
+    "veil orchestrator list": ["-m", "veil.cli", "orchestrator", "list"],
+}
+
+# Modules the bare CLI must not import (they belong to specific subcommands).
+HEAVY = ("yaml", "veil.compiler", "veil.ledger", "veil.spec_registry", "fastapi", "subprocess")
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def _importtime(module: str) -> dict:
+    """{module: (self_us, cumulative_us)} for one fresh import of `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_env(), cwd=ROOT, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cum_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            times[name] = (int(self_us), int(cum_us))
+    return times
+
+
+def _wall_ms(argv: list) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, *argv], capture_output=True, env=_env(), cwd=ROOT)
+    return (time.perf_counter() - t0) * 1000
+
+
+def _loaded(module: str) -> list:
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=_env(), cwd=ROOT, check=True)
+    mods = set(out.stdout.split())
+    return [h for h in HEAVY if h in mods]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--top", type=int, default=10, help="Slowest modules (self time) to list")
+    ap.add_argument("--budget-ms", type=float, help="Fail if a command's median wall time exceeds this")
+    ap.add_argument("--json", action="store_true", help="Machine-readable output")
+    args = ap.parse_args()
+
+    runs = [_importtime("veil.cli") for _ in range(args.repeat)]
+    cumulative = statistics.median(r["veil.cli"][1] for r in runs) / 1000
+    last = runs[-1]
+    slowest = sorted(last.items(), key=lambda kv: -kv[1][0])[: args.top]
+
+    baseline = statistics.median(_wall_ms(["-c", "pass"]) for _ in range(args.repeat))
+    wall = {label: statistics.median(_wall_ms(argv) for _ in range(args.repeat)) for label, argv in COMMANDS.items()}
+    heavy = _loaded("veil.cli")
+
+    over = {k: v for k, v in wall.items() if args.budget_ms is not None and v > args.budget_ms}
+    if args.json:
+        print(json.dumps({
+            "python": sys.version.split()[0],
+            "import_veil_cli_ms": round(cumulative, 2),
+            "interpreter_ms": round(baseline, 2),
+            "commands_ms": {k: round(v, 2) for k, v in wall.items()},
+            "heavy_imports": heavy,
+            "slowest_self_us": {name: t[0] for name, t in slowest},
+        }, indent=2))
+    else:
+        print(f"import veil.cli: {cumulative:.1f} ms (median of {args.repeat}, -X importtime)")
+        for name, (self_us, cum_us) in slowest:
+            print(f"  {name:<40} self {self_us / 1000:6.2f} ms  cumulative {cum_us / 1000:6.2f} ms")
+        print(f"bare interpreter: {baseline:.1f} ms")
+        for label, ms in wall.items():
+            print(f"  {label:<30} {ms:7.1f} ms  (+{ms - baseline:.1f} ms over the interpreter)")
+        print("heavy imports on `import veil.cli`: " + (", ".join(heavy) if heavy else "none ✅"))
+
+    if heavy or over:
+        for label, ms in over.items():
+            print(f"❌ {label}: {ms:.1f} ms over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Organ spec load time: one file per organ vs. one bundled multi-document file,
+with the pure-Python and the libyaml (CSafeLoader) loaders.
+
+    python benchmarks/spec_loading.py --organs 300
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from veil.organ import Organ  # noqa: E402
+
+
+def _doc(i: int) -> str:
+    return (
+        f"name: organ_{i:04d}\n"
+        f"tier: P{i % 3}\n"
+        'glyph: "🔷"\n'
+        f'affirmation: "Organ {i} stands watch so the others may rest."\n'
+    )
+
+
+def _per_file(paths, loader):
+    out = []
+    for p in paths:
+        with open(p, "r", encoding="utf-8") as f:
+            out.append(Organ(**yaml.load(f, Loader=loader)))
+    return out
+
+
+def _bundle(path, loader):
+    with open(path, "r", encoding="utf-8") as f:
+        return [Organ(**doc) for doc in yaml.load_all(f, Loader=loader) if doc]
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--organs", type=int, default=300)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        paths = []
+        for i in range(args.organs):
+            p = root / f"organ_{i:04d}.yaml"
+            p.write_text(_doc(i), encoding="utf-8")
+            paths.append(p)
+        bundle = root / "all_organs.yaml"
+        bundle.write_text("".join("---\n" + _doc(i) for i in range(args.organs)), encoding="utf-8")
+
+        cases = [
+            ("per-file, SafeLoader (old Organ.from_yaml)", lambda: _per_file(paths, yaml.SafeLoader)),
+            ("bundle, SafeLoader", lambda: _bundle(bundle, yaml.SafeLoader)),
+        ]
+        if hasattr(yaml, "CSafeLoader"):
+            cases += [
+                ("per-file, CSafeLoader", lambda: _per_file(paths, yaml.CSafeLoader)),
+                ("bundle, CSafeLoader (Organ.load_all)", lambda: Organ.load_all(bundle)),
+            ]
+        else:
+            print("⚠️ PyYAML built without libyaml: CSafeLoader cases skipped.")
+
+        assert len(Organ.load_all(bundle)) == args.organs
+        base = None
+        print(f"{args.organs} organs, best of {args.repeat}")
+        for label, fn in cases:
+            t = _best(fn, args.repeat)
+            base = base or t
+            print(f"  {label:<45} {t * 1000:8.2f} ms  ({base / t:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
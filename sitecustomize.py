@@ -1,24 +1,73 @@
 # sitecustomize.py
 # Auto-imported by Python on startup (if on sys.path).
 # Goal: define `orch` inside veil.hospital_gui.main without editing main.py.
+#
+# Nothing is imported here: a one-shot meta path hook waits until
+# veil.hospital_gui.main is actually imported (FastAPI and all) and injects
+# `orch` right after the module body runs. Every other Python process on the
+# path only pays for installing the hook.
 
-try:
-    import veil.hospital_gui.main as m
-    from veil.orchestrator import list_services, start, stop
+import sys
 
-    class OrchShim:
-        def list(self):
-            return list_services()
+_TARGET = "veil.hospital_gui.main"
 
-        def start(self, name):
-            return start(name, dry_run=False)
 
-        def stop(self, name):
-            return stop(name, dry_run=False)
+class OrchShim:
+    def list(self):
+        from veil.orchestrator import list_services
+        return list_services()
 
-    # Force inject into module globals so `orch` exists for route handlers.
-    m.__dict__["orch"] = OrchShim()
+    def start(self, name):
+        from veil.orchestrator import start
+        return start(name, dry_run=False)
 
-except Exception:
-    # Never break interpreter startup
-    pass
+    def stop(self, name):
+        from veil.orchestrator import stop
+        return stop(name, dry_run=False)
+
+
+class _InjectingLoader:
+    """Wraps the real loader; runs the module, then injects `orch`."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        # Force inject into module globals so `orch` exists for route handlers.
+        module.__dict__["orch"] = OrchShim()
+
+
+class _OrchHook:
+    """Meta path finder that only ever answers for veil.hospital_gui.main."""
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != _TARGET:
+            return None
+        try:
+            sys.meta_path.remove(self)
+        except ValueError:
+            pass
+        try:
+            from importlib.machinery import PathFinder
+
+            spec = PathFinder.find_spec(fullname, path)
+            if spec is not None and spec.loader is not None:
+                spec.loader = _InjectingLoader(spec.loader)
+            return spec
+        except Exception:
+            # Never break the import; fall back to the normal finders.
+            return None
+
+    def invalidate_caches(self):
+        pass
+
+
+if not any(isinstance(f, _OrchHook) for f in sys.meta_path):
+    sys.meta_path.insert(0, _OrchHook())
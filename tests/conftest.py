@@ -0,0 +1,26 @@
+import pytest
+
+from veil import build_state, ledger, ledger_query, ledger_store, spec_registry
+
+
+@pytest.fixture
+def ledger_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger, "LEDGER_PATH", tmp_path / "ledger.json")
+    monkeypatch.setattr(ledger, "LEDGER_JSONL_PATH", tmp_path / "ledger.jsonl")
+    monkeypatch.setattr(ledger, "LEDGER_TAIL_PATH", tmp_path / "ledger.tail")
+    monkeypatch.setattr(ledger, "LEDGER_CHECKPOINT_PATH", tmp_path / "ledger.checkpoint")
+    monkeypatch.setattr(ledger, "LEGACY_QUARANTINE_PATH", tmp_path / "ledger_legacy.json")
+    monkeypatch.setattr(ledger, "LEDGER_LOCK_PATH", tmp_path / "ledger.lock")
+    monkeypatch.setattr(ledger, "LEDGER_MIGRATE_PROGRESS_PATH", tmp_path / "ledger.migrate.json")
+    monkeypatch.setattr(ledger_query, "LEDGER_INDEX_PATH", tmp_path / "ledger.index.sqlite3")
+    monkeypatch.setattr(ledger_store, "LEDGER_SQLITE_PATH", tmp_path / "ledger.sqlite3")
+    monkeypatch.setattr(build_state, "BUILD_STATE_PATH", tmp_path / "build_state.json")
+    monkeypatch.delenv(ledger_store.LEDGER_BACKEND_ENV, raising=False)
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def spec_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(spec_registry, "SPEC_CACHE_PATH", tmp_path / "organ_specs.json")
+    monkeypatch.setattr(spec_registry, "_REGISTRIES", {})
+    return tmp_path / "organ_specs.json"
@@ -0,0 +1,105 @@
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from veil.orchestrator import boot
+from veil.orchestrator.readiness import Probe, ReadinessError
+
+
+def _fake_start(monkeypatch, delays):
+    """start() that makes <name>'s ready file appear `delays[name]` seconds later."""
+    started = {}
+
+    def start(name):
+        started[name] = time.monotonic()
+        path, delay = delays[name]
+        threading.Timer(delay, path.touch).start()
+
+    monkeypatch.setattr(boot, "start", start)
+    return started
+
+
+def _organs(monkeypatch, specs):
+    monkeypatch.setattr(boot, "list", lambda: specs)
+
+
+def test_tier_starts_together_and_waits_for_readiness(tmp_path, monkeypatch):
+    ready = {n: tmp_path / f"{n}.ready" for n in ("sentinel", "audit", "rbac")}
+    _organs(monkeypatch, [
+        {"name": "rbac", "tier": "P1", "ready": {"file": str(ready["rbac"])}},
+        {"name": "sentinel", "tier": "P0", "ready": {"file": str(ready["sentinel"])}},
+        {"name": "audit", "tier": "P0", "ready": {"file": str(ready["audit"])}},
+    ])
+    started = _fake_start(monkeypatch, {"sentinel": (ready["sentinel"], 0.3), "audit": (ready["audit"], 0.3),
+                                        "rbac": (ready["rbac"], 0.0)})
+
+    report = boot.boot_all(quiet=True)
+    assert report.ok and report.failure is None
+    assert abs(started["sentinel"] - started["audit"]) < 0.2          # P0 in parallel
+    steps = {s.name: s for s in report.steps}
+    assert steps["rbac"].started >= max(steps["sentinel"].ready, steps["audit"].ready)
+    assert report.total < 0.55                                        # not 0.3 + 0.3
+
+    text = report.timeline()
+    assert "🧾 Boot timeline: 3 organ(s)" in text and f"file {ready['audit']}" in text
+    assert [o["name"] for o in report.to_json()["organs"]] == ["sentinel", "audit", "rbac"]
+
+
+def test_deadline_fails_boot_and_skips_later_tiers(tmp_path, monkeypatch):
+    _organs(monkeypatch, [
+        {"name": "sentinel", "tier": "P0", "ready": {"file": str(tmp_path / "never")}},
+        {"name": "rbac", "tier": "P1"},
+        {"name": "audit", "tier": "P1", "depends_on": ["sentinel"]},
+    ])
+    monkeypatch.setattr(boot, "start", lambda name: None)
+
+    report = boot.boot(deadline=0.3)
+    assert isinstance(report.failure, ReadinessError) and "boot deadline" in str(report.failure)
+    assert 0.25 < report.total < 1.5
+    steps = {s.name: s for s in report.steps}
+    assert steps["rbac"].spawned is None and "not started: boot deadline" in str(steps["rbac"].error)
+    assert steps["audit"].started is None
+    assert "↪️ not started" in report.timeline()
+    with pytest.raises(ReadinessError):
+        boot.boot_all(deadline=0.1, quiet=True)
+
+
+def test_failed_organ_skips_only_its_dependents(tmp_path, monkeypatch):
+    _organs(monkeypatch, [
+        {"name": "o0", "tier": "P0"},
+        {"name": "o1", "tier": "P0"},
+        {"name": "o2", "tier": "P1"},
+        {"name": "o3", "tier": "P1", "depends_on": "o0"},
+    ])
+    started = []
+
+    def start(name):
+        if name == "o0":
+            raise FileNotFoundError("no run.sh")
+        started.append(name)
+
+    monkeypatch.setattr(boot, "start", start)
+    served = []
+    monkeypatch.setattr(boot.supervisor, "own", lambda: SimpleNamespace(serve_forever=lambda: served.append(1)))
+
+    with pytest.raises(SystemExit) as exc:
+        boot.main([])
+    assert exc.value.code == 1
+    assert sorted(started) == ["o1", "o2"]
+    assert served == [1]   # what started is still supervised
+
+
+def test_tcp_probe_and_spec_errors():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        Probe.from_spec({"tcp": port, "timeout": 2}).wait("sentinel")
+    with pytest.raises(ReadinessError, match="0.2s timeout"):
+        Probe.from_spec({"tcp": f"127.0.0.1:{port}", "timeout": 0.2}).wait("sentinel")
+    with pytest.raises(ReadinessError, match="exited"):
+        Probe.from_spec({"tcp": port}).wait("sentinel", alive=lambda: False)
+    with pytest.raises(ValueError, match="Unknown readiness probe"):
+        Probe.from_spec({"udp": 53})
+    assert Probe.from_spec(None).label == "spawned"
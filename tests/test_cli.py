@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cli_import_stays_light():
+    code = "import sys, veil.cli; print(' '.join(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    loaded = set(out.stdout.split())
+    assert not loaded & {"yaml", "subprocess", "veil.compiler", "veil.ledger", "veil.spec_registry"}
+
+
+def test_sitecustomize_injects_orch_lazily(tmp_path, monkeypatch):
+    import sitecustomize
+
+    (tmp_path / "gui_main_stub.py").write_text("ROUTES = []\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sitecustomize, "_TARGET", "gui_main_stub")
+    hook = sitecustomize._OrchHook()
+    monkeypatch.setattr(sys, "meta_path", [hook, *sys.meta_path])
+
+    import gui_main_stub
+
+    assert isinstance(gui_main_stub.orch, sitecustomize.OrchShim)
+    assert hook not in sys.meta_path
+    sys.modules.pop("gui_main_stub", None)
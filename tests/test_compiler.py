@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+
+import pytest
+
+from veil import compiler, ledger
+
+
+def _spec(spec_dir, name, tier):
+    (spec_dir / f"{name}.yaml").write_text(
+        f'name: {name}\ntier: {tier}\nglyph: "🔷"\naffirmation: "{name} holds."\n'
+    )
+
+
+@pytest.fixture
+def spec_dir(tmp_path):
+    d = tmp_path / "specs"
+    d.mkdir()
+    for name, tier in [("epic", "P0"), ("backup", "P0"), ("mfa", "P1"), ("rbac", "P1"), ("dlp", "P1")]:
+        _spec(d, name, tier)
+    return d
+
+
+def _ledger(ledger_dir):
+    return [json.loads(line) for line in (ledger_dir / "ledger.jsonl").read_text().splitlines()]
+
+
+def test_compile_all_commits_ledger_once(ledger_dir, spec_dir, monkeypatch):
+    appends = []
+    jsonl_append = ledger._jsonl_append
+    monkeypatch.setattr(ledger, "_jsonl_append", lambda data: appends.append(data) or jsonl_append(data))
+
+    p0, p1 = compiler.compile_all(harden=False, spec_dir=spec_dir)
+
+    assert p0.activated == ("backup", "epic")
+    assert p1.activated == ("dlp", "mfa", "rbac")
+    assert len(appends) == 1
+    assert [b["organ"] for b in _ledger(ledger_dir)] == ["backup", "epic", "dlp", "mfa", "rbac"]
+    assert ledger.verify_ledger(full=True, strict_hash=True)
+
+
+def test_strict_failure_still_records_attempts(ledger_dir, spec_dir, monkeypatch):
+    def activate(self):
+        if self.name == "mfa":
+            raise RuntimeError("boom")
+
+    monkeypatch.setattr(compiler.Organ, "activate", activate)
+    with pytest.raises(RuntimeError):
+        compiler.compile_tier("P1", spec_dir=spec_dir, workers=1)
+    assert [b["organ"] for b in _ledger(ledger_dir)] == ["dlp", "mfa"]
+
+    # dlp is up to date; the failed and the never-started organs are retried.
+    result = compiler.compile_tier("P1", spec_dir=spec_dir, strict=False)
+    assert result.activated == ("rbac",)
+    assert result.skipped == ("dlp",)
+
+
+def _timed_activate(delay, fail=(), log=None):
+    lock = threading.Lock()
+
+    def activate(self):
+        start = time.monotonic()
+        time.sleep(delay)
+        if log is not None:
+            with lock:
+                log.append((self.tier, self.name, start, time.monotonic()))
+        if self.name in fail:
+            raise RuntimeError(f"{self.name} failed")
+
+    return activate
+
+
+def test_tier_activates_concurrently_with_ordered_ledger(ledger_dir, spec_dir, monkeypatch):
+    monkeypatch.setattr(compiler.Organ, "activate", _timed_activate(0.2))
+    t0 = time.monotonic()
+    result = compiler.compile_tier("P1", spec_dir=spec_dir, workers=3)
+    assert time.monotonic() - t0 < 0.5
+    assert result.activated == ("dlp", "mfa", "rbac")
+    assert [b["organ"] for b in _ledger(ledger_dir)] == ["dlp", "mfa", "rbac"]
+    assert ledger.verify_ledger(strict_hash=True)
+
+
+def test_tiers_are_barriers(ledger_dir, spec_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(compiler.Organ, "activate", _timed_activate(0.05, log=calls))
+    compiler.compile_all(harden=False, spec_dir=spec_dir, workers=8)
+    p0_end = max(end for tier, _, _, end in calls if tier == "P0")
+    assert all(start >= p0_end for tier, _, start, _ in calls if tier == "P1")
+
+
+def test_strict_failure_cancels_queued_organs(ledger_dir, tmp_path, monkeypatch):
+    d = tmp_path / "many"
+    d.mkdir()
+    for i in range(8):
+        _spec(d, f"organ{i}", "P1")
+    monkeypatch.setattr(compiler.Organ, "activate", _timed_activate(0.05, fail={"organ0"}))
+
+    with pytest.raises(RuntimeError, match="organ0 failed"):
+        compiler.compile_tier("P1", spec_dir=d, workers=2)
+    recorded = [b["organ"] for b in _ledger(ledger_dir)]
+    assert recorded == sorted(recorded) and "organ0" in recorded
+    assert len(recorded) <= 3
+
+
+def test_incremental_compile_skips_unchanged_organs(ledger_dir, spec_dir, monkeypatch):
+    monkeypatch.setattr(compiler.Organ, "activate", lambda self: None)
+
+    compiler.compile_all(harden=False, spec_dir=spec_dir)
+    p0, p1 = compiler.compile_all(harden=False, spec_dir=spec_dir)
+    assert (p0.activated, p1.activated) == ((), ())
+    assert (p0.skipped, p1.skipped) == (("backup", "epic"), ("dlp", "mfa", "rbac"))
+    assert len(_ledger(ledger_dir)) == 5
+
+    # A changed spec rebuilds its organ and every organ depending on it.
+    (spec_dir / "rbac.yaml").write_text("name: rbac\ntier: P1\nglyph: g\naffirmation: a\ndepends_on: [epic]\n")
+    (spec_dir / "dlp.yaml").write_text("name: dlp\ntier: P1\nglyph: g\naffirmation: a\ndepends_on: [rbac]\n")
+    p0, p1 = compiler.compile_all(harden=False, spec_dir=spec_dir)
+    assert (p0.activated, p1.activated) == ((), ("dlp", "rbac"))
+    (spec_dir / "epic.yaml").write_text("name: epic\ntier: P0\nglyph: g\naffirmation: changed\n")
+    p0, p1 = compiler.compile_all(harden=False, spec_dir=spec_dir)
+    assert (p0.activated, p1.activated) == (("epic",), ("dlp", "rbac"))
+
+    p0, p1 = compiler.compile_all(harden=False, spec_dir=spec_dir, force=True)
+    assert (p0.activated, p1.activated) == (("backup", "epic"), ("dlp", "mfa", "rbac"))
+    state = json.loads((ledger_dir / "build_state.json").read_text())["organs"]
+    assert {n: e["ledger_index"] for n, e in state.items()} == {b["organ"]: b["index"] for b in _ledger(ledger_dir)[-5:]}
+
+
+def test_scalar_depends_on_propagates_staleness(ledger_dir):
+    from types import SimpleNamespace
+
+    from veil.build_state import BuildState
+
+    state = BuildState()
+    state.record("ab", "P0", "old", 0)
+    state.record("c", "P1", "same", 1)
+    organs = [SimpleNamespace(name="ab", depends_on=[]), SimpleNamespace(name="c", depends_on="ab")]
+    assert state.stale(organs, {"ab": "new", "c": "same"}) == {"ab", "c"}
+
+
+def test_compile_refreshes_specs_independently_of_organ_count(ledger_dir, spec_dir, monkeypatch):
+    from veil.spec_registry import SpecRegistry
+
+    monkeypatch.setattr(compiler.Organ, "activate", lambda self: None)
+    refreshes = []
+    refresh = SpecRegistry.refresh
+    monkeypatch.setattr(SpecRegistry, "refresh", lambda self: refreshes.append(1) or refresh(self))
+
+    compiler.compile_tier("P1", spec_dir=spec_dir)
+    few = len(refreshes)
+    for i in range(20):
+        _spec(spec_dir, f"extra{i}", "P1")
+    refreshes.clear()
+    compiler.compile_tier("P1", spec_dir=spec_dir)
+    assert len(refreshes) == few
@@ -0,0 +1,159 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from veil import compiler
+
+
+def test_harden_targets_in_process(tmp_path, capsys):
+    hardener = compiler._load_hardener()
+    fresh, stale, done = (tmp_path / n for n in ("fresh", "stale", "done"))
+    for d in (fresh, stale, done):
+        (d / "app").mkdir(parents=True)
+    (stale / "app" / "main.py").write_text("print('old')\n")
+    (done / "app" / "main.py").write_text(hardener.MAIN_TEMPLATE)
+
+    targets = [fresh, stale, done, tmp_path / "missing", fresh]
+    results = compiler.harden_targets(targets, dry_run=True, workers=3)
+    assert capsys.readouterr().out == ""
+    assert [r.target.name for r in results] == ["fresh", "stale", "done", "missing"]
+    assert [(r.changed, r.created, r.ok) for r in results] == [
+        (True, True, True), (True, False, True), (False, False, True), (False, False, False)
+    ]
+    assert not (fresh / "app" / "main.py").exists()
+
+    report = compiler.format_harden_report(results, dry_run=True)
+    assert f"--- {stale}/app/main.py" in report and "-print('old')" in report
+    assert f"# {done}" not in report
+    assert report.splitlines()[-1] == (
+        "🔱 Hardened 4 target(s): 2 would change (2 file(s), 1 new), 1 up to date, 1 failed."
+    )
+
+    compiler.harden_targets([fresh, stale])
+    assert (stale / "app" / "main.py").read_text() == hardener.MAIN_TEMPLATE
+    assert all(not r.changed for r in compiler.harden_targets([fresh, stale]))
+
+
+def test_rule_engine_uses_stat_and_hash_fast_path(tmp_path, monkeypatch):
+    hardener = compiler._load_hardener()
+    target = tmp_path / "svc"
+    (target / ".veil" / "templates").mkdir(parents=True)
+    (target / ".veil" / "templates" / "ignore").write_text("*.pyc\n")
+    for name in ("a", "b"):
+        (target / "services" / name).mkdir(parents=True)
+        (target / "services" / name / "README.md").write_text(f"{name}\n")
+    (target / ".veil" / "harden.yaml").write_text(
+        "templates:\n"
+        "  ignore: {file: templates/ignore}\n"
+        "rules:\n"
+        "  - {path: app/main.py, template: fastapi_main}\n"
+        "  - {path: .gitignore, template: ignore}\n"
+        "  - {glob: 'services/*/README.md', content: \"# service\\n\"}\n"
+    )
+
+    result = compiler.harden_target(target)
+    assert (result.changed, result.created, result.checked) == (4, 2, 4)
+    assert f"+++ {target}/services/a/README.md" in result.diff
+    assert (target / ".gitignore").read_text() == "*.pyc\n"
+
+    # Age every file past the racy window, then let one run record the stamps.
+    files = [target / p for p in ("app/main.py", ".gitignore", "services/a/README.md", "services/b/README.md")]
+    for f in files:
+        old = f.stat().st_mtime_ns - 10**10
+        os.utime(f, ns=(old, old))
+    assert compiler.harden_target(target).changed == 0
+
+    reads = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda self: reads.append(self.name) or read_bytes(self))
+    assert compiler.harden_target(target).changed == 0
+    assert reads == []
+
+    # A same-size edit is caught by stat (mtime), then by hash.
+    (target / ".gitignore").write_text("*.pyo\n")
+    result = compiler.harden_target(target, dry_run=True)
+    assert result.changed == 1 and "-*.pyo" in result.diff
+    assert reads == [".gitignore"]
+    assert hardener.apply_main(target, dry_run=True) == (False, False, "")
+
+
+def test_rules_never_write_outside_the_target(tmp_path):
+    outside = tmp_path / "outside"
+    (outside / "x").mkdir(parents=True)
+    (outside / "x" / "README.md").write_text("keep\n")
+    target = tmp_path / "svc"
+    (target / ".veil").mkdir(parents=True)
+    (target / "services").symlink_to(outside)
+    rules = target / ".veil" / "harden.yaml"
+
+    rules.write_text("rules:\n  - {glob: 'services/*/README.md', content: \"# service\\n\"}\n")
+    result = compiler.harden_target(target)
+    assert not result.ok and "resolves outside the target" in result.error
+
+    rules.write_text("rules:\n  - {glob: '../outside/*/README.md', content: \"# service\\n\"}\n")
+    assert "must stay inside the target" in compiler.harden_target(target).error
+
+    rules.write_text("rules:\n  - {path: services/x/README.md, content: \"# service\\n\"}\n")
+    assert "resolves outside" in compiler.harden_target(target).error
+    assert (outside / "x" / "README.md").read_text() == "keep\n"
+
+
+def test_fleet_scan_reports_drift_and_caches_hashes(tmp_path, monkeypatch):
+    hardener = compiler._load_hardener()
+    root = tmp_path / "fleet"
+    for name in ("billing", "intake", "lab"):
+        (root / "services" / name / "app").mkdir(parents=True)
+    (root / "services" / "billing" / "app" / "main.py").write_text(hardener.MAIN_TEMPLATE)
+    (root / "services" / "intake" / "app" / "main.py").write_text("app = None\n")
+    (root / "services" / "lab" / ".veil").mkdir()
+    (root / "services" / "lab" / ".veil" / "harden.yaml").write_text("rules:\n  - {path: app/main.py, template: fastapi_main}\n")
+    (root / "node_modules" / "x" / "app").mkdir(parents=True)
+    (root / "node_modules" / "x" / "app" / "main.py").write_text("")
+    cache = tmp_path / "scan.json"
+
+    report = hardener.scan_fleet(root, cache_path=cache, workers=2)
+    by_name = {Path(s["path"]).name: s for s in report["services"]}
+    assert sorted(by_name) == ["billing", "intake", "lab"]
+    assert [f["status"] for f in by_name["billing"]["files"]] == ["ok"]
+    assert [f["status"] for f in by_name["intake"]["files"]] == ["drift"]
+    assert [f["status"] for f in by_name["lab"]["files"]] == ["missing"]
+    assert report["summary"] == {"services": 3, "drifted": 2, "errors": 0, "files": 3, "hashed": 2, "cached": 0}
+    assert not (root / "services" / "lab" / "app" / "main.py").exists()
+
+    for f in (root / "services").glob("*/app/main.py"):
+        old = f.stat().st_mtime_ns - 10**10
+        os.utime(f, ns=(old, old))
+    hardener.scan_fleet(root, cache_path=cache)
+    report = hardener.scan_fleet(root, cache_path=cache)
+    assert (report["summary"]["hashed"], report["summary"]["cached"]) == (0, 2)
+
+
+def test_invalid_rules_yaml_fails_only_that_target(tmp_path):
+    hardener = compiler._load_hardener()
+    bad, good = tmp_path / "bad", tmp_path / "good"
+    (bad / ".veil").mkdir(parents=True)
+    (bad / ".veil" / "harden.yaml").write_text("rules: [\n")
+    (good / "app").mkdir(parents=True)
+
+    with pytest.raises(RuntimeError, match="not valid YAML"):
+        compiler.harden_service(bad, dry_run=True)
+    results = compiler.harden_targets([bad, good], dry_run=True)
+    assert [r.ok for r in results] == [False, True]
+
+    report = hardener.scan_fleet(tmp_path, cache_path=tmp_path / "cache.json")
+    assert [("error" in s, s["path"]) for s in report["services"]] == [(True, str(bad))]
+
+
+def test_broken_hardener_fails_each_target(tmp_path, monkeypatch):
+    broken = tmp_path / "autohardener.py"
+    broken.write_text("def oops(:\n")
+    monkeypatch.setattr(compiler, "HARDENER_PATH", broken)
+    monkeypatch.setattr(compiler, "_HARDENER", None)
+    targets = [tmp_path / "a", tmp_path / "b"]
+    for t in targets:
+        t.mkdir()
+
+    results = compiler.harden_targets(targets, dry_run=True)
+    assert [r.ok for r in results] == [False, False]
+    assert all("SyntaxError" in r.error for r in results)
@@ -0,0 +1,423 @@
+import json
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from veil import ledger
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def _rechain(blocks):
+    prev = "GENESIS"
+    for i, b in enumerate(blocks):
+        b.update(index=i, prev_hash=prev)
+        b["hash"] = prev = ledger.hash_block(
+            {k: b[k] for k in ("index", "organ", "tier", "timestamp", "prev_hash")}
+        )
+    return blocks
+
+
+def test_append_is_one_line_per_block(ledger_dir):
+    for name in ("epic", "mfa", "rbac"):
+        ledger.append_ledger_entry(name, "P0")
+
+    blocks = _lines(ledger_dir / "ledger.jsonl")
+    assert [b["index"] for b in blocks] == [0, 1, 2]
+    assert blocks[1]["prev_hash"] == blocks[0]["hash"]
+
+    tail = json.loads((ledger_dir / "ledger.tail").read_text())
+    assert tail["index"] == 2
+    assert tail["hash"] == blocks[-1]["hash"]
+    assert ledger.verify_ledger()
+
+
+def test_append_never_reads_earlier_blocks(ledger_dir, monkeypatch):
+    ledger.append_ledger_entry("epic", "P0")
+    monkeypatch.setattr(ledger, "load_ledger", lambda: pytest.fail("append loaded the ledger"))
+    ledger.append_ledger_entry("mfa", "P1")
+    assert len(_lines(ledger_dir / "ledger.jsonl")) == 2
+
+
+def test_stale_tail_and_torn_write_recover(ledger_dir):
+    ledger.append_ledger_entry("epic", "P0")
+    stale = (ledger_dir / "ledger.tail").read_text()
+    ledger.append_ledger_entry("mfa", "P1")
+
+    # Crash after the append fsync but before the tail update, plus a torn line.
+    (ledger_dir / "ledger.tail").write_text(stale)
+    with (ledger_dir / "ledger.jsonl").open("ab") as f:
+        f.write(b'{"index":2,"org')
+
+    ledger.append_ledger_entry("rbac", "P1")
+    blocks = _lines(ledger_dir / "ledger.jsonl")
+    assert [b["organ"] for b in blocks] == ["epic", "mfa", "rbac"]
+    assert blocks[2]["prev_hash"] == blocks[1]["hash"]
+    assert ledger.verify_ledger()
+
+
+def test_tampering_detected(ledger_dir):
+    for name in ("epic", "mfa"):
+        ledger.append_ledger_entry(name, "P0")
+    path = ledger_dir / "ledger.jsonl"
+    path.write_text(path.read_text().replace('"mfa"', '"evil"'))
+    assert not ledger.verify_ledger()
+
+
+def test_convert_legacy_json_array(ledger_dir):
+    legacy = [{"name": "old", "priority": "P0", "timestamp": 1.0, "prev_hash": "GENESIS"}]
+    (ledger_dir / "ledger.json").write_text(json.dumps(legacy, indent=2))
+    ledger.append_ledger_entry("epic", "P0")
+    assert not (ledger_dir / "ledger.jsonl").exists()
+
+    assert ledger.convert_ledger_to_jsonl() == 2
+    ledger.append_ledger_entry("mfa", "P1")
+
+    blocks = _lines(ledger_dir / "ledger.jsonl")
+    assert blocks[0] == legacy[0]
+    assert [b.get("index") for b in blocks[1:]] == [1, 2]
+    assert ledger.verify_ledger()
+    with pytest.raises(RuntimeError):
+        ledger.convert_ledger_to_jsonl()
+
+
+def test_migrate_rewrites_jsonl_ledger(ledger_dir):
+    path = ledger_dir / "ledger.jsonl"
+    path.write_text(
+        json.dumps({"note": "pre-schema"}) + "\n"
+        + json.dumps({"name": "epic", "priority": "P0", "timestamp": 1.0}) + "\n"
+    )
+    assert ledger.migrate_ledger_in_place() == (1, 1, 2)
+
+    blocks = _lines(path)
+    assert [b["organ"] for b in blocks] == ["epic"]
+    assert ledger.verify_ledger(strict_hash=True)
+    ledger.append_ledger_entry("mfa", "P1")
+    assert _lines(path)[1]["prev_hash"] == blocks[0]["hash"]
+
+
+def test_incremental_verify_checks_only_new_blocks(ledger_dir, monkeypatch):
+    for name in ("epic", "mfa", "rbac"):
+        ledger.append_ledger_entry(name, "P0")
+    assert ledger.verify_ledger()
+
+    ledger.append_ledger_entry("dlp", "P1")
+    ledger.append_ledger_entry("vault", "P1")
+
+    checked = []
+    check = ledger._check_block
+    monkeypatch.setattr(ledger, "_check_block", lambda b, i, *a, **k: checked.append(i) or check(b, i, *a, **k))
+    assert ledger.verify_ledger()
+    assert checked == [2, 3, 4]  # checkpoint anchor + two new blocks
+
+    checked.clear()
+    assert ledger.verify_ledger(full=True)
+    assert checked == [0, 1, 2, 3, 4]
+
+
+def test_non_strict_verify_keeps_a_strict_checkpoint(ledger_dir, monkeypatch):
+    for name in ("epic", "mfa", "rbac"):
+        ledger.append_ledger_entry(name, "P0")
+    assert ledger.verify_ledger(strict_hash=True)
+    strict = ledger._read_checkpoint()
+
+    ledger.append_ledger_entry("dlp", "P1")
+    assert ledger.verify_ledger()
+    assert ledger.verify_ledger(full=True)
+    assert ledger._read_checkpoint() == strict
+
+    checked = []
+    check = ledger._check_block
+    monkeypatch.setattr(ledger, "_check_block", lambda b, i, *a, **k: checked.append(i) or check(b, i, *a, **k))
+    assert ledger.verify_ledger(strict_hash=True)
+    assert checked == [2, 3]  # resumed from the strict checkpoint
+    assert ledger._read_checkpoint()["strict"] and ledger._read_checkpoint()["position"] == 3
+
+
+def test_full_verify_catches_tampering_behind_checkpoint(ledger_dir):
+    for name in ("epic", "mfa", "rbac"):
+        ledger.append_ledger_entry(name, "P0")
+    assert ledger.verify_ledger()
+
+    path = ledger_dir / "ledger.jsonl"
+    path.write_text(path.read_text().replace('"epic"', '"evil"'))
+    assert ledger.verify_ledger()  # incremental: only the anchor is re-hashed
+    assert not ledger.verify_ledger(full=True)
+
+
+def test_rechained_history_fails_merkle_checkpoint(ledger_dir, monkeypatch):
+    monkeypatch.setattr(ledger, "CHECKPOINT_SEGMENT", 2)
+    for name in ("epic", "mfa", "rbac", "dlp"):
+        ledger.append_ledger_entry(name, "P0")
+    assert ledger.verify_ledger()
+
+    blocks = _lines(ledger_dir / "ledger.jsonl")
+    blocks[0]["organ"] = "evil"
+    (ledger_dir / "ledger.jsonl").write_bytes(b"".join(ledger._encode_line(b) for b in _rechain(blocks)))
+
+    assert not ledger.verify_ledger()
+    assert not ledger.verify_ledger(full=True)
+
+    # An intentional rewrite through migrate resets the checkpoint.
+    ledger.migrate_ledger_in_place(backup=False)
+    assert ledger.verify_ledger(full=True)
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda bs: bs[4].update(organ="evil"),          # tampering mid-chunk
+        lambda bs: bs[3].update(organ="evil"),          # tampering at a chunk head
+        lambda bs: bs[6].update(prev_hash="0" * 64),    # broken link into a chunk
+        lambda bs: bs[7].update(timestamp="soon"),      # bad field
+        lambda bs: bs[5].pop("hash"),                   # strict-mode failure
+        lambda bs: None,                                # clean ledger
+    ],
+)
+def test_parallel_verify_matches_serial(ledger_dir, monkeypatch, capsys, corrupt):
+    monkeypatch.setattr(ledger, "VERIFY_CHUNK", 3)
+    for n in range(10):
+        ledger.append_ledger_entry(f"organ{n}", "P1")
+    path = ledger_dir / "ledger.jsonl"
+    blocks = _lines(path)
+    corrupt(blocks)
+    path.write_bytes(b"".join(ledger._encode_line(b) for b in blocks))
+    capsys.readouterr()
+
+    serial = ledger.verify_ledger(full=True, strict_hash=True)
+    serial_out = capsys.readouterr().out
+    parallel = ledger.verify_ledger(full=True, strict_hash=True, workers=2)
+    assert parallel == serial
+    assert capsys.readouterr().out == serial_out
+
+
+def _legacy_chain(n):
+    return _rechain([
+        {"organ": f"organ{i}", "tier": "P1", "timestamp": 1700000000.0 + i * 0.25} for i in range(n)
+    ])
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 1 << 16])
+def test_iter_ledger_streams_json_array(ledger_dir, monkeypatch, chunk):
+    monkeypatch.setattr(ledger, "_READ_CHUNK", chunk)
+    blocks = _legacy_chain(5) + [12345, "legacy", {"nested": {"a": [1, 2.5, None]}}, -7.5e-3]
+    (ledger_dir / "ledger.json").write_text(json.dumps(blocks, indent=2))
+    assert list(ledger.iter_ledger()) == blocks
+
+    (ledger_dir / "ledger.json").write_text("\n".join(json.dumps(b) for b in blocks) + "\n")
+    assert list(ledger.iter_ledger()) == blocks
+
+    (ledger_dir / "ledger.json").write_text(json.dumps(blocks)[:-3])
+    with pytest.raises(RuntimeError):
+        list(ledger.iter_ledger())
+
+
+def test_migrate_json_array_keeps_indent2_layout(ledger_dir):
+    blocks = [{"note": "pre-schema"}] + _legacy_chain(3)
+    (ledger_dir / "ledger.json").write_text(json.dumps(blocks, indent=2))
+    assert ledger.migrate_ledger_in_place(backup=False) == (0, 1, 4)
+
+    fields = ("index", "organ", "tier", "timestamp", "prev_hash")
+    migrated = [
+        dict(ledger._canonical_block_for_hash(**{k: b[k] for k in fields}), hash=b["hash"])
+        for b in _legacy_chain(3)
+    ]
+    assert (ledger_dir / "ledger.json").read_text() == json.dumps(migrated, indent=2)
+    assert not (ledger_dir / "ledger.jsonl").exists()
+    assert ledger.verify_ledger(strict_hash=True)
+
+
+def test_verify_memory_does_not_grow_with_ledger(ledger_dir):
+    import tracemalloc
+
+    path = ledger_dir / "ledger.json"
+    path.write_text(json.dumps(_legacy_chain(20000), indent=2))
+
+    tracemalloc.start()
+    try:
+        assert ledger.verify_ledger()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < path.stat().st_size / 10
+
+
+def _mixed_legacy_ledger(path):
+    blocks = _legacy_chain(12)
+    for b in blocks[::3]:
+        b["name"] = b.pop("organ")  # mappable legacy key
+    blocks.insert(4, {"note": "pre-schema"})
+    blocks.insert(9, 42)
+    path.write_bytes(b"".join(ledger._encode_line(b) for b in blocks))
+
+
+def test_interrupted_migration_resumes(ledger_dir, monkeypatch):
+    path = ledger_dir / "ledger.jsonl"
+    quarantine = ledger_dir / "ledger_legacy.json"
+    quarantine.write_text(json.dumps([{"_reason": "earlier"}], indent=2))
+
+    _mixed_legacy_ledger(path)
+    expected = ledger.migrate_ledger_in_place(backup=False)
+    expected_ledger, expected_quarantine = path.read_bytes(), quarantine.read_text()
+
+    quarantine.write_text(json.dumps([{"_reason": "earlier"}], indent=2))
+    _mixed_legacy_ledger(path)
+    original = path.read_bytes()
+    monkeypatch.setattr(ledger, "MIGRATE_PROGRESS_EVERY", 4)
+
+    writes = []
+    write = ledger._LedgerRewriter.write
+
+    def crashing_write(self, block):
+        if len(writes) == 7:
+            raise KeyboardInterrupt
+        writes.append(block["index"])
+        write(self, block)
+
+    monkeypatch.setattr(ledger._LedgerRewriter, "write", crashing_write)
+    with pytest.raises(KeyboardInterrupt):
+        ledger.migrate_ledger_in_place()
+    assert path.read_bytes() == original
+
+    writes.clear()
+    monkeypatch.setattr(ledger._LedgerRewriter, "write", lambda self, b: writes.append(b["index"]) or write(self, b))
+    assert ledger.migrate_ledger_in_place() == expected
+    assert writes[0] > 0  # picked up after the last progress record
+    assert path.read_bytes() == expected_ledger
+    assert quarantine.read_text() == expected_quarantine
+    assert json.loads(expected_quarantine)[0] == {"_reason": "earlier"}
+    assert (ledger_dir / "ledger.jsonl.bak").read_bytes() == original
+    assert not (ledger_dir / "ledger.migrate.json").exists()
+    assert ledger.verify_ledger(strict_hash=True)
+
+
+def test_migration_commit_step_is_idempotent(ledger_dir, monkeypatch):
+    path = ledger_dir / "ledger.jsonl"
+    _mixed_legacy_ledger(path)
+
+    def crash(source):
+        raise OSError("power loss")
+
+    link_backup = ledger._link_backup
+    monkeypatch.setattr(ledger, "_link_backup", crash)
+    with pytest.raises(OSError):
+        ledger.migrate_ledger_in_place()
+
+    monkeypatch.setattr(ledger, "_link_backup", link_backup)
+    assert ledger.migrate_ledger_in_place()[1:] == (2, 14)
+    assert len(json.loads((ledger_dir / "ledger_legacy.json").read_text())) == 2
+    assert ledger.verify_ledger(strict_hash=True)
+
+
+def test_batch_commits_once(ledger_dir, monkeypatch):
+    ledger.append_ledger_entry("epic", "P0")
+    appends = []
+    jsonl_append = ledger._jsonl_append
+    monkeypatch.setattr(ledger, "_jsonl_append", lambda data: appends.append(data) or jsonl_append(data))
+
+    assert ledger.append_ledger_entries([("mfa", "P1"), ("rbac", "P1")]) == [1, 2]
+    with pytest.raises(RuntimeError):
+        with ledger.ledger_batch() as batch:
+            batch.append("dlp", "P1")
+            batch.append("vault", "P1")
+            raise RuntimeError("activation failed")
+
+    assert len(appends) <= 2   # one fsync per group, not per writer
+    assert batch.indices == [3, 4]
+    assert [b["organ"] for b in _lines(ledger_dir / "ledger.jsonl")] == ["epic", "mfa", "rbac", "dlp", "vault"]
+    assert ledger.verify_ledger(strict_hash=True)
+
+
+def _append_from_threads(n_threads, per_thread, tag):
+    def work(t):
+        for i in range(per_thread):
+            ledger.append_ledger_entry(f"{tag}-{t}-{i}", "P1")
+
+    threads = [threading.Thread(target=work, args=(t,)) for t in range(n_threads)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+
+
+def test_concurrent_writers_never_fork_chain(ledger_dir, capsys):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_append_from_threads, args=(4, 10, f"p{p}")) for p in range(3)]
+    for p in procs:
+        p.start()
+    _append_from_threads(4, 10, "main")
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    blocks = _lines(ledger_dir / "ledger.jsonl")
+    assert [b["index"] for b in blocks] == list(range(160))
+    assert len({b["organ"] for b in blocks}) == 160
+    assert ledger._read_tail()["index"] == 159
+    assert ledger.verify_ledger(full=True, strict_hash=True)
+
+
+def _append_and_verify(tag):
+    for i in range(20):
+        ledger.append_ledger_entry(f"{tag}-{i}", "P1")
+        assert ledger.verify_ledger()
+
+
+def test_concurrent_verifiers_share_the_checkpoint(ledger_dir):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_append_and_verify, args=(f"p{p}",)) for p in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+    assert ledger.verify_ledger(full=True, strict_hash=True)
+    assert not list(ledger_dir.glob("*.tmp"))
+
+
+def test_group_commit_shares_fsync(ledger_dir, monkeypatch):
+    appends = []
+    jsonl_append = ledger._jsonl_append
+    committer = ledger._COMMITTER
+
+    def held_append(data):
+        appends.append(data)
+        if len(appends) == 1:
+            # Hold the first commit until every other writer has queued behind it.
+            waiting = 8 - data.count(b"\n")
+            deadline = time.monotonic() + 10
+            while True:
+                with committer._cond:
+                    if len(committer._queue) == waiting:
+                        break
+                assert time.monotonic() < deadline, "writers never queued"
+                time.sleep(0.005)
+        return jsonl_append(data)
+
+    monkeypatch.setattr(ledger, "_jsonl_append", held_append)
+    _append_from_threads(8, 1, "t")
+
+    assert len(appends) <= 2   # one fsync per group, not per writer
+    assert len(_lines(ledger_dir / "ledger.jsonl")) == 8
+    assert ledger.verify_ledger(strict_hash=True)
+
+
+def test_group_commit_recovers_after_failed_write(ledger_dir, monkeypatch):
+    jsonl_append = ledger._jsonl_append
+    fail = [True]
+
+    def flaky(data):
+        if fail.pop():
+            raise OSError("disk full")
+        return jsonl_append(data)
+
+    fail.insert(0, False)
+    monkeypatch.setattr(ledger, "_jsonl_append", flaky)
+    with pytest.raises(OSError):
+        ledger.append_ledger_entry("epic", "P0")
+    assert ledger.append_ledger_entries([("epic", "P0")]) == [0]
+    assert ledger.verify_ledger(strict_hash=True)
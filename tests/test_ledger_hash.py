@@ -0,0 +1,86 @@
+import hashlib
+import json
+import random
+
+import pytest
+
+from veil import ledger
+
+# Golden vectors: sha256 of json.dumps(canonical, sort_keys=True), the encoding
+# every existing ledger was hashed with. These must never change.
+GOLDEN = [
+    ((0, "epic", "P0", 1700000000.123456, "GENESIS"),
+     "0685381dbd37b6e5a1db68089441cbec98129619537464c4f5ee7854ac4e48fd"),
+    ((1, "mfa", "P1", 1700000001.5, "a" * 64),
+     "a880c16e57cc7d870056f8e6896b98fd137ed519e74bb745562c07cf0494c6f3"),
+    ((42, "zombie_sweeper", "P2", 0.1, "GENESIS"),
+     "dbf6993cfc012362da57216a896afc029cd7aebf7bf467dd3acca500e870d443"),
+    ((7, "épic", "P0", 1e-07, "GENESIS"),
+     "1711b22144af126aeeaf62ca334796c9ab3560e91cd191f2c2c483076020b96b"),
+    ((8, "🏥 hospital", "P1", 1e16, "GENESIS"),
+     "13eeda5cc00cd8ef0c24c6cde97bcad68bfbea5799fdc17ed6f37769173df3a0"),
+    ((9, 'quote"back\\slash\nnew\ttab\x01', "P1", 1e22, "GENESIS"),
+     "db5e51982776efe2df3f7b288f33735f9a2d0eebb88c22515685b1efc9168adc"),
+    ((2**70, "big", "P0", 123456789012345680.0, "GENESIS"),
+     "feaf5d242e15cc09d5a8360772e7798fbc7c5266ba5cc31a91ede8f7484abe01"),
+    ((-3, "negative", "P0", -0.0, "GENESIS"),
+     "21ac5c19c97bd9f7e0fd5f98de1f0c3bc5e257a79be9971afd4ca21d178ecc76"),
+    ((10, "tiny", "P0", 5e-324, "GENESIS"),
+     "7febae8d12ae57a17253cbc7acf4905acbef6e705631765a2f608fd5c1e8056a"),
+    ((11, "huge", "P0", 1.7976931348623157e308, "GENESIS"),
+     "ae5cb7082212d5e259d9fb39be754e2da2a4170561e4b0f2ec41bf764c123fad"),
+    ((12, "whole", "P0", 1700000000.0, "GENESIS"),
+     "0ec349ef8450b6435687abe63d699d82de4dbe85e23d295ce4831a70f7f4bcf6"),
+    ((13, "nan", "P0", float("nan"), "GENESIS"),
+     "a6274ed673dcdc4bb946b2f3272afcbdd6af65b66d18ec9f2927eeebddce4cf9"),
+    ((14, "inf", "P0", float("inf"), "GENESIS"),
+     "ac98cfa200de873abbd98e086af8c180ff2b921b44680b4f9281535b54564d06"),
+    ((15, "-inf", "P0", float("-inf"), "GENESIS"),
+     "b08b8200773cc8669d7781b65ef10616315558b1ebd4e0ba71b760f063e13e4c"),
+    ((16, "", "", 2.5, ""),
+     "68dbc9266192c4d636bade3ff289fd604e8e43734a9729c9adb3bdbc13d4d995"),
+]
+
+FIELDS = ("index", "organ", "tier", "timestamp", "prev_hash")
+
+
+def _reference(block):
+    return hashlib.sha256(json.dumps(block, sort_keys=True).encode()).hexdigest()
+
+
+@pytest.mark.parametrize("values,expected", GOLDEN)
+def test_golden_vectors(values, expected):
+    fields = dict(zip(FIELDS, values))
+    assert ledger._hash_canonical(**fields) == expected
+    assert ledger.hash_block(ledger._canonical_block_for_hash(**fields)) == expected
+
+
+def test_matches_json_dumps_on_random_blocks():
+    rng = random.Random(1337)
+    alphabet = "abcXYZ_-09 éü🏥\"\\\n\t\x00\x7f"
+    for _ in range(5000):
+        fields = {
+            "index": rng.choice([rng.randrange(10**6), rng.randrange(-10**20, 10**20)]),
+            "organ": "".join(rng.choice(alphabet) for _ in range(rng.randrange(12))),
+            "tier": rng.choice(["P0", "P1", "P2", "tier-é"]),
+            "timestamp": rng.choice([
+                rng.uniform(0, 2e9),
+                rng.uniform(-1, 1) * 10.0 ** rng.randrange(-320, 308),
+                float(rng.randrange(2**53)),
+                round(rng.uniform(1.6e9, 1.8e9), rng.randrange(7)),
+            ]),
+            "prev_hash": rng.choice(["GENESIS", "%064x" % rng.getrandbits(256)]),
+        }
+        assert ledger._hash_canonical(**fields) == _reference(fields)
+
+
+def test_non_canonical_blocks_keep_json_encoding():
+    # Extra keys, bool/str values and subclasses fall back to json.dumps.
+    odd = [
+        {"index": 0, "organ": "epic", "tier": "P0", "timestamp": 1.0, "prev_hash": "GENESIS", "x": 1},
+        {"index": True, "organ": "epic", "tier": "P0", "timestamp": 1.0, "prev_hash": "GENESIS"},
+        {"index": 0, "organ": "epic", "tier": "P0", "timestamp": 1, "prev_hash": "GENESIS"},
+        {"index": "0", "organ": "epic", "tier": "P0", "timestamp": "1.0", "prev_hash": "GENESIS"},
+    ]
+    for block in odd:
+        assert ledger.hash_block(block) == _reference(block)
@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from veil import cli, ledger, ledger_query
+
+
+def _append(entries):
+    # (organ, tier, timestamp)
+    return ledger._append_entries(list(entries))
+
+
+@pytest.fixture
+def populated(ledger_dir):
+    _append((f"organ{i % 5}", "P0" if i % 2 else "P1", 1000.0 + i) for i in range(50))
+    return ledger_dir
+
+
+def _brute(organ=None, tier=None, since=None, until=None):
+    return [
+        b for b in ledger.iter_ledger()
+        if (organ is None or b["organ"] == organ)
+        and (tier is None or b["tier"] == tier)
+        and (since is None or b["timestamp"] >= since)
+        and (until is None or b["timestamp"] <= until)
+    ]
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"organ": "organ3"},
+    {"tier": "P0"},
+    {"organ": "organ2", "tier": "P1"},
+    {"since": 1010.0, "until": 1020.0},
+    {"tier": "P0", "since": 1040.0},
+    {"organ": "organ1", "until": 1012.0},
+    {"organ": "missing"},
+])
+def test_query_matches_scan(populated, filters):
+    assert ledger_query.query_ledger(**filters) == _brute(**filters)
+
+
+def test_index_catches_up_incrementally(populated, monkeypatch):
+    assert ledger_query.last_activation("organ4")["index"] == 49
+    index = ledger_query.open_index()
+    saved = {"size": index.size}
+    index.close()
+    assert saved["size"] == (populated / "ledger.jsonl").stat().st_size
+
+    _append([("organ4", "P0", 2000.0)])
+    read_from = []
+    iter_jsonl = ledger._iter_jsonl
+    monkeypatch.setattr(ledger, "_iter_jsonl", lambda start=0, **kw: read_from.append(start) or iter_jsonl(start, **kw))
+
+    assert ledger_query.last_activation("organ4")["index"] == 50
+    assert read_from == [saved["size"]]
+    assert ledger_query.last_activation("never") is None
+    assert read_from == [saved["size"]]   # caught up: nothing read again
+
+
+def test_index_lookups_use_sqlite_indexes(populated):
+    index = ledger_query.open_index()
+    plan = lambda sql, *args: " ".join(r[-1] for r in index.db.execute("EXPLAIN QUERY PLAN " + sql, args))
+    assert "entries_organ" in plan("SELECT position FROM entries WHERE organ = ? ORDER BY position DESC LIMIT 1", "organ4")
+    found = index.find(since=1040.0, until=1042.0)
+    assert [p for p, _ in found] == [40, 41, 42]
+    assert "entries_timestamp" in plan(
+        "SELECT position FROM entries INDEXED BY entries_timestamp WHERE timestamp >= ? ORDER BY position", 1040.0
+    )
+    index.close()
+
+
+def test_old_json_index_is_replaced(ledger_dir):
+    _append([("epic", "P0", 1.0)])
+    ledger_query.LEDGER_INDEX_PATH.write_text('{"version": 1, "size": 0}')
+    assert [b["organ"] for b in ledger_query.query_ledger(tier="P0")] == ["epic"]
+
+
+def test_index_rebuilt_after_rewrite(populated):
+    ledger_query.open_index()
+    ledger.migrate_ledger_in_place(backup=False)
+    ledger._append_entries([("late", "P2", 3000.0)])
+    assert ledger_query.query_ledger(tier="P2") == _brute(tier="P2")
+    assert ledger_query.query_ledger(organ="organ0", newest_first=True, limit=2) == _brute(organ="organ0")[::-1][:2]
+
+
+def test_legacy_json_ledger_is_queryable(ledger_dir):
+    blocks = [{"index": i, "organ": "epic", "tier": "P0", "timestamp": float(i)} for i in range(3)]
+    (ledger_dir / "ledger.json").write_text(json.dumps(blocks))
+    assert [b["index"] for b in ledger_query.query_ledger(since=1.0)] == [1, 2]
+    assert not ledger_query.LEDGER_INDEX_PATH.exists()
+
+
+def test_cli_query(populated, capsys):
+    with pytest.raises(SystemExit) as e:
+        cli.main(["ledger", "query", "--organ", "organ2", "--last", "--json"])
+    assert e.value.code == 0
+    assert json.loads(capsys.readouterr().out)["index"] == 47
+
+    with pytest.raises(SystemExit) as e:
+        cli.main(["ledger", "query", "--tier", "P9"])
+    assert e.value.code == 1
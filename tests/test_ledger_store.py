@@ -0,0 +1,104 @@
+import json
+import sqlite3
+
+import pytest
+
+from veil import cli, ledger, ledger_query, ledger_store
+
+
+@pytest.fixture
+def sqlite_ledger(ledger_dir, monkeypatch):
+    monkeypatch.setenv(ledger_store.LEDGER_BACKEND_ENV, "sqlite")
+    return ledger_dir / "ledger.sqlite3"
+
+
+def _rows(db_path, sql):
+    with sqlite3.connect(db_path) as db:
+        return db.execute(sql).fetchall()
+
+
+def test_backend_selection(ledger_dir, monkeypatch):
+    assert isinstance(ledger_store.get_store(), ledger_store.FileLedgerStore)
+    monkeypatch.setenv(ledger_store.LEDGER_BACKEND_ENV, "SQLite")
+    assert isinstance(ledger_store.get_store(), ledger_store.SqliteLedgerStore)
+    monkeypatch.setenv(ledger_store.LEDGER_BACKEND_ENV, "mongo")
+    with pytest.raises(RuntimeError):
+        ledger_store.get_store()
+
+
+def test_sqlite_append_matches_file_hashing(sqlite_ledger, ledger_dir, monkeypatch):
+    entries = [("epic", "P0", 1000.5), ("mfa", "P1", 1001.25), ("rbac", "P1", 1002.0)]
+    assert ledger._append_entries(entries[:1]) == [0]
+    assert ledger._append_entries(entries[1:]) == [1, 2]
+    sqlite_blocks = ledger.load_ledger()
+
+    monkeypatch.delenv(ledger_store.LEDGER_BACKEND_ENV)
+    ledger._append_entries(entries)
+    assert ledger.load_ledger() == sqlite_blocks
+
+    assert _rows(sqlite_ledger, "PRAGMA journal_mode") == [("wal",)]
+    assert _rows(sqlite_ledger, "SELECT organ FROM blocks WHERE tier = 'P1' ORDER BY timestamp") == [("mfa",), ("rbac",)]
+    indexes = {name for (name,) in _rows(sqlite_ledger, "SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"blocks_organ", "blocks_tier", "blocks_timestamp"} <= indexes
+
+
+def test_sqlite_verify_checkpoint_and_tampering(sqlite_ledger, capsys):
+    ledger._append_entries([(f"organ{i}", "P0", float(i)) for i in range(300)])
+    assert ledger.verify_ledger(strict_hash=True)
+    ledger._append_entries([("late", "P1", 500.0)])
+    capsys.readouterr()
+    assert ledger.verify_ledger(strict_hash=True)
+    assert "1 new block(s) since checkpoint" in capsys.readouterr().out
+    assert ledger.verify_ledger(full=True, workers=2)
+
+    with sqlite3.connect(sqlite_ledger) as db:
+        body = json.loads(db.execute("SELECT body FROM blocks WHERE position = 10").fetchone()[0])
+        body["organ"] = "forged"
+        db.execute("UPDATE blocks SET body = ? WHERE position = 10", (json.dumps(body),))
+    assert not ledger.verify_ledger(full=True)
+    assert "tampering detected at index 10" in capsys.readouterr().out
+
+
+def test_sqlite_migrate_quarantines_legacy(sqlite_ledger, ledger_dir):
+    legacy = [{"note": "pre-schema"}, {"name": "epic", "priority": "P0", "timestamp": 1.0}, {"organ": "mfa", "tier": "P1", "timestamp": 2.0}]
+    ledger.save_ledger(legacy)
+    assert ledger.migrate_ledger_in_place() == (2, 1, 3)
+    assert [b["organ"] for b in ledger.iter_ledger()] == ["epic", "mfa"]
+    assert ledger.verify_ledger(strict_hash=True, allow_legacy_prefix=False)
+    assert json.loads((ledger_dir / "ledger_legacy.json").read_text())[0]["note"] == "pre-schema"
+    assert (ledger_dir / "ledger.sqlite3.bak").exists()
+
+
+def test_sqlite_migrate_crash_keeps_quarantine(sqlite_ledger, ledger_dir, monkeypatch):
+    legacy = [{"note": "pre-schema"}, {"organ": "mfa", "tier": "P1", "timestamp": 2.0}]
+    ledger.save_ledger(legacy)
+    real = ledger._append_quarantine
+
+    def crash_after_quarantine(*args):
+        real(*args)
+        raise KeyboardInterrupt   # dies before the rewrite commits
+
+    monkeypatch.setattr(ledger, "_append_quarantine", crash_after_quarantine)
+    with pytest.raises(KeyboardInterrupt):
+        ledger.migrate_ledger_in_place()
+    assert json.loads((ledger_dir / "ledger_legacy.json").read_text())[0]["note"] == "pre-schema"
+    assert ledger_store.SqliteLedgerStore().count() == 2   # rolled back
+
+    monkeypatch.setattr(ledger, "_append_quarantine", real)
+    assert ledger.migrate_ledger_in_place() == (1, 1, 2)
+    assert [q["note"] for q in json.loads((ledger_dir / "ledger_legacy.json").read_text())] == ["pre-schema"]
+    assert _rows(sqlite_ledger, "SELECT key FROM meta WHERE key = 'migrate_quarantine'") == []
+
+
+def test_sqlite_query_and_convert(ledger_dir, monkeypatch, capsys):
+    ledger._append_entries([(f"organ{i % 3}", "P0" if i % 2 else "P1", 100.0 + i) for i in range(20)])
+    expected = ledger_query.query_ledger(organ="organ1", since=105.0, newest_first=True, limit=3)
+
+    with pytest.raises(SystemExit) as e:
+        cli.main(["--yes", "ledger", "convert", "--to", "sqlite"])
+    assert e.value.code == 0
+    monkeypatch.setenv(ledger_store.LEDGER_BACKEND_ENV, "sqlite")
+    assert ledger_query.query_ledger(organ="organ1", since=105.0, newest_first=True, limit=3) == expected
+    assert ledger.verify_ledger(strict_hash=True)
+    with pytest.raises(RuntimeError):
+        ledger_store.convert_ledger_to_sqlite()
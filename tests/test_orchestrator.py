@@ -0,0 +1,136 @@
+import time
+
+import pytest
+
+from veil import orchestrator
+from veil.orchestrator import backends, orchestrator as orch_module, pidfile, status_cache, supervisor
+
+
+@pytest.fixture
+def specs(tmp_path, monkeypatch):
+    spec_dir = tmp_path / "specs"
+    spec_dir.mkdir()
+    (spec_dir / "sentinel.yaml").write_text("name: sentinel\ntier: P0\nglyph: x\naffirmation: y\n")
+    (spec_dir / "rbac.yaml").write_text("name: rbac\ntier: P1\nglyph: x\naffirmation: y\n")
+    monkeypatch.setattr(orch_module, "SPECS_DIR", spec_dir)
+    monkeypatch.setattr(backends, "_INSTANCES", {})
+    orch_module.refresh_specs()
+    yield spec_dir
+    orch_module.refresh_specs()
+
+
+def test_memory_backend(specs, monkeypatch):
+    monkeypatch.setenv(backends.ORCHESTRATOR_BACKEND_ENV, "memory")
+    assert [(s.name, s.tier, s.running) for s in orchestrator.list_statuses()] == [
+        ("rbac", "P1", False), ("sentinel", "P0", False),
+    ]
+    st = orchestrator.start("sentinel")
+    assert st.running and st.pid and st.tier == "P0"
+    assert orchestrator.start("sentinel").pid == st.pid
+    assert orchestrator.start("rbac", dry_run=True).running is False
+    assert orchestrator.status("sentinel").running
+    assert orchestrator.stop("sentinel").running is False
+    assert not hasattr(st, "__dict__")   # compact __slots__ status
+
+
+def test_unknown_backend(specs, monkeypatch):
+    monkeypatch.setenv(backends.ORCHESTRATOR_BACKEND_ENV, "carrier-pigeon")
+    with pytest.raises(RuntimeError, match="Unknown orchestrator backend"):
+        orchestrator.list_statuses()
+
+
+def test_backend_interface(specs):
+    with pytest.raises(TypeError):
+        backends.Backend()
+
+    st = backends.MemoryBackend().status("sentinel", "P0")
+    assert backends._with_tier(st, "P1").tier == "P1" and st.tier == "P0"
+
+
+def test_specs_discovered_once(specs, monkeypatch):
+    monkeypatch.setenv(backends.ORCHESTRATOR_BACKEND_ENV, "memory")
+    assert [o["name"] for o in orchestrator.list()] == ["rbac", "sentinel"]
+    (specs / "mfa.yaml").write_text("name: mfa\ntier: P1\nglyph: x\naffirmation: y\n")
+    assert "mfa" not in {o["name"] for o in orchestrator.list()}
+    orch_module.refresh_specs()
+    assert "mfa" in {o["name"] for o in orchestrator.list()}
+
+
+def test_pidfile_backend_spawns_and_stops(specs, tmp_path, monkeypatch):
+    monkeypatch.setenv(backends.ORCHESTRATOR_BACKEND_ENV, "pidfile")
+    monkeypatch.setattr(pidfile, "DEFAULT_PID_DIR", tmp_path / "run")
+    monkeypatch.setattr(pidfile, "DEFAULT_LOG_DIR", tmp_path / "log")
+    monkeypatch.setattr(pidfile, "DEFAULT_ORGANS_DIR", tmp_path / "organs")
+    monkeypatch.setattr(pidfile, "_dirs_ready", None)
+    monkeypatch.setattr(status_cache, "_DEFAULT", {})
+    organ = tmp_path / "organs" / "sentinel"
+    organ.mkdir(parents=True)
+    (organ / "run.sh").write_text("#!/bin/sh\necho up\nexec sleep 30\n")
+    (organ / "run.sh").chmod(0o755)
+    (tmp_path / "organs" / "extra").mkdir()
+    stubborn = tmp_path / "organs" / "stubborn"
+    stubborn.mkdir()
+    (stubborn / "run.sh").write_text("#!/bin/sh\ntrap '' TERM\necho up\nexec sleep 30\n")
+    (stubborn / "run.sh").chmod(0o755)
+
+    st = orchestrator.start("sentinel")
+    assert st.running and st.tier == "P0" and st.state == "running"
+    by_name = {s.name: s for s in orchestrator.list_services()}
+    assert set(by_name) == {"sentinel", "rbac", "extra", "stubborn"}
+    assert by_name["sentinel"].pid == st.pid and not by_name["extra"].running
+
+    assert orchestrator.stop("sentinel").running is False
+    assert not (tmp_path / "run" / "sentinel.pid").exists()
+    assert pidfile._proc_start_ticks(st.pid) is None
+    with pytest.raises(FileNotFoundError):
+        orchestrator.start("rbac")
+
+    # SIGTERM is ignored: the pidfile stays until SIGKILL has ended the process.
+    st = orchestrator.start("stubborn")
+    deadline = time.monotonic() + 5
+    while b"up" not in (tmp_path / "log" / "stubborn.log").read_bytes() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    alive_at_removal = []
+    remove_pid = pidfile.remove_pid
+
+    def checked_remove(name, pid=None, pid_dir=None):
+        alive_at_removal.append(pidfile._proc_start_ticks(pid) is not None)
+        remove_pid(name, pid, pid_dir)
+
+    monkeypatch.setattr(pidfile, "remove_pid", checked_remove)
+    began = time.monotonic()
+    assert backends.get_backend().stop("stubborn", "P2", timeout=0.2).running is False
+    assert time.monotonic() - began >= 0.2
+    assert alive_at_removal == [False]
+    assert not (tmp_path / "run" / "stubborn.pid").exists()
+    assert pidfile._proc_start_ticks(st.pid) is None
+
+
+def test_supervisor_backend_spawns_detached_unless_it_owns_the_supervisor(specs, tmp_path, monkeypatch):
+    monkeypatch.setenv(backends.ORCHESTRATOR_BACKEND_ENV, "supervisor")
+    monkeypatch.setattr(pidfile, "DEFAULT_PID_DIR", tmp_path / "run")
+    monkeypatch.setattr(pidfile, "DEFAULT_LOG_DIR", tmp_path / "log")
+    monkeypatch.setattr(pidfile, "DEFAULT_ORGANS_DIR", tmp_path / "organs")
+    monkeypatch.setattr(pidfile, "_dirs_ready", None)
+    monkeypatch.setattr(status_cache, "_DEFAULT", {})
+    monkeypatch.setattr(supervisor, "_DEFAULT", None)
+    monkeypatch.setattr(supervisor, "_OWNED", False)
+    for name in ("sentinel", "rbac"):
+        organ = tmp_path / "organs" / name
+        organ.mkdir(parents=True)
+        (organ / "run.sh").write_text("#!/bin/sh\nexec sleep 30\n")
+        (organ / "run.sh").chmod(0o755)
+
+    # Like `veil orchestrator start`: no supervisor loop here, so the organ runs detached.
+    st = orchestrator.start("sentinel")
+    assert st.running and supervisor.running() is None
+    assert pidfile.status("sentinel").pid == st.pid
+
+    sup = supervisor.own()
+    try:
+        st = orchestrator.start("rbac")
+        assert "rbac" in sup and sup.status("rbac").pid == st.pid
+        assert "sentinel" not in sup and orchestrator.status("sentinel").running
+    finally:
+        orchestrator.stop("sentinel")
+        sup.shutdown(timeout=2)
@@ -0,0 +1,81 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from veil.orchestrator import pidfile
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(pidfile, "DEFAULT_PID_DIR", tmp_path / "run")
+    monkeypatch.setattr(pidfile, "DEFAULT_LOG_DIR", tmp_path / "log")
+    monkeypatch.setattr(pidfile, "DEFAULT_ORGANS_DIR", tmp_path / "organs")
+    monkeypatch.setattr(pidfile, "_dirs_ready", None)
+    for name in ("alpha", "beta", "gamma"):
+        (tmp_path / "organs" / name).mkdir(parents=True)
+    (tmp_path / "run").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_snapshot_reports_live_pid(dirs, child):
+    pidfile.write_pid("alpha", child.pid)
+    pid, start = (dirs / "run" / "alpha.pid").read_text().split()
+    assert int(pid) == child.pid and int(start) == pidfile._proc_start_ticks(child.pid)
+
+    snap = pidfile.snapshot()
+    assert [s.name for s in snap] == ["alpha", "beta", "gamma"]
+    assert [s.name for s in snap.running()] == ["alpha"]
+    assert snap.get("alpha").pid == child.pid
+    assert pidfile.status("alpha").running
+
+
+def test_reused_pid_is_not_running(dirs, child):
+    start = pidfile._proc_start_ticks(child.pid)
+    (dirs / "run" / "alpha.pid").write_text(f"{child.pid} {start - 1}\n")
+    assert not pidfile.snapshot().get("alpha").running
+    assert not (dirs / "run" / "alpha.pid").exists()
+
+
+def test_legacy_pidfile_checked_against_mtime(dirs, child):
+    path = dirs / "run" / "beta.pid"
+    path.write_text(f"{child.pid}\n")
+    assert pidfile.status("beta").running
+
+    path.write_text(f"{child.pid}\n")
+    old = time.time() - 3600   # written long before the process started
+    os.utime(path, (old, old))
+    assert not pidfile.status("beta").running
+
+
+def test_dead_pid_is_cleaned_and_other_pidfiles_survive(dirs, child):
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    pidfile.write_pid("alpha", child.pid)
+    (dirs / "run" / "gamma.pid").write_text(f"{dead.pid} 1\n")
+    (dirs / "run" / "orphan.pid").write_text(f"{child.pid} {pidfile._proc_start_ticks(child.pid)}\n")
+
+    snap = pidfile.snapshot()
+    assert {s.name for s in snap.running()} == {"alpha", "orphan"}
+    assert not (dirs / "run" / "gamma.pid").exists()
+    assert (dirs / "run" / "alpha.pid").exists()
+
+
+def test_directories_created_once(dirs, monkeypatch, child):
+    calls = []
+    real = type(dirs).mkdir
+    monkeypatch.setattr(type(dirs), "mkdir", lambda self, *a, **kw: (calls.append(self), real(self, *a, **kw)))
+    for _ in range(5):
+        pidfile.write_pid("alpha", child.pid)
+        pidfile.snapshot()
+    assert len(calls) == 2   # log dir and pid dir, once
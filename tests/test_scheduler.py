@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pytest
+
+from veil import compiler
+from veil.organ import Organ
+from veil.scheduler import DependencyError, build_graph, first_failure, run_graph
+
+
+def _organ(name, tier, *deps):
+    return Organ(name=name, tier=tier, glyph="🔷", affirmation=name, depends_on=list(deps))
+
+
+class _Recorder:
+    def __init__(self, delays=None, fail=()):
+        self.delays = delays or {}
+        self.fail = set(fail)
+        self.spans = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, organ):
+        start = time.monotonic()
+        time.sleep(self.delays.get(organ.name, 0.01))
+        with self._lock:
+            self.spans[organ.name] = (start, time.monotonic())
+        if organ.name in self.fail:
+            raise RuntimeError(f"{organ.name} failed")
+
+
+def test_dependent_starts_before_tier_barrier():
+    organs = [
+        _organ("epic", "P0"),
+        _organ("backup", "P0"),
+        _organ("mfa", "P1", "epic"),
+        _organ("rbac", "P1"),
+    ]
+    rec = _Recorder(delays={"backup": 0.3})
+    acts = run_graph(organs, workers=4, action=rec)
+
+    assert [a.organ.name for a in acts] == ["epic", "backup", "mfa", "rbac"]
+    assert all(a.ok for a in acts)
+    assert rec.spans["mfa"][0] >= rec.spans["epic"][1]
+    assert rec.spans["mfa"][1] < rec.spans["backup"][1]
+    assert rec.spans["rbac"][0] >= rec.spans["backup"][1]
+
+
+def test_cycles_and_unknown_dependencies_rejected():
+    with pytest.raises(DependencyError, match="a -> b -> a"):
+        build_graph([_organ("a", "P0", "b"), _organ("b", "P0", "a")])
+    # An explicit dependency on a higher tier closes a loop through the barrier.
+    with pytest.raises(DependencyError, match="cycle"):
+        build_graph([_organ("a", "P0", "b"), _organ("b", "P1")])
+    with pytest.raises(DependencyError, match="unknown organ 'ghost'"):
+        build_graph([_organ("a", "P0", "ghost")])
+    assert build_graph([_organ("a", "P1", "epic")], known=["epic"]) == [(set(), set())]
+
+
+def test_failed_dependency_skips_dependents_only():
+    organs = [
+        _organ("epic", "P0"),
+        _organ("mfa", "P1", "epic"),
+        _organ("session", "P1", "mfa"),
+        _organ("rbac", "P1"),
+    ]
+    acts = run_graph(organs, strict=False, action=_Recorder(fail={"epic"}))
+    by_name = {a.organ.name: a for a in acts}
+    assert by_name["epic"].error is not None
+    assert by_name["mfa"].started is None and by_name["session"].started is None
+    assert by_name["rbac"].ok
+    assert first_failure(acts).organ.name == "epic"
+
+
+def test_compile_all_runs_wavefront(ledger_dir, tmp_path, monkeypatch):
+    d = tmp_path / "specs"
+    d.mkdir()
+    (d / "all.yaml").write_text(
+        "---\nname: epic\ntier: P0\nglyph: g\naffirmation: a\n"
+        "---\nname: backup\ntier: P0\nglyph: g\naffirmation: a\n"
+        "---\nname: mfa\ntier: P1\nglyph: g\naffirmation: a\ndepends_on: [epic]\n"
+    )
+    rec = _Recorder(delays={"backup": 0.3})
+    monkeypatch.setattr(compiler.Organ, "activate", lambda self: rec(self))
+
+    p0, p1 = compiler.compile_all(harden=False, spec_dir=d)
+    assert (p0.activated, p1.activated) == (("epic", "backup"), ("mfa",))
+    assert rec.spans["mfa"][1] < rec.spans["backup"][1]
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+import yaml
+
+from veil import compiler, spec_registry
+from veil.organ import Organ, load_documents
+from veil.spec_registry import SpecRegistry
+
+
+@pytest.fixture
+def spec_dir(tmp_path):
+    d = tmp_path / "specs"
+    d.mkdir()
+    (d / "all_organs.yaml").write_text(
+        "---\nname: epic\ntier: P0\nglyph: \"🏥\"\naffirmation: old\n"
+        "---\nname: mfa\ntier: P1\nglyph: \"🔑\"\naffirmation: keys\n"
+    )
+    (d / "epic.yaml").write_text("name: epic\ntier: P0\nglyph: \"🏥\"\naffirmation: new\n")
+    return d
+
+
+def _touch(path, text):
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_multi_document_specs_deduplicated(spec_dir):
+    reg = SpecRegistry(spec_dir)
+    assert [(o.name, o.affirmation) for o in reg.organs()] == [("mfa", "keys"), ("epic", "new")]
+    assert reg.document("mfa")["glyph"] == "🔑"
+    assert reg.get("nope") is None
+
+
+def test_parses_only_changed_files(spec_dir):
+    reg = SpecRegistry(spec_dir)
+    first = reg.organs()
+    assert reg.parsed == 2
+    assert reg.organs() == first and reg.organs()[0] is first[0]
+    assert reg.parsed == 2
+
+    _touch(spec_dir / "epic.yaml", "name: epic\ntier: P1\nglyph: \"🏥\"\naffirmation: moved\n")
+    assert [o.name for o in reg.by_tier("P1")] == ["mfa", "epic"]
+    assert reg.parsed == 3
+
+    (spec_dir / "epic.yaml").unlink()
+    assert reg.get("epic").affirmation == "old"
+    assert reg.parsed == 3
+
+
+def test_disk_cache_skips_yaml_on_cold_start(spec_dir, spec_cache, monkeypatch):
+    assert len(SpecRegistry(spec_dir, cache_path=spec_cache).organs()) == 2
+
+    parse = spec_registry._parse
+
+    def no_yaml(path):
+        raise AssertionError(f"parsed {path}")
+
+    monkeypatch.setattr(spec_registry, "_parse", no_yaml)
+    cold = SpecRegistry(spec_dir, cache_path=spec_cache)
+    assert [o.name for o in cold.organs()] == ["mfa", "epic"]
+    assert cold.parsed == 0
+
+    monkeypatch.setattr(spec_registry, "_parse", parse)
+    _touch(spec_dir / "all_organs.yaml", "name: mfa\ntier: P1\nglyph: \"🔑\"\naffirmation: changed\n")
+    stale = SpecRegistry(spec_dir, cache_path=spec_cache)
+    assert stale.get("mfa").affirmation == "changed"
+    assert stale.parsed == 1
+
+
+def test_compile_all_parses_specs_once(ledger_dir, spec_dir, monkeypatch):
+    parsed = []
+    parse = spec_registry._parse
+    monkeypatch.setattr(spec_registry, "_parse", lambda path: parsed.append(path.name) or parse(path))
+
+    compiler.compile_all(harden=False, spec_dir=spec_dir)
+    compiler.compile_p0(spec_dir=spec_dir)
+    assert sorted(parsed) == ["all_organs.yaml", "epic.yaml"]
+
+
+def test_organ_load_all_reads_bundles(spec_dir):
+    assert [o.name for o in Organ.load_all(spec_dir / "all_organs.yaml")] == ["epic", "mfa"]
+    assert Organ.from_yaml_stream("---\n---\nname: x\ntier: P2\nglyph: g\naffirmation: a\n") == [
+        Organ(name="x", tier="P2", glyph="g", affirmation="a")
+    ]
+
+
+def test_fast_loader_matches_pure_python():
+    for path in sorted(spec_registry.SPECS.glob("*.yaml")):
+        text = path.read_text(encoding="utf-8")
+        assert load_documents(text) == [d for d in yaml.load_all(text, Loader=yaml.SafeLoader) if isinstance(d, dict)]
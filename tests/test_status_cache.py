@@ -0,0 +1,75 @@
+import subprocess
+import sys
+import time
+
+import pytest
+
+from veil.orchestrator import pidfile, status_cache
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(pidfile, "DEFAULT_PID_DIR", tmp_path / "run")
+    monkeypatch.setattr(pidfile, "DEFAULT_LOG_DIR", tmp_path / "log")
+    monkeypatch.setattr(pidfile, "DEFAULT_ORGANS_DIR", tmp_path / "organs")
+    monkeypatch.setattr(pidfile, "_dirs_ready", None)
+    (tmp_path / "organs" / "alpha").mkdir(parents=True)
+    (tmp_path / "run").mkdir()
+    return tmp_path
+
+
+@pytest.fixture
+def child():
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    yield proc
+    proc.kill()
+    proc.wait()
+
+
+def test_reuses_snapshot_until_directory_changes(dirs, child):
+    cache = status_cache.StatusCache(max_age=60)
+    if not cache.watching:
+        pytest.skip("inotify unavailable")
+    first = cache.snapshot()
+    assert cache.snapshot() is first and cache.rebuilds == 1
+    assert not first.get("alpha").running
+
+    pidfile.write_pid("alpha", child.pid)
+    snap = cache.snapshot()
+    assert snap is not first and snap.get("alpha").pid == child.pid
+
+    (dirs / "organs" / "beta").mkdir()
+    assert "beta" in cache.snapshot().statuses
+
+    pidfile.remove_pid("alpha")
+    assert not cache.snapshot().get("alpha").running
+    cache.close()
+
+
+def test_ttl_fallback_without_inotify(dirs, child, monkeypatch):
+    monkeypatch.setattr(status_cache, "_libc", lambda: None)
+    cache = status_cache.StatusCache(ttl=0.05)
+    assert not cache.watching
+    first = cache.snapshot()
+    pidfile.write_pid("alpha", child.pid)
+    assert cache.snapshot() is first   # within the TTL: stale on purpose
+    time.sleep(0.06)
+    assert cache.snapshot().get("alpha").running
+
+
+def test_missing_directory_is_watched_once_created(tmp_path):
+    cache = status_cache.StatusCache(pid_dir=tmp_path / "run", organs_dir=tmp_path / "organs", ttl=0)
+    assert not cache.watching
+    (tmp_path / "run").mkdir()
+    (tmp_path / "organs").mkdir()
+    cache.snapshot()
+    assert cache.watching or status_cache._libc() is None
+    cache.close()
+
+
+def test_invalidate_forces_rebuild(dirs):
+    cache = status_cache.StatusCache(max_age=60)
+    first = cache.snapshot()
+    cache.invalidate()
+    assert cache.snapshot() is not first
+    cache.close()
@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+
+import pytest
+
+from veil.orchestrator import pidfile, supervisor
+
+
+def _organ(organs_dir, name, body):
+    d = organs_dir / name
+    d.mkdir(parents=True)
+    script = d / "run.sh"
+    script.write_text("#!/bin/sh\n" + body)
+    script.chmod(0o755)
+
+
+@pytest.fixture(params=[True, False], ids=["pidfd", "waiter-thread"])
+def sup(request, tmp_path, monkeypatch):
+    monkeypatch.setattr(supervisor, "_HAS_PIDFD", request.param and supervisor._HAS_PIDFD)
+    organs = tmp_path / "organs"
+    _organ(organs, "steady", "echo up\nexec sleep 30\n")
+    _organ(organs, "crashy", "echo boom\nexit 3\n")
+    _organ(organs, "stubborn", "trap '' TERM\necho up\nwhile :; do sleep 0.05; done\n")
+    s = supervisor.Supervisor(organs, tmp_path / "log", tmp_path / "run", backoff_initial=0.05, backoff_max=0.2, stable_after=5)
+    yield s
+    s.shutdown(timeout=2)
+
+
+def test_spawns_logs_and_stops(sup, tmp_path):
+    st = sup.start("steady", tier="P0")
+    assert st.running and st.state == "running" and st.tier == "P0"
+    assert sup.start("steady", tier="P0").pid == st.pid   # already running: no second spawn
+    deadline = time.monotonic() + 5
+    while "up" not in open(st.log).read() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert open(st.log).read() == "up\n"
+
+    pid = st.pid
+    assert (tmp_path / "run" / "steady.pid").read_text().split()[0] == str(pid)
+    st = sup.stop("steady")
+    assert not (tmp_path / "run" / "steady.pid").exists()
+    assert (st.running, st.pid, st.state) == (False, None, "stopped")
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)   # reaped, not left as a zombie
+    with pytest.raises(FileNotFoundError):
+        sup.start("ghost")
+
+
+def test_crashed_organ_restarts_with_backoff(sup, tmp_path):
+    t0 = time.monotonic()
+    sup.start("crashy")
+    assert sup.wait_for("crashy", lambda s: s.restarts >= 3, timeout=5)
+    # 0.05 + 0.1 + 0.2 s of backoff before the third restart
+    assert time.monotonic() - t0 >= 0.35
+    st = sup.stop("crashy")
+    assert st.state == "stopped" and not st.running
+    restarts = st.restarts
+    time.sleep(0.3)
+    assert sup.status("crashy").restarts == restarts
+    assert (tmp_path / "log" / "crashy.log").read_text().count("boom") >= 3
+
+
+def test_start_during_stop_waits_for_the_stop(sup):
+    old = sup.start("stubborn").pid
+    assert sup.wait_for("stubborn", lambda s: s.running, timeout=5)
+    result = {}
+    stopper = threading.Thread(target=lambda: result.setdefault("stop", sup.stop("stubborn", timeout=0.5)))
+    stopper.start()
+    assert sup.wait_for("stubborn", lambda s: s.state == "stopping", timeout=5)
+
+    t0 = time.monotonic()
+    st = sup.start("stubborn")             # blocks until the SIGKILLed process is reaped
+    stopper.join(5)
+    assert not stopper.is_alive() and time.monotonic() - t0 < 3
+    assert result["stop"].pid != old         # the stop finished; the organ is the new process now
+    assert st.running and st.pid != old
+    with pytest.raises(ProcessLookupError):
+        os.kill(old, 0)
+    assert sup.status("stubborn").pid == st.pid
+
+
+def test_default_dirs_are_the_pidfile_dirs(tmp_path, monkeypatch):
+    for attr in ("DEFAULT_ORGANS_DIR", "DEFAULT_LOG_DIR", "DEFAULT_PID_DIR"):
+        monkeypatch.setattr(pidfile, attr, tmp_path / attr)
+    s = supervisor.Supervisor()
+    try:
+        assert (s.organs_dir, s.log_dir, s.pid_dir) == (
+            pidfile.DEFAULT_ORGANS_DIR, pidfile.DEFAULT_LOG_DIR, pidfile.DEFAULT_PID_DIR
+        )
+        assert s.status("sentinel").log == str(pidfile._log_file("sentinel"))
+    finally:
+        s.shutdown(timeout=1)
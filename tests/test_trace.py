@@ -0,0 +1,44 @@
+import json
+
+from veil import compiler, trace
+
+
+def _spec(spec_dir, name, tier):
+    (spec_dir / f"{name}.yaml").write_text(f"name: {name}\ntier: {tier}\nglyph: g\naffirmation: a\n")
+
+
+def test_compile_all_profile(ledger_dir, tmp_path, monkeypatch):
+    spec_dir = tmp_path / "specs"
+    spec_dir.mkdir()
+    for name, tier in [("epic", "P0"), ("mfa", "P1"), ("rbac", "P1")]:
+        _spec(spec_dir, name, tier)
+    monkeypatch.setattr(compiler.Organ, "activate", lambda self: None)
+
+    with trace.tracing() as tracer:
+        compiler.compile_all(harden=False, spec_dir=spec_dir, workers=2)
+
+    paths = {s.path(): s for s in tracer.spans}
+    assert ("compile.all", "compile.specs") in paths
+    assert ("compile.all", "compile.activate", "organ.activate") in paths
+    assert ("compile.all", "ledger.verify", "ledger.verify.chain") in paths
+    write = next(s for p, s in paths.items() if p[-1] == "ledger.write")
+    assert write.path()[:3] == ("compile.all", "compile.ledger", "ledger.append")
+    assert write.attrs["bytes"] == (ledger_dir / "ledger.jsonl").stat().st_size
+
+    summary = tracer.summary()
+    assert summary.splitlines()[1].startswith("compile.all")
+    assert "    organ.activate" in summary and "x3" in summary
+
+    out = tracer.write_chrome_trace(tmp_path / "trace.json")
+    events = json.loads(out.read_text())["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert sorted(e["args"]["organ"] for e in events if e["name"] == "organ.activate") == ["epic", "mfa", "rbac"]
+    root = next(e for e in events if e["name"] == "compile.all")
+    assert all(root["ts"] <= e["ts"] and e["ts"] + e["dur"] <= root["ts"] + root["dur"] + 1 for e in events)
+
+
+def test_span_is_noop_without_tracer():
+    assert trace.current() is None
+    with trace.span("x", bytes=1) as s:
+        s.add(bytes=2)
+        assert trace.current() is None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Set
+
+from .scheduler import _depends_on
+
+log = logging.getLogger(__name__)
+
+# Spec hash + ledger index of each organ's last successful activation.
+# Deleting it (or compiling with force=True) rebuilds every organ.
+BUILD_STATE_PATH: Path = Path("/opt/veil_os/cache/build_state.json")
+
+BUILD_STATE_VERSION = 1
+
+
+def spec_hash(doc: Dict[str, Any]) -> str:
+    """Content hash of one organ spec document (key order does not matter)."""
+    canonical = json.dumps(doc, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class BuildState:
+    """
+    Last successful build of each organ, keyed by organ name:
+    {"spec_hash": ..., "ledger_index": ..., "tier": ...}.
+
+    Like make's targets: an organ is up to date while its spec hash matches and
+    none of its `depends_on` organs is being rebuilt. Failed organs are
+    forgotten, so they are always retried.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = BUILD_STATE_PATH if path is None else path
+        self.organs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: Optional[Path] = None) -> "BuildState":
+        state = cls(path)
+        try:
+            data = json.loads(state.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return state
+        if isinstance(data, dict) and data.get("version") == BUILD_STATE_VERSION and isinstance(data.get("organs"), dict):
+            state.organs = {k: v for k, v in data["organs"].items() if isinstance(v, dict)}
+        return state
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": BUILD_STATE_VERSION, "organs": self.organs}
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(payload, sort_keys=True, indent=1), encoding="utf-8")
+                tmp.replace(self.path)
+            except OSError as e:
+                log.warning("⚠️ Build state not saved (%s): %s", self.path, e)
+
+    # --- queries ---
+
+    def up_to_date(self, name: str, digest: str) -> bool:
+        entry = self.organs.get(name)
+        return entry is not None and entry.get("spec_hash") == digest
+
+    def stale(self, organs: Sequence[Any], hashes: Dict[str, str]) -> Set[str]:
+        """
+        Names of the organs that must be (re)activated: changed or new specs,
+        previously failed organs, and everything depending on one of those.
+
+        Args:
+            organs: organs being compiled (with `name` and `depends_on`)
+            hashes: spec_hash() of every known organ spec, by name
+        """
+        deps = {o.name: _depends_on(o) for o in organs}
+        stale = {name for name in deps if not self.up_to_date(name, hashes.get(name, ""))}
+
+        # Propagate to dependents until nothing changes (graphs are small and acyclic).
+        changed = True
+        while changed:
+            changed = False
+            for name, on in deps.items():
+                if name not in stale and any(d in stale for d in on):
+                    stale.add(name)
+                    changed = True
+        return stale
+
+    # --- updates ---
+
+    def record(self, name: str, tier: str, digest: str, ledger_index: int) -> None:
+        with self._lock:
+            self.organs[name] = {"spec_hash": digest, "ledger_index": ledger_index, "tier": tier}
+
+    def forget(self, names: Iterable[str]) -> None:
+        with self._lock:
+            for name in names:
+                self.organs.pop(name, None)
@@ -2,13 +2,13 @@ import argparse
 import os
 import signal
 import sys
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
-from .compiler import (
-    compile_p0,
-    compile_all,
-    harden_service,
-)
+# Subcommand modules are imported inside their handlers, so `veil --help` and
+# `veil orchestrator status` do not pay for yaml, the ledger or the compiler
+# (see benchmarks/cli_startup.py).
 
 # Kill BrokenPipe spam when piping to head/grep
 signal.signal(signal.SIGPIPE, signal.SIG_DFL)
@@ -55,46 +55,111 @@ def _set_dry_run_env(dry_run: bool) -> None:
     os.environ["VEIL_DRY_RUN"] = "1" if dry_run else "0"
 
 
+@contextmanager
+def _profiled(args: argparse.Namespace) -> Iterator[None]:
+    """
+    --profile: trace the wrapped command and print a per-phase timing summary;
+    --trace-out also writes a Chrome trace (chrome://tracing, Perfetto).
+    """
+    if not (args.profile or args.trace_out):
+        yield
+        return
+
+    from .trace import tracing
+
+    with tracing() as tracer:
+        try:
+            yield
+        finally:
+            if args.profile:
+                print(tracer.summary(), file=sys.stderr)
+            if args.trace_out:
+                path = tracer.write_chrome_trace(args.trace_out)
+                print(f"🧾 Chrome trace written to {path}", file=sys.stderr)
+
+
+def _add_profile_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--profile", action="store_true", help="Print a per-phase timing summary when done.")
+    p.add_argument("--trace-out", metavar="PATH", help="Write a Chrome-trace JSON of the run to PATH.")
+
+
 # ----------------------------
 # Compile / Harden handlers
 # ----------------------------
 
 def handle_compile(args: argparse.Namespace) -> int:
+    from .compiler import compile_all
+
     _confirm_or_exit("compile", None, args.yes, args.no_input, args.dry_run)
     print(_banner(args.dry_run))
-    try:
-        compile_all(dry_run=args.dry_run)
-    except TypeError:
-        if args.dry_run:
-            raise SystemExit("❌ compile_all() does not support dry-run in this version.")
-        compile_all()
+    with _profiled(args):
+        try:
+            compile_all(dry_run=args.dry_run, workers=args.workers, force=args.force)
+        except TypeError:
+            if args.dry_run:
+                raise SystemExit("❌ compile_all() does not support dry-run in this version.")
+            compile_all(workers=args.workers, force=args.force)
     return 0
 
 
 def handle_compile_p0(args: argparse.Namespace) -> int:
+    from .compiler import compile_p0
+
     _confirm_or_exit("compile-p0", None, args.yes, args.no_input, args.dry_run)
     print(_banner(args.dry_run))
-    try:
-        compile_p0(dry_run=args.dry_run)
-    except TypeError:
-        if args.dry_run:
-            raise SystemExit("❌ compile_p0() does not support dry-run in this version.")
-        compile_p0()
+    with _profiled(args):
+        try:
+            compile_p0(dry_run=args.dry_run, workers=args.workers, force=args.force)
+        except TypeError:
+            if args.dry_run:
+                raise SystemExit("❌ compile_p0() does not support dry-run in this version.")
+            compile_p0(workers=args.workers, force=args.force)
     return 0
 
 
 def handle_compile_all(args: argparse.Namespace) -> int:
+    from .compiler import compile_all
+
     _confirm_or_exit("compile-all", args.target, args.yes, args.no_input, args.dry_run)
     print(_banner(args.dry_run))
-    compile_all(target=args.target, harden=args.harden, dry_run=args.dry_run)
+    with _profiled(args):
+        compile_all(target=args.target, harden=args.harden, dry_run=args.dry_run, workers=args.workers, force=args.force)
     return 0
 
 
+def _read_targets(path: str) -> list[str]:
+    """One target directory per line ('-' = stdin); blank lines and # comments are skipped."""
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        try:
+            text = Path(path).read_text(encoding="utf-8")
+        except OSError as e:
+            raise SystemExit(f"❌ Cannot read targets file {path}: {e}")
+    lines = (line.split("#", 1)[0].strip() for line in text.splitlines())
+    return [line for line in lines if line]
+
+
 def handle_harden(args: argparse.Namespace) -> int:
-    _confirm_or_exit("harden", args.target, args.yes, args.no_input, args.dry_run)
+    from .compiler import format_harden_report, harden_service, harden_targets
+
+    if args.target:
+        _confirm_or_exit("harden", args.target, args.yes, args.no_input, args.dry_run)
+        print(_banner(args.dry_run))
+        harden_service(args.target, dry_run=args.dry_run)
+        return 0
+
+    targets = list(args.targets or [])
+    if args.targets_from:
+        targets += _read_targets(args.targets_from)
+    if not targets:
+        raise SystemExit("❌ No hardening targets given.")
+
+    _confirm_or_exit("harden", f"{len(targets)} target(s)", args.yes, args.no_input, args.dry_run)
     print(_banner(args.dry_run))
-    harden_service(args.target, dry_run=args.dry_run)
-    return 0
+    results = harden_targets(targets, dry_run=args.dry_run, workers=args.workers)
+    print(format_harden_report(results, dry_run=args.dry_run))
+    return 0 if all(r.ok for r in results) else 1
 
 
 # ----------------------------
@@ -143,6 +208,82 @@ def orch_stop(args: argparse.Namespace) -> int:
     return 0
 
 
+# ----------------------------
+# Ledger handlers
+# ----------------------------
+
+def ledger_convert(args: argparse.Namespace) -> int:
+    _confirm_or_exit("ledger convert", None, args.yes, args.no_input, args.dry_run)
+    print(_banner(args.dry_run))
+
+    from .ledger import convert_ledger_to_jsonl
+    from .ledger_store import convert_ledger_to_sqlite
+    convert = convert_ledger_to_sqlite if args.to == "sqlite" else convert_ledger_to_jsonl
+    try:
+        convert(dry_run=args.dry_run)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+    return 0
+
+
+def ledger_migrate(args: argparse.Namespace) -> int:
+    _confirm_or_exit("ledger migrate", None, args.yes, args.no_input, args.dry_run)
+    print(_banner(args.dry_run))
+    if args.dry_run:
+        raise SystemExit("❌ ledger migrate does not support dry-run in this version.")
+
+    from .ledger import migrate_ledger_in_place
+    modified, quarantined, total = migrate_ledger_in_place(backup=not args.no_backup, resume=not args.restart)
+    print(f"modified={modified} quarantined={quarantined} total={total}", flush=True)
+    return 0
+
+
+def ledger_verify(args: argparse.Namespace) -> int:
+    from .ledger import verify_ledger
+    ok = verify_ledger(strict_hash=args.strict_hash, full=args.full, workers=args.workers)
+    return 0 if ok else 1
+
+
+def _parse_when(value: str) -> float:
+    """
+    UNIX timestamp or ISO date/datetime (local time unless it carries an offset).
+    """
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    from datetime import datetime
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Not a timestamp or ISO date: {value}")
+
+
+def ledger_query(args: argparse.Namespace) -> int:
+    import json
+    import time
+    from .ledger_query import query_ledger
+
+    blocks = query_ledger(
+        organ=args.organ,
+        tier=args.tier,
+        since=args.since,
+        until=args.until,
+        limit=1 if args.last else args.limit,
+        newest_first=args.last or args.newest_first,
+    )
+    for b in blocks:
+        if args.json:
+            print(json.dumps(b, sort_keys=True), flush=True)
+            continue
+        try:
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(float(b["timestamp"])))
+        except (KeyError, TypeError, ValueError, OverflowError, OSError):
+            when = "?"
+        print(f"{b.get('index')}\t{when}\t{b.get('tier')}\t{b.get('organ')}\t{str(b.get('hash', ''))[:12]}", flush=True)
+    return 0 if blocks else 1
+
+
 # ----------------------------
 # Parser
 # ----------------------------
@@ -161,25 +302,41 @@ def build_parser() -> argparse.ArgumentParser:
 
     # compile
     p_compile = subparsers.add_parser("compile", help="Compile (legacy default).")
+    p_compile.add_argument("--workers", type=int, help="Organs activated at once per tier (1 = serial).")
+    p_compile.add_argument("--force", action="store_true", help="Re-activate every organ, even if up to date.")
+    _add_profile_args(p_compile)
     p_compile.set_defaults(func=handle_compile)
 
     # compile-p0
     p_p0 = subparsers.add_parser("compile-p0", help="Compile Phase 0 only.")
+    p_p0.add_argument("--workers", type=int, help="Organs activated at once (1 = serial).")
+    p_p0.add_argument("--force", action="store_true", help="Re-activate every organ, even if up to date.")
+    _add_profile_args(p_p0)
     p_p0.set_defaults(func=handle_compile_p0)
 
     # compile-all
     p_all = subparsers.add_parser("compile-all", help="Compile everything for a target directory.")
     p_all.add_argument("--target", required=True, type=_ensure_dir, help="Target service directory for compilation.")
     p_all.add_argument("--harden", action="store_true", help="Also run hardening as part of compile-all.")
+    p_all.add_argument("--workers", type=int, help="Organs activated at once per tier (1 = serial).")
+    p_all.add_argument("--force", action="store_true", help="Re-activate every organ, even if up to date.")
+    _add_profile_args(p_all)
     p_all.set_defaults(func=handle_compile_all)
 
     # harden
-    p_harden = subparsers.add_parser("harden", help="Harden a specific target directory.")
-    p_harden.add_argument("--target", required=True, type=_ensure_dir, help="Target service directory to harden.")
+    p_harden = subparsers.add_parser("harden", help="Harden one or many target directories.")
+    g_harden = p_harden.add_mutually_exclusive_group(required=True)
+    g_harden.add_argument("--target", type=_ensure_dir, help="Target service directory to harden.")
+    g_harden.add_argument("--targets", nargs="+", metavar="DIR", help="Harden several directories in one process.")
+    g_harden.add_argument("--targets-from", metavar="FILE", help="Read target directories from FILE (one per line, '-' = stdin).")
+    p_harden.add_argument("--workers", type=int, help="Targets hardened at once (with --targets/--targets-from).")
     p_harden.set_defaults(func=handle_harden)
 
     # orchestrator
-    p_orch = subparsers.add_parser("orchestrator", help="Service orchestrator (list/start/stop/status).")
+    p_orch = subparsers.add_parser(
+        "orchestrator",
+        help="Service orchestrator (list/start/stop/status); VEIL_ORCHESTRATOR_BACKEND=supervisor|pidfile|memory.",
+    )
     orch_sub = p_orch.add_subparsers(dest="orch_cmd", required=True)
 
     p_ol = orch_sub.add_parser("list", help="List services")
@@ -198,6 +355,41 @@ def build_parser() -> argparse.ArgumentParser:
     p_osp.add_argument("--force", action="store_true")
     p_osp.set_defaults(func=orch_stop)
 
+    # ledger
+    p_ledger = subparsers.add_parser("ledger", help="Organ activation ledger (convert/migrate/verify/query).")
+    ledger_sub = p_ledger.add_subparsers(dest="ledger_cmd", required=True)
+
+    p_lc = ledger_sub.add_parser("convert", help="One-time conversion of ledger.json to append-only ledger.jsonl")
+    p_lc.add_argument(
+        "--to",
+        choices=("jsonl", "sqlite"),
+        default="jsonl",
+        help="jsonl (default) or sqlite: copy the file ledger into the SQLite store (VEIL_LEDGER_BACKEND=sqlite).",
+    )
+    p_lc.set_defaults(func=ledger_convert)
+
+    p_lm = ledger_sub.add_parser("migrate", help="Rewrite the ledger as a canonical chain (resumable)")
+    p_lm.add_argument("--no-backup", action="store_true", help="Do not keep the previous ledger as .bak.")
+    p_lm.add_argument("--restart", action="store_true", help="Ignore progress of an interrupted migration.")
+    p_lm.set_defaults(func=ledger_migrate)
+
+    p_lv = ledger_sub.add_parser("verify", help="Verify ledger hash chain")
+    p_lv.add_argument("--strict-hash", action="store_true", help="Fail on blocks without a stored hash.")
+    p_lv.add_argument("--full", action="store_true", help="Re-check every block, ignoring the verification checkpoint.")
+    p_lv.add_argument("--workers", type=int, default=1, help="Hash chunks on N processes (0 = one per CPU).")
+    p_lv.set_defaults(func=ledger_verify)
+
+    p_lq = ledger_sub.add_parser("query", help="Find ledger blocks by organ, tier and time window (indexed)")
+    p_lq.add_argument("--organ", help="Organ name.")
+    p_lq.add_argument("--tier", help="Tier, e.g. P0.")
+    p_lq.add_argument("--since", type=_parse_when, help="Earliest timestamp (UNIX seconds or ISO date/datetime).")
+    p_lq.add_argument("--until", type=_parse_when, help="Latest timestamp (UNIX seconds or ISO date/datetime).")
+    p_lq.add_argument("--limit", type=int, help="Return at most N blocks.")
+    p_lq.add_argument("--newest-first", action="store_true", help="Most recent blocks first.")
+    p_lq.add_argument("--last", action="store_true", help="Only the most recent match.")
+    p_lq.add_argument("--json", action="store_true", help="Print matching blocks as JSON lines.")
+    p_lq.set_defaults(func=ledger_query)
+
     return parser
 
 
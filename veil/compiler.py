@@ -1,20 +1,25 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from types import ModuleType
+import importlib.util
 import logging
-import subprocess
-import sys
-from typing import Iterable, List
+import threading
+from typing import Iterable, List, Sequence
 
+import yaml
+
+from .build_state import BuildState, spec_hash
 from .organ import Organ
-from .ledger import append_ledger_entry, verify_ledger
+from .ledger import LedgerBatch, ledger_batch, verify_ledger
+from .scheduler import DEFAULT_WORKERS, first_failure, run_graph
+from .spec_registry import SPECS, registry
+from . import trace
 
 log = logging.getLogger(__name__)
 
-# Directory containing YAML organ specs
-SPECS: Path = Path(__file__).parent / "specs"
-
 # Absolute path to the Auto-Hardener script
 HARDENER_PATH: Path = Path(__file__).resolve().parents[1] / "autohardener.py"
 
@@ -24,102 +29,320 @@ class CompileResult:
     """Summary of what was compiled/activated."""
     tier: str
     activated: tuple[str, ...]
-
-
-def _iter_organ_specs(spec_dir: Path = SPECS) -> Iterable[Path]:
-    """Yield organ spec YAMLs in deterministic order (reproducible builds)."""
-    yield from sorted(spec_dir.glob("*.yaml"), key=lambda p: p.name)
+    # Up to date organs that were not re-activated (incremental compile)
+    skipped: tuple[str, ...] = ()
 
 
 def _load_organs(spec_dir: Path = SPECS) -> List[Organ]:
-    """Load all organ YAML specs into Organ objects."""
-    organs: List[Organ] = []
-    for spec in _iter_organ_specs(spec_dir):
-        organs.append(Organ.from_yaml(spec))
-    return organs
+    """
+    All organ specs as Organ objects, in deterministic order (reproducible builds).
+
+    Served from the shared spec registry: unchanged files are not re-parsed.
+    """
+    return registry(spec_dir).organs()
 
 
 # ------------------------------------------------------------
 # 🔱 HARDENER INTEGRATION
 # ------------------------------------------------------------
 
-def harden_service(target: str | Path, dry_run: bool = False) -> None:
-    """
-    Invoke the Veil Auto-Hardener against a target service directory.
+@dataclass(frozen=True, slots=True)
+class HardenResult:
+    """Outcome of hardening one target directory."""
+    target: Path
+    changed: int = 0     # files rewritten (or that would be, in dry-run)
+    created: int = 0     # ... of which did not exist yet
+    checked: int = 0     # files covered by the target's rules
+    diff: str = ""
+    error: str | None = None
 
-    Example:
-        harden_service("/home/user/veil_os/projects/test_project")
-    """
-    if not HARDENER_PATH.exists():
-        raise FileNotFoundError(f"❌ Hardener not found at: {HARDENER_PATH}")
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
-    target_path = Path(target).expanduser().resolve()
 
+_HARDENER: ModuleType | None = None
+_HARDENER_LOCK = threading.Lock()
+
+
+def _load_hardener() -> ModuleType:
+    """
+    The Auto-Hardener script imported as a module (once per process), so
+    hardening does not pay for a new interpreter per target.
+    """
+    global _HARDENER
+    with _HARDENER_LOCK:
+        if _HARDENER is None:
+            if not HARDENER_PATH.exists():
+                raise FileNotFoundError(f"❌ Hardener not found at: {HARDENER_PATH}")
+            spec = importlib.util.spec_from_file_location("veil_autohardener", HARDENER_PATH)
+            if spec is None or spec.loader is None:
+                raise ImportError(f"❌ Cannot load hardener from: {HARDENER_PATH}")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _HARDENER = module
+        return _HARDENER
+
+
+def _hardening_target(target: str | Path) -> Path:
+    target_path = Path(target).expanduser().resolve()
     if not target_path.exists():
         raise FileNotFoundError(f"❌ Hardening target does not exist: {target_path}")
     if not target_path.is_dir():
         raise NotADirectoryError(f"❌ Hardening target is not a directory: {target_path}")
+    return target_path
 
-    cmd = [sys.executable, str(HARDENER_PATH), "--target", str(target_path)]
-    if dry_run:
-        cmd.append("--dry-run")
+
+def harden_service(target: str | Path, dry_run: bool = False) -> None:
+    """
+    Invoke the Veil Auto-Hardener against a target service directory.
+
+    Runs in-process (the hardener's ensure_rules, with the target's own rules
+    file if it has one); output is the same as the standalone script's.
+
+    Example:
+        harden_service("/home/user/veil_os/projects/test_project")
+    """
+    hardener = _load_hardener()
+    target_path = _hardening_target(target)
 
     log.info("🔱 Running Auto-Hardener on: %s", target_path)
 
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(
-            f"❌ Auto-Hardener failed (exit={e.returncode}): {' '.join(cmd)}"
-        ) from e
+        with trace.span("compile.harden", target=str(target_path)):
+            results = hardener.ensure_rules(target_path, dry_run=dry_run)
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        raise RuntimeError(f"❌ Auto-Hardener failed on {target_path}: {e}") from e
+    if not any(r.changed for r in results):
+        hardener.log(f"No changes required ({len(results)} file(s) checked)")
 
     log.info("🔱 Hardening pass complete.\n")
 
 
+def harden_target(target: str | Path, dry_run: bool = False) -> HardenResult:
+    """
+    Harden one target in-process without printing; failures are returned,
+    not raised.
+    """
+    try:
+        hardener = _load_hardener()
+        target_path = _hardening_target(target)
+    except (OSError, ImportError) as e:
+        return HardenResult(target=Path(target), error=str(e))
+    except Exception as e:
+        # A broken hardener module (SyntaxError, ...) fails this target, not the batch.
+        return HardenResult(target=Path(target), error=f"❌ Hardener failed to load: {type(e).__name__}: {e}")
+
+    try:
+        with trace.span("harden.target", target=str(target_path)):
+            results = hardener.apply_rules(target_path, dry_run, label=str(target_path))
+    except Exception as e:
+        return HardenResult(target=target_path, error=f"❌ {type(e).__name__}: {e}")
+    return HardenResult(
+        target=target_path,
+        changed=sum(r.changed for r in results),
+        created=sum(r.created for r in results),
+        checked=len(results),
+        diff="".join(r.diff for r in results),
+    )
+
+
+def harden_targets(
+    targets: Iterable[str | Path],
+    *,
+    dry_run: bool = False,
+    workers: int | None = None,
+) -> List[HardenResult]:
+    """
+    Harden many targets in-process on a thread pool.
+
+    Args:
+        targets: service directories (duplicates are hardened once)
+        dry_run: compute diffs only
+        workers: targets processed at once (default scheduler.DEFAULT_WORKERS)
+
+    Returns:
+        one HardenResult per distinct target, in input order
+    """
+    unique = list(dict.fromkeys(str(t) for t in targets))
+    if not unique:
+        return []
+    workers = max(1, min(workers or DEFAULT_WORKERS, len(unique)))
+    with trace.span("harden.batch", targets=len(unique)):
+        parent = trace.current()
+
+        def run(target: str) -> HardenResult:
+            with trace.span("harden.worker", parent):
+                return harden_target(target, dry_run=dry_run)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="veil-harden") as pool:
+            return list(pool.map(run, unique))
+
+
+def format_harden_report(results: Sequence[HardenResult], *, dry_run: bool = False) -> str:
+    """
+    One aggregated report for a batch: the unified diff of every changed
+    target (file names prefixed with the target path), failures, and a summary.
+    """
+    lines: List[str] = []
+    for r in results:
+        if r.error is not None:
+            lines.append(f"❌ {r.target}: {r.error}")
+        elif r.changed:
+            lines.append(f"# {r.target}")
+            lines.append(r.diff.rstrip("\n"))
+
+    changed = sum(1 for r in results if r.changed)
+    failed = sum(not r.ok for r in results)
+    files = sum(r.changed for r in results)
+    created = sum(r.created for r in results)
+    verb = "would change" if dry_run else "changed"
+    lines.append(
+        f"🔱 Hardened {len(results)} target(s): {changed} {verb} ({files} file(s), {created} new), "
+        f"{len(results) - changed - failed} up to date, {failed} failed."
+    )
+    return "\n".join(lines)
+
+
 # ------------------------------------------------------------
 # 🔱 ORGAN COMPILATION
 # ------------------------------------------------------------
 
-def compile_tier(tier: str, *, spec_dir: Path = SPECS, strict: bool = True) -> CompileResult:
+def compile_tier(
+    tier: str,
+    *,
+    spec_dir: Path = SPECS,
+    strict: bool = True,
+    batch: LedgerBatch | None = None,
+    workers: int | None = None,
+    force: bool = False,
+) -> CompileResult:
     """
     Compile all organs of a given tier.
 
+    Organs of the tier are activated concurrently, in `depends_on` order (see
+    veil.scheduler.run_graph); the call returns once all of them finished.
+
+    Compilation is incremental: organs whose spec is unchanged since their last
+    successful activation (see veil.build_state) are skipped, unless one of
+    their dependencies is rebuilt.
+
     Args:
         tier: e.g. "P0" or "P1"
         spec_dir: organ YAML spec directory
         strict: if True, stop on first organ failure; if False, continue compiling others.
+        batch: ledger batch to record into. The tier's entries are committed when
+            it finishes; the caller owns the ledger verification. By default the
+            tier gets its own batch.
+        workers: organs activated at once (default scheduler.DEFAULT_WORKERS; 1 = serial)
+        force: re-activate every organ, up to date or not
 
     Returns:
         CompileResult(tier=..., activated=(...))
     """
-    log.warning("🚨 Compiling %s Organs...\n", tier)
+    if batch is None:
+        # One durable ledger write for the whole tier (also on a strict failure).
+        with trace.span("compile.tier", tier=tier):
+            with ledger_batch() as own:
+                result = compile_tier(tier, spec_dir=spec_dir, strict=strict, batch=own, workers=workers, force=force)
+            verify_ledger()
+        return result
 
-    organs = [o for o in _load_organs(spec_dir) if o.tier == tier]
-    activated: List[str] = []
+    return _compile_tiers((tier,), spec_dir=spec_dir, strict=strict, batch=batch, workers=workers, force=force)[0]
 
-    for organ in organs:
-        log.info("→ %s", organ.name)
-        append_ledger_entry(organ.name, organ.tier)
 
-        try:
-            organ.activate()
-            activated.append(organ.name)
-        except Exception:
-            log.exception("❌ Organ activation failed: %s (tier=%s)", organ.name, tier)
-            if strict:
-                raise
-
-    log.info("\n✅ %s organs deployed.\n", tier)
-    verify_ledger()
-    return CompileResult(tier=tier, activated=tuple(activated))
+def _traced_activate(parent: trace.Span | None):
+    """organ.activate(), traced as a child of `parent` from the scheduler's threads."""
+    if parent is None:
+        return None  # not tracing: plain organ.activate()
 
+    def activate(organ: Organ) -> None:
+        with trace.span("organ.activate", parent, organ=organ.name, tier=organ.tier):
+            organ.activate()
 
-def compile_p0(*, spec_dir: Path = SPECS, strict: bool = True) -> CompileResult:
-    return compile_tier("P0", spec_dir=spec_dir, strict=strict)
+    return activate
 
 
-def compile_p1(*, spec_dir: Path = SPECS, strict: bool = True) -> CompileResult:
-    return compile_tier("P1", spec_dir=spec_dir, strict=strict)
+def _compile_tiers(
+    tiers: tuple[str, ...],
+    *,
+    spec_dir: Path,
+    strict: bool,
+    batch: LedgerBatch,
+    workers: int | None,
+    force: bool = False,
+) -> List[CompileResult]:
+    """
+    Activate the stale organs of `tiers` as one dependency wavefront (see
+    veil.scheduler.run_graph), record them in `batch` and commit it, then
+    update the build state with the assigned ledger indices.
+    """
+    log.warning("🚨 Compiling %s Organs...\n", " + ".join(tiers))
+
+    with trace.span("compile.specs") as span:
+        every = _load_organs(spec_dir)
+        specs = registry(spec_dir)
+        # One refresh for the whole compile, not one per organ.
+        docs = {str(d["name"]): d for d in specs.documents()}
+        hashes = {o.name: spec_hash(docs.get(o.name) or {}) for o in every}
+        span.add(organs=len(every), parsed=specs.parsed)
+    order = {t: i for i, t in enumerate(tiers)}
+    organs = sorted((o for o in every if o.tier in order), key=lambda o: order[o.tier])
+
+    state = BuildState.load()
+    if not force:
+        stale = state.stale(organs, hashes)
+        skipped = [o for o in organs if o.name not in stale]
+        organs = [o for o in organs if o.name in stale]
+        if skipped:
+            log.info("↪️ %d organ(s) up to date, skipped: %s", len(skipped), ", ".join(o.name for o in skipped))
+    else:
+        skipped = []
+
+    # Dependencies on organs outside these tiers (or up to date) are taken as already compiled.
+    with trace.span("compile.activate", organs=len(organs)):
+        activations = run_graph(
+            organs, workers=workers, strict=strict, known=[o.name for o in every], action=_traced_activate(trace.current())
+        )
+
+    # Every started activation is recorded, in tier + spec order, stamped with its start time.
+    recorded = [a for a in activations if a.started is not None]
+    with trace.span("compile.ledger", entries=len(recorded)):
+        for a in recorded:
+            batch.append(a.organ.name, a.organ.tier, timestamp=a.started)
+        # Ours are the last entries of the batch.
+        indices = batch.commit()[-len(recorded):] if recorded else []
+
+    for a, index in zip(recorded, indices):
+        if a.ok:
+            state.record(a.organ.name, a.organ.tier, hashes[a.organ.name], index)
+    state.forget(a.organ.name for a in activations if not a.ok)
+    if activations:
+        state.save()
+
+    failure = first_failure(activations)
+    if strict and failure is not None:
+        raise failure.error  # type: ignore[misc]
+
+    results = []
+    for tier in tiers:
+        log.info("\n✅ %s organs deployed.\n", tier)
+        activated = tuple(a.organ.name for a in activations if a.ok and a.organ.tier == tier)
+        up_to_date = tuple(o.name for o in skipped if o.tier == tier)
+        results.append(CompileResult(tier=tier, activated=activated, skipped=up_to_date))
+    return results
+
+
+def compile_p0(
+    *, spec_dir: Path = SPECS, strict: bool = True, workers: int | None = None, force: bool = False
+) -> CompileResult:
+    return compile_tier("P0", spec_dir=spec_dir, strict=strict, workers=workers, force=force)
+
+
+def compile_p1(
+    *, spec_dir: Path = SPECS, strict: bool = True, workers: int | None = None, force: bool = False
+) -> CompileResult:
+    return compile_tier("P1", spec_dir=spec_dir, strict=strict, workers=workers, force=force)
 
 
 # ------------------------------------------------------------
@@ -133,6 +356,8 @@ def compile_all(
     *,
     strict: bool = True,
     spec_dir: Path = SPECS,
+    workers: int | None = None,
+    force: bool = False,
 ) -> tuple[CompileResult, CompileResult]:
     """
     Compile all organs (P0 + P1) and optionally run the Auto-Hardener.
@@ -143,17 +368,27 @@ def compile_all(
         dry_run: If True, hardener runs in diff-only mode.
         strict: if True, stop on first organ failure.
         spec_dir: organ spec directory.
+        workers: organs activated at once (1 = serial).
+        force: re-activate every organ, not only those changed or failed since
+            the last successful compile.
 
     Returns:
         (p0_result, p1_result)
     """
-    p0 = compile_p0(spec_dir=spec_dir, strict=strict)
-    p1 = compile_p1(spec_dir=spec_dir, strict=strict)
-
-    if harden:
-        if not target:
-            log.warning("⚠️ No hardening target provided. Skipping hardener.\n")
-        else:
-            harden_service(target, dry_run=dry_run)
+    with trace.span("compile.all"):
+        # One dependency wavefront across both tiers: an organ with depends_on starts
+        # as soon as its dependencies are up, others keep the P0 -> P1 barrier.
+        # Both tiers go to the ledger in one durable write, verified once.
+        with ledger_batch() as batch:
+            p0, p1 = _compile_tiers(
+                ("P0", "P1"), spec_dir=spec_dir, strict=strict, batch=batch, workers=workers, force=force
+            )
+        verify_ledger()
+
+        if harden:
+            if not target:
+                log.warning("⚠️ No hardening target provided. Skipping hardener.\n")
+            else:
+                harden_service(target, dry_run=dry_run)
 
     return p0, p1
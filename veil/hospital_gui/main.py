@@ -9,6 +9,7 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from veil import orchestrator
 from veil.orchestrator import list_services
 
 TEMPLATES_DIR = "/home/user/veil_os/backend/veil/hospital_gui/templates"
@@ -50,13 +51,17 @@ def _is_runnable(name: str) -> bool:
 
 def get_organs():
     out = []
+    # The orchestrator's own spec set (discovered once per process): tiers come
+    # with each status, glyphs from the same discovery.
+    specs = {str(o["name"]): o for o in orchestrator.list()}
     for s in list_services():
+        spec = specs.get(s.name)
         out.append(
             {
                 "name": s.name,
                 "running": bool(getattr(s, "running", False)),  # PID-based truth
-                "tier": _tier(s.name),
-                "glyph": GLYPH.get(s.name, "🫀"),
+                "tier": s.tier if spec is not None else _tier(s.name),
+                "glyph": (spec or {}).get("glyph") or GLYPH.get(s.name, "🫀"),
                 "pid": getattr(s, "pid", None),
                 "log": getattr(s, "log", ""),
                 "runnable": _is_runnable(s.name),
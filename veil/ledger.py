@@ -1,10 +1,26 @@
 from __future__ import annotations
 
 import hashlib
+import itertools
 import json
+import math
+import os
+import re
+import textwrap
+import threading
 import time
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+from . import trace
 
 
 # Anchor ledger to the installed package directory (kept for compatibility)
@@ -13,9 +29,33 @@ PACKAGE_ROOT = Path(__file__).resolve().parent
 # Active ledger path (kept as-is from your original)
 LEDGER_PATH = Path("/opt/veil_os/ledger.json")
 
+# Append-only ledger: one canonical block per line. Once this file exists it is
+# the active ledger and LEDGER_PATH is only read by the one-time converter.
+LEDGER_JSONL_PATH = Path("/opt/veil_os/ledger.jsonl")
+
+# Tail record for the JSONL ledger: last block index + hash and the file size
+# they describe, so appends never have to read earlier blocks.
+LEDGER_TAIL_PATH = Path("/opt/veil_os/ledger.tail")
+
+# Verification checkpoint for the JSONL ledger: last verified block (position,
+# hash, byte offset) plus Merkle roots over fixed-size segments of verified hashes.
+LEDGER_CHECKPOINT_PATH = Path("/opt/veil_os/ledger.checkpoint")
+
+# Verified blocks per Merkle checkpoint segment
+CHECKPOINT_SEGMENT = 256
+
 # Where we quarantine legacy/unmappable blocks during migration
 LEGACY_QUARANTINE_PATH = Path("/opt/veil_os/ledger_legacy.json")
 
+# Advisory lock serializing ledger writers across processes (flock on this file)
+LEDGER_LOCK_PATH = Path("/opt/veil_os/ledger.lock")
+
+# Progress record of an interrupted migration (see migrate_ledger_in_place)
+LEDGER_MIGRATE_PROGRESS_PATH = Path("/opt/veil_os/ledger.migrate.json")
+
+# Source blocks between migration progress records
+MIGRATE_PROGRESS_EVERY = 10000
+
 
 # ----------------------------
 # Canonical hashing
@@ -39,10 +79,55 @@ def _canonical_block_for_hash(
     }
 
 
+# Precompiled encoder for the fixed canonical schema. It produces exactly the bytes
+# of json.dumps(canonical, sort_keys=True) (keys sorted, ", "/": " separators,
+# ASCII-escaped strings, repr() floats) without building or sorting a dict, and
+# feeds them to a copy of a sha256 state already primed with the constant prefix.
+_CANONICAL_KEYS = frozenset(("index", "organ", "tier", "timestamp", "prev_hash"))
+_CANONICAL_PREFIX = hashlib.sha256(b'{"index": ')
+_encode_str = json.encoder.encode_basestring_ascii
+
+
+def _hash_canonical(*, index: int, organ: str, tier: str, timestamp: float, prev_hash: str) -> str:
+    """
+    hash_block() of the canonical block for these fields, without the dict.
+
+    Callers pass exact int/str/float values (as produced by int()/str()/float()).
+    """
+    if not math.isfinite(timestamp):
+        # json spells these NaN/Infinity; leave the rare case to json itself.
+        return hashlib.sha256(
+            json.dumps(
+                _canonical_block_for_hash(
+                    index=index, organ=organ, tier=tier, timestamp=timestamp, prev_hash=prev_hash
+                ),
+                sort_keys=True,
+            ).encode()
+        ).hexdigest()
+    h = _CANONICAL_PREFIX.copy()
+    h.update(
+        (
+            f'{index}, "organ": {_encode_str(organ)}, "prev_hash": {_encode_str(prev_hash)}, '
+            f'"tier": {_encode_str(tier)}, "timestamp": {timestamp!r}}}'
+        ).encode()
+    )
+    return h.hexdigest()
+
+
 def hash_block(block: Dict[str, Any]) -> str:
     """
     Deterministic hash of canonical block fields.
     """
+    if (
+        type(block) is dict
+        and block.keys() == _CANONICAL_KEYS
+        and type(block["index"]) is int
+        and type(block["organ"]) is str
+        and type(block["tier"]) is str
+        and type(block["timestamp"]) is float
+        and type(block["prev_hash"]) is str
+    ):
+        return _hash_canonical(**block)
     return hashlib.sha256(json.dumps(block, sort_keys=True).encode()).hexdigest()
 
 
@@ -50,42 +135,278 @@ def hash_block(block: Dict[str, Any]) -> str:
 # IO helpers
 # ----------------------------
 
-def load_ledger() -> List[Dict[str, Any]]:
-    if LEDGER_PATH.exists():
+def _jsonl_active() -> bool:
+    """
+    The JSONL ledger is active once it exists, or on fresh installs that have
+    no legacy JSON array ledger yet.
+    """
+    return LEDGER_JSONL_PATH.exists() or not LEDGER_PATH.exists()
+
+
+def _active_ledger_path() -> Path:
+    return LEDGER_JSONL_PATH if _jsonl_active() else LEDGER_PATH
+
+
+def _encode_line(block: Any) -> bytes:
+    return (json.dumps(block, sort_keys=True, separators=(",", ":")) + "\n").encode()
+
+
+def _parse_line(raw: bytes, offset: int) -> Any:
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"❌ Ledger entry at byte {offset} is not valid JSON: {LEDGER_JSONL_PATH}") from e
+
+
+def _iter_jsonl(start_offset: int = 0, *, raw: bool = False) -> Iterator[Tuple[int, Any]]:
+    """
+    Yield (byte offset, block) for every complete line from start_offset on.
+    With raw=True the undecoded line bytes are yielded instead (see _as_block).
+    """
+    if not LEDGER_JSONL_PATH.exists():
+        return
+    offset = start_offset
+    with LEDGER_JSONL_PATH.open("rb") as f:
+        f.seek(start_offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Torn final write (never acknowledged); the next append trims it.
+                break
+            if line.strip():
+                yield offset, (line if raw else _parse_line(line, offset))
+            offset += len(line)
+
+
+def _as_block(item: Any, offset: int) -> Any:
+    # Raw JSONL lines are decoded where they are checked (e.g. in a worker process).
+    return _parse_line(item, offset) if isinstance(item, bytes) else item
+
+
+# Read size for the streaming JSON array parser
+_READ_CHUNK = 1 << 16
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(f: TextIO, path: Path) -> Iterator[Any]:
+    """
+    Incrementally decode the elements of a top-level JSON array.
+
+    Only one read chunk plus the element being decoded is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+    state = "open"  # open -> first -> (value -> after)*
+
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if pos == len(buf) and not eof:
+            chunk = f.read(_READ_CHUNK)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        if pos == len(buf):
+            raise RuntimeError(f"❌ Ledger file is not valid JSON: {path}")
+
+        c = buf[pos]
+        if state == "open":
+            if c != "[":
+                raise RuntimeError(f"❌ Ledger JSON is not a list: {path}")
+            pos += 1
+            state = "first"
+            continue
+        if state in ("first", "after") and c == "]":
+            return
+        if state == "after":
+            if c != ",":
+                raise RuntimeError(f"❌ Ledger file is not valid JSON: {path}")
+            pos += 1
+            state = "value"
+            continue
+
         try:
-            data = json.loads(LEDGER_PATH.read_text())
-            if not isinstance(data, list):
-                raise RuntimeError(f"❌ Ledger JSON is not a list: {LEDGER_PATH}")
-            return data
+            value, end = decoder.raw_decode(buf, pos)
+            after = _WS.match(buf, end).end()
+            complete = after < len(buf) and buf[after] in ",]"
         except json.JSONDecodeError as e:
-            raise RuntimeError(f"❌ Ledger file is not valid JSON: {LEDGER_PATH}") from e
-    return []
+            if eof:
+                raise RuntimeError(f"❌ Ledger file is not valid JSON: {path}") from e
+            complete = False
+        if not complete and not eof:
+            # Element may continue in the next chunk (e.g. a number cut short).
+            chunk = f.read(_READ_CHUNK)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield value
+        pos = end
+        state = "after"
+
+
+def _iter_json_file(path: Path) -> Iterator[Any]:
+    """
+    Stream blocks from a ledger-style file: a JSON array, or any line-oriented
+    format with one JSON value per line.
+    """
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as f:
+        head = f.read(_READ_CHUNK)
+        stripped = head.lstrip()
+        f.seek(0)
+        if not stripped:
+            return
+        if stripped[0] == "[":
+            yield from _iter_json_array(f, path)
+            return
+        for lineno, line in enumerate(f, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise RuntimeError(f"❌ Ledger line {lineno} is not valid JSON: {path}") from e
+
+
+def _iter_file_ledger() -> Iterator[Any]:
+    if _jsonl_active():
+        for _, block in _iter_jsonl():
+            yield block
+    else:
+        yield from _iter_json_file(LEDGER_PATH)
+
+
+def iter_ledger() -> Iterator[Any]:
+    """
+    Yield ledger blocks one at a time from the active ledger, in order.
+
+    Memory use does not depend on the ledger length.
+    """
+    yield from _store().iter_blocks()
+
+
+def load_ledger() -> List[Dict[str, Any]]:
+    """
+    Whole ledger as a list. Prefer iter_ledger() for anything that scans it.
+    """
+    return list(iter_ledger())
 
 
 def _atomic_write_text(path: Path, text: str) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(text)
-    tmp.replace(path)
+    # One temp file per writer: concurrent verifiers may replace the same path.
+    tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_text(text)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
 
 
-def save_ledger(ledger: List[Dict[str, Any]]) -> None:
-    _atomic_write_text(LEDGER_PATH, json.dumps(ledger, indent=2))
+class _LedgerRewriter:
+    """
+    Streams a rewritten chain to a temp file beside the ledger; commit() fsyncs
+    it and renames it over the ledger in one step.
 
+    jsonl=None writes the active format; the JSON array format is rendered exactly
+    like json.dumps(ledger, indent=2). resume= reopens a temp file at a state()
+    previously recorded, dropping anything written after it.
+    """
 
-def _load_json_list(path: Path) -> List[Dict[str, Any]]:
-    if path.exists():
-        try:
-            data = json.loads(path.read_text())
-            if isinstance(data, list):
-                return data
-        except json.JSONDecodeError:
-            pass
-    return []
+    def __init__(
+        self,
+        *,
+        jsonl: Optional[bool] = None,
+        tmp: Optional[Path] = None,
+        resume: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.jsonl = _jsonl_active() if jsonl is None else jsonl
+        self.path = LEDGER_JSONL_PATH if self.jsonl else LEDGER_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp = tmp or self.path.with_suffix(self.path.suffix + ".tmp")
+        self.count = 0
+        self.size = 0
+        self.last_hash = "GENESIS"
+        if resume is not None:
+            self._f: BinaryIO = self.tmp.open("r+b")
+            self._f.truncate(resume["size"])
+            self._f.seek(resume["size"])
+            self.count, self.size, self.last_hash = resume["count"], resume["size"], resume["last_hash"]
+        else:
+            self._f = self.tmp.open("wb")
+
+    def write(self, block: Any) -> None:
+        if self.jsonl:
+            data = _encode_line(block)
+        else:
+            sep = "[\n" if self.count == 0 else ",\n"
+            data = (sep + textwrap.indent(json.dumps(block, indent=2), "  ")).encode()
+        self._f.write(data)
+        self.size += len(data)
+        self.last_hash = _chain_hash(block, self.count)
+        self.count += 1
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Make everything written so far durable and describe it for resume=.
+        """
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        return {"count": self.count, "size": self.size, "last_hash": self.last_hash}
+
+    def finish(self) -> None:
+        if not self.jsonl:
+            self._f.write(b"\n]" if self.count else b"[]")
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._f.close()
+
+    def install(self) -> None:
+        self.tmp.replace(self.path)
+        _installed(self.jsonl, self.count, self.last_hash, self.size)
+
+    def commit(self) -> None:
+        self.finish()
+        self.install()
+
+    def close(self) -> None:
+        """
+        Stop writing but keep the temp file (e.g. for a later resume=).
+        """
+        self._f.close()
+
+    def abort(self) -> None:
+        self._f.close()
+        self.tmp.unlink(missing_ok=True)
+
+
+def _installed(jsonl: bool, count: int, last_hash: str, size: int) -> None:
+    """
+    Bookkeeping after a rewritten chain was renamed into place.
+    """
+    if not jsonl:
+        return
+    # A rewritten chain invalidates any verification checkpoint.
+    LEDGER_CHECKPOINT_PATH.unlink(missing_ok=True)
+    if count:
+        _write_tail(count - 1, last_hash, size)
+    else:
+        LEDGER_TAIL_PATH.unlink(missing_ok=True)
 
 
-def _save_json_list(path: Path, items: List[Dict[str, Any]]) -> None:
-    _atomic_write_text(path, json.dumps(items, indent=2))
+def _save_file_ledger(ledger: Iterable[Any]) -> None:
+    writer = _LedgerRewriter()
+    for block in ledger:
+        writer.write(block)
+    writer.commit()
+
+
+def save_ledger(ledger: List[Dict[str, Any]]) -> None:
+    """
+    Replace the whole ledger with the given blocks (written as-is, not re-chained).
+    """
+    with _ledger_lock():
+        _store().replace(ledger)
 
 
 # ----------------------------
@@ -126,65 +447,826 @@ def _has_minimum_fields_for_hash(block: Dict[str, Any]) -> bool:
     )
 
 
+# ----------------------------
+# Append-only JSONL tail
+# ----------------------------
+
+def _chain_hash(block: Any, position: int) -> str:
+    """
+    Hash the next block links to, given the current last block:
+    - if stored hash exists, use it
+    - else compute from canonical fields if possible
+    - else fall back to GENESIS
+    """
+    if not isinstance(block, dict):
+        return "GENESIS"
+    if block.get("hash"):
+        return str(block["hash"])
+
+    organ, t = _map_legacy_fields(block)
+    try:
+        idx = int(block.get("index", position))
+        ts = float(block["timestamp"])
+        ph = str(block.get("prev_hash", "GENESIS"))
+        if organ is not None and t is not None:
+            return _hash_canonical(index=idx, organ=organ, tier=t, timestamp=ts, prev_hash=ph)
+    except Exception:
+        pass
+    return "GENESIS"
+
+
+def _read_tail() -> Optional[Dict[str, Any]]:
+    try:
+        tail = json.loads(LEDGER_TAIL_PATH.read_text())
+        return {"index": int(tail["index"]), "hash": str(tail["hash"]), "size": int(tail["size"])}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_tail(index: int, last_hash: str, size: int) -> None:
+    _atomic_write_text(LEDGER_TAIL_PATH, json.dumps({"index": index, "hash": last_hash, "size": size}))
+
+
+def _ends_line_at(size: int) -> bool:
+    if size == 0:
+        return True
+    with LEDGER_JSONL_PATH.open("rb") as f:
+        f.seek(size - 1)
+        return f.read(1) == b"\n"
+
+
+def _jsonl_tail() -> Tuple[int, str]:
+    """
+    (next_index, prev_hash) for the next append.
+
+    Normally this only reads the tail record. If the ledger grew past it (crash
+    between the append fsync and the tail update) only the new bytes are
+    replayed; if the tail is missing or does not match, the file is rescanned.
+    A torn final line is truncated away, since it was never acknowledged.
+    """
+    if not LEDGER_JSONL_PATH.exists():
+        return 0, "GENESIS"
+
+    size = LEDGER_JSONL_PATH.stat().st_size
+    tail = _read_tail()
+    if tail is not None and tail["size"] == size:
+        return tail["index"] + 1, tail["hash"]
+
+    if tail is not None and tail["size"] < size and _ends_line_at(tail["size"]):
+        index, prev_hash, good = tail["index"], tail["hash"], tail["size"]
+    else:
+        index, prev_hash, good = -1, "GENESIS", 0
+
+    with LEDGER_JSONL_PATH.open("rb") as f:
+        f.seek(good)
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                break
+            if raw.strip():
+                index += 1
+                prev_hash = _chain_hash(_parse_line(raw, good), index)
+            good += len(raw)
+
+    if good < size:
+        print(f"⚠️ Truncating torn ledger write ({size - good} byte(s)) in {LEDGER_JSONL_PATH}")
+        os.truncate(LEDGER_JSONL_PATH, good)
+
+    if index >= 0:
+        _write_tail(index, prev_hash, good)
+    return index + 1, prev_hash
+
+
+def _jsonl_append(data: bytes) -> int:
+    """
+    Durably append pre-encoded lines to the JSONL ledger. Returns the new file size.
+    """
+    LEDGER_JSONL_PATH.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(LEDGER_JSONL_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        with trace.span("ledger.write", bytes=len(data)):
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        with trace.span("ledger.fsync"):
+            os.fsync(fd)
+        return os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+
+# ----------------------------
+# Storage backend
+# ----------------------------
+
+def _store() -> Any:
+    # Imported lazily: the stores build on the helpers in this module.
+    from .ledger_store import get_store
+    return get_store()
+
+
+# ----------------------------
+# Writer lock + group commit
+# ----------------------------
+
+_LOCK = threading.RLock()
+_LOCK_STATE = threading.local()
+
+
+@contextmanager
+def _ledger_lock() -> Iterator[None]:
+    """
+    Exclusive ledger write lock: a process-local RLock plus flock() on
+    LEDGER_LOCK_PATH, so writers in other processes (other `veil compile`
+    runs) wait too. Re-entrant within a thread.
+    """
+    with _LOCK:
+        depth = getattr(_LOCK_STATE, "depth", 0)
+        if depth:
+            _LOCK_STATE.depth = depth + 1
+            try:
+                yield
+            finally:
+                _LOCK_STATE.depth = depth
+            return
+
+        fd = None
+        if fcntl is not None:
+            LEDGER_LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(LEDGER_LOCK_PATH, os.O_RDWR | os.O_CREAT, 0o644)
+            with trace.span("ledger.lock_wait"):
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        _LOCK_STATE.depth = 1
+        try:
+            yield
+        finally:
+            _LOCK_STATE.depth = 0
+            if fd is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+
+def _holds_ledger_lock() -> bool:
+    return getattr(_LOCK_STATE, "depth", 0) > 0
+
+
+def _write_entries(entries: List[Tuple[str, str, float]]) -> List[int]:
+    """
+    Chain (organ, tier, timestamp) entries onto the configured store and commit
+    them with one durable write. Caller must hold the ledger lock.
+    """
+    return _store().append(entries)
+
+
+def _chain_entries(
+    entries: List[Tuple[str, str, float]], index: int, prev_hash: str
+) -> List[Dict[str, Any]]:
+    """
+    Canonical, hashed blocks for (organ, tier, timestamp) entries chained after
+    the block at index - 1 whose hash is prev_hash.
+    """
+    blocks: List[Dict[str, Any]] = []
+    for organ_name, tier, timestamp in entries:
+        block: Dict[str, Any] = _canonical_block_for_hash(
+            index=index + len(blocks),
+            organ=organ_name,
+            tier=tier,
+            timestamp=timestamp,
+            prev_hash=prev_hash,
+        )
+        block["hash"] = prev_hash = hash_block(block)
+        blocks.append(block)
+    return blocks
+
+
+def _append_file_entries(entries: List[Tuple[str, str, float]]) -> List[int]:
+    ledger: Optional[List[Dict[str, Any]]] = None
+    if _jsonl_active():
+        index, prev_hash = _jsonl_tail()
+    else:
+        ledger = list(_iter_file_ledger())
+        index = len(ledger)
+        prev_hash = _chain_hash(ledger[-1], index - 1) if ledger else "GENESIS"
+
+    blocks = _chain_entries(entries, index, prev_hash)
+    if ledger is None:
+        size = _jsonl_append(b"".join(_encode_line(b) for b in blocks))
+        _write_tail(blocks[-1]["index"], blocks[-1]["hash"], size)
+    else:
+        ledger.extend(blocks)
+        _save_file_ledger(ledger)
+    return [b["index"] for b in blocks]
+
+
+class _PendingAppend:
+    __slots__ = ("entries", "indices", "error", "done")
+
+    def __init__(self, entries: List[Tuple[str, str, float]]) -> None:
+        self.entries = entries
+        self.indices: List[int] = []
+        self.error: Optional[BaseException] = None
+        self.done = False
+
+
+class _GroupCommitter:
+    """
+    Group commit for concurrent appenders in one process.
+
+    Callers queue their entries; whichever caller finds no commit in flight
+    becomes the leader, takes the ledger lock, and writes everything queued by
+    then (its own entries and those of callers that arrived while it waited for
+    the lock) with one write + fsync. Followers just wait for their indices.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._queue: List[_PendingAppend] = []
+        self._leading = False
+
+    def submit(self, entries: List[Tuple[str, str, float]]) -> List[int]:
+        req = _PendingAppend(entries)
+        with self._cond:
+            self._queue.append(req)
+            while self._leading and not req.done:
+                self._cond.wait()
+            if not req.done:
+                self._leading = True
+        if not req.done:
+            self._lead(req)
+        if req.error is not None:
+            raise req.error
+        return req.indices
+
+    def _lead(self, req: _PendingAppend) -> None:
+        group: List[_PendingAppend] = []
+        try:
+            with _ledger_lock():
+                with self._cond:
+                    group, self._queue = self._queue, []
+                try:
+                    indices = _write_entries([e for r in group for e in r.entries])
+                except BaseException as exc:
+                    for r in group:
+                        r.error = exc
+                else:
+                    for r in group:
+                        r.indices, indices = indices[: len(r.entries)], indices[len(r.entries):]
+        finally:
+            with self._cond:
+                for r in group:
+                    r.done = True
+                if not req.done:
+                    # Lock acquisition failed before we drained the queue.
+                    self._queue.remove(req)
+                self._leading = False
+                self._cond.notify_all()
+
+
+_COMMITTER = _GroupCommitter()
+
+
 # ----------------------------
 # Public API
 # ----------------------------
 
+def _append_entries(entries: List[Tuple[str, str, float]]) -> List[int]:
+    """
+    Chain (organ, tier, timestamp) entries onto the ledger and commit them with
+    one durable write, shared with any concurrent appenders. Returns the
+    assigned indices.
+    """
+    if not entries:
+        return []
+
+    with trace.span("ledger.append", entries=len(entries)):
+        if _holds_ledger_lock():
+            indices = _write_entries(entries)
+        else:
+            indices = _COMMITTER.submit(entries)
+
+    if len(indices) == 1:
+        print(f"✅ Organ '{entries[0][0]}' recorded in ledger (index={indices[0]}).")
+    else:
+        print(f"✅ {len(indices)} organs recorded in ledger (index={indices[0]}..{indices[-1]}).")
+    return indices
+
+
 def append_ledger_entry(organ_name: str, tier: str) -> None:
     """
     Append a new entry to the ledger. Works even if ledger begins with legacy blocks.
+
+    On the JSONL ledger this is a single fsync'd append plus a tail update; earlier
+    blocks are never read. Safe to call from concurrent threads and processes:
+    writers are serialized by LEDGER_LOCK_PATH, and appends racing in one process
+    share a single fsync.
     """
-    ledger = load_ledger()
-
-    # Determine prev_hash based on the last block in the *active* ledger:
-    # - if stored hash exists, use it
-    # - else compute from canonical fields if possible
-    # - else fall back to GENESIS
-    prev_hash = "GENESIS"
-    if ledger:
-        last = ledger[-1]
-        if isinstance(last, dict) and last.get("hash"):
-            prev_hash = str(last["hash"])
-        elif isinstance(last, dict):
-            organ, t = _map_legacy_fields(last)
-            try:
-                idx = int(last.get("index", len(ledger) - 1))
-                ts = float(last["timestamp"])
-                ph = str(last.get("prev_hash", "GENESIS"))
-                if organ is not None and t is not None:
-                    prev_hash = hash_block(
-                        _canonical_block_for_hash(
-                            index=idx,
-                            organ=organ,
-                            tier=t,
-                            timestamp=ts,
-                            prev_hash=ph,
-                        )
-                    )
-            except Exception:
-                prev_hash = "GENESIS"
-
-    index = len(ledger)
-    timestamp = time.time()
-
-    canonical = _canonical_block_for_hash(
-        index=index,
-        organ=organ_name,
-        tier=tier,
-        timestamp=timestamp,
-        prev_hash=prev_hash,
+    _append_entries([(organ_name, tier, time.time())])
+
+
+def append_ledger_entries(entries: Iterable[Tuple[str, str]]) -> List[int]:
+    """
+    Append several (organ_name, tier) entries with a single durable ledger write.
+
+    Returns:
+        ledger indices assigned to the entries, in order
+    """
+    now = time.time()
+    return _append_entries([(organ_name, tier, now) for organ_name, tier in entries])
+
+
+class LedgerBatch:
+    """
+    Collects ledger entries (timestamped when added, unless a timestamp is given)
+    and commits them together.
+    """
+
+    def __init__(self) -> None:
+        self._pending: List[Tuple[str, str, float]] = []
+        self.indices: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def append(self, organ_name: str, tier: str, timestamp: Optional[float] = None) -> None:
+        self._pending.append((organ_name, tier, time.time() if timestamp is None else timestamp))
+
+    def commit(self) -> List[int]:
+        pending, self._pending = self._pending, []
+        indices = _append_entries(pending)
+        self.indices.extend(indices)
+        return indices
+
+
+@contextmanager
+def ledger_batch() -> Iterator[LedgerBatch]:
+    """
+    Batch ledger appends: one durable write when the block exits.
+
+    Entries added before an exception are still committed, since the ledger records
+    attempted activations as well as successful ones.
+
+    Example:
+        with ledger_batch() as batch:
+            for organ in organs:
+                batch.append(organ.name, organ.tier)
+    """
+    batch = LedgerBatch()
+    try:
+        yield batch
+    finally:
+        batch.commit()
+
+
+def convert_ledger_to_jsonl(*, dry_run: bool = False) -> int:
+    """
+    One-time conversion of the legacy JSON array ledger into the append-only
+    JSONL ledger.
+
+    Blocks are copied verbatim (legacy blocks included), so the chain verifies
+    exactly as before. The JSON file is left in place as a backup; once
+    LEDGER_JSONL_PATH exists it is no longer read.
+
+    Returns:
+        number of blocks converted
+    """
+    if LEDGER_JSONL_PATH.exists():
+        raise RuntimeError(f"❌ JSONL ledger already exists: {LEDGER_JSONL_PATH}")
+    if not LEDGER_PATH.exists():
+        print(f"ℹ️ No legacy ledger at {LEDGER_PATH}. Nothing to convert.")
+        return 0
+
+    if dry_run:
+        count = sum(1 for _ in _iter_file_ledger())
+        print(f"🧾 Would convert {count} block(s): {LEDGER_PATH} -> {LEDGER_JSONL_PATH}")
+        return count
+
+    with _ledger_lock():
+        if LEDGER_JSONL_PATH.exists():
+            raise RuntimeError(f"❌ JSONL ledger already exists: {LEDGER_JSONL_PATH}")
+        writer = _LedgerRewriter(jsonl=True)
+        try:
+            for block in _iter_file_ledger():
+                writer.write(block)
+        except BaseException:
+            writer.abort()
+            raise
+        writer.commit()
+    print(f"✅ Converted {writer.count} block(s): {LEDGER_PATH} -> {LEDGER_JSONL_PATH}")
+    return writer.count
+
+
+def _is_verifiable(block: Any) -> bool:
+    # We can verify a block if it has/derives organ+tier and has timestamp.
+    if not isinstance(block, dict):
+        return False
+    organ, tier = _map_legacy_fields(block)
+    return organ is not None and tier is not None and "timestamp" in block
+
+
+def _check_block(
+    block: Any,
+    i: int,
+    prev_expected_hash: Optional[str],
+    *,
+    strict_hash: bool,
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Check one block against the expected hash of its predecessor.
+
+    prev_expected_hash=None marks the first verifiable block, whose stored
+    prev_hash (or GENESIS) is accepted as-is.
+
+    Returns:
+        (expected_hash, None) on success, (None, error message) on failure.
+    """
+    if not isinstance(block, dict):
+        return None, f"❌ Ledger block at position {i} is not a dict/object."
+
+    idx = int(block.get("index", i))
+    organ, tier = _map_legacy_fields(block)
+
+    if organ is None or tier is None:
+        return None, f"❌ Ledger block missing required mapped fields at index {i}."
+
+    try:
+        ts = float(block["timestamp"])
+    except Exception:
+        return None, f"❌ Ledger block has invalid/missing timestamp at index {i}."
+
+    # prev_hash rules
+    if prev_expected_hash is None:
+        # For the first verifiable block, accept existing prev_hash or GENESIS if missing.
+        prev_hash = str(block.get("prev_hash", "GENESIS"))
+    else:
+        prev_hash = str(block.get("prev_hash", ""))
+        if prev_hash != prev_expected_hash:
+            return None, f"❌ Broken chain at index {i}."
+
+    expected_hash = _hash_canonical(index=idx, organ=organ, tier=tier, timestamp=ts, prev_hash=prev_hash)
+
+    stored_hash = block.get("hash")
+    if stored_hash is not None:
+        if str(stored_hash) != expected_hash:
+            return None, f"❌ Ledger tampering detected at index {i}."
+    elif strict_hash:
+        return None, f"❌ Ledger block missing hash at index {i} (strict mode)."
+
+    return expected_hash, None
+
+
+# ----------------------------
+# Verification checkpoints
+# ----------------------------
+
+def _merkle_root(leaves: List[str]) -> str:
+    level = [hashlib.sha256(b"\x00" + bytes.fromhex(h)).digest() for h in leaves]
+    while len(level) > 1:
+        nxt = [hashlib.sha256(b"\x01" + level[j] + level[j + 1]).digest() for j in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+    return level[0].hex()
+
+
+class _MerkleSegments:
+    """
+    Merkle roots over consecutive CHECKPOINT_SEGMENT-sized runs of verified hashes.
+    Only the current, incomplete segment is kept in memory.
+    """
+
+    def __init__(self, roots: Iterable[str] = (), pending: Iterable[str] = ()) -> None:
+        self.roots: List[str] = list(roots)
+        self.pending: List[str] = list(pending)
+
+    def add(self, leaf: str) -> None:
+        self.pending.append(leaf)
+        if len(self.pending) == CHECKPOINT_SEGMENT:
+            self.roots.append(_merkle_root(self.pending))
+            self.pending = []
+
+
+def _read_checkpoint() -> Optional[Dict[str, Any]]:
+    try:
+        return _checkpoint_from(LEDGER_CHECKPOINT_PATH.read_text())
+    except OSError:
+        return None
+
+
+def _checkpoint_from(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        ckpt = json.loads(text)
+    except ValueError:
+        return None
+    keys = ("position", "hash", "offset", "start", "strict", "segments", "pending")
+    if not isinstance(ckpt, dict) or not all(k in ckpt for k in keys):
+        return None
+    return ckpt
+
+
+def _checkpoint_record(
+    *, position: int, last_hash: str, offset: int, start: int, strict: bool, merkle: _MerkleSegments
+) -> Dict[str, Any]:
+    return {
+        "position": position,
+        "hash": last_hash,
+        "offset": offset,
+        "start": start,
+        "strict": strict,
+        "segments": merkle.roots,
+        "pending": merkle.pending,
+    }
+
+
+def _write_checkpoint(ckpt: Dict[str, Any]) -> None:
+    _atomic_write_text(LEDGER_CHECKPOINT_PATH, json.dumps(ckpt))
+
+
+# ----------------------------
+# Verification engine
+# ----------------------------
+
+# Blocks per chunk handed to a worker process by verify_ledger(workers=N)
+VERIFY_CHUNK = 4096
+
+
+def _skip_legacy_prefix(
+    entries: Iterator[Tuple[int, Any]],
+) -> Tuple[int, Optional[Iterator[Tuple[int, Any]]]]:
+    """
+    Skip unmappable prefix blocks.
+
+    Returns:
+        (skipped count, entries from the first verifiable block) or (skipped, None)
+        if no verifiable block exists.
+    """
+    skipped = 0
+    for entry in entries:
+        if _is_verifiable(_as_block(entry[1], entry[0])):
+            return skipped, itertools.chain([entry], entries)
+        skipped += 1
+    return skipped, None
+
+
+def _verify_chunk(
+    chunk: List[Tuple[int, Any]],
+    first_pos: int,
+    prev_expected_hash: Optional[str],
+    strict_hash: bool,
+) -> Tuple[Optional[str], List[str]]:
+    """
+    Worker body for parallel verification: check a run of consecutive entries.
+
+    Returns:
+        (first error or None, expected hashes of the blocks that passed)
+    """
+    hashes: List[str] = []
+    for j, (offset, item) in enumerate(chunk):
+        block = _as_block(item, offset)
+        expected, err = _check_block(block, first_pos + j, prev_expected_hash, strict_hash=strict_hash)
+        if err:
+            return err, hashes
+        hashes.append(str(expected))
+        prev_expected_hash = expected
+    return None, hashes
+
+
+def _verify_stream(
+    entries: Iterator[Tuple[int, Any]],
+    first_pos: int,
+    prev_expected_hash: Optional[str],
+    *,
+    strict_hash: bool,
+    workers: int,
+    merkle: Optional[_MerkleSegments] = None,
+) -> Tuple[Optional[str], Optional[str], int, int, int]:
+    """
+    Verify consecutive (offset, block) entries starting at position first_pos.
+
+    With workers > 1, blocks are decoded and hashed in VERIFY_CHUNK-sized chunks on
+    a process pool. Each worker checks the links inside its chunk; the link into a chunk is
+    checked here, in order, by re-running _check_block on the chunk's first block
+    against the previous chunk's last hash. The first failure reported is the same
+    one the serial loop finds.
+
+    Returns:
+        (error, last expected hash, last position, last offset, blocks checked)
+    """
+    pos = first_pos - 1
+    last_offset = -1
+    checked = 0
+
+    if workers <= 1:
+        for offset, item in entries:
+            pos += 1
+            expected, err = _check_block(_as_block(item, offset), pos, prev_expected_hash, strict_hash=strict_hash)
+            if err:
+                return err, None, pos, offset, checked
+            prev_expected_hash = expected
+            last_offset = offset
+            checked += 1
+            if merkle is not None:
+                merkle.add(str(expected))
+        return None, prev_expected_hash, pos, last_offset, checked
+
+    in_flight: Deque[Tuple[Future, Tuple[int, Any], int, int]] = deque()
+    first_chunk = True
+
+    def settle() -> Optional[str]:
+        nonlocal prev_expected_hash, pos, last_offset, checked, first_chunk
+        fut, (head_offset, head), head_pos, chunk_last_offset = in_flight.popleft()
+        if not first_chunk:
+            block = _as_block(head, head_offset)
+            _, err = _check_block(block, head_pos, prev_expected_hash, strict_hash=strict_hash)
+            if err:
+                pos = head_pos
+                return err
+        first_chunk = False
+        err, hashes = fut.result()
+        if merkle is not None:
+            for h in hashes:
+                merkle.add(h)
+        checked += len(hashes)
+        pos = head_pos + len(hashes) - (0 if err else 1)
+        if err:
+            return err
+        prev_expected_hash = hashes[-1]
+        last_offset = chunk_last_offset
+        return None
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        next_pos = first_pos
+        while True:
+            chunk = list(itertools.islice(entries, VERIFY_CHUNK))
+            if chunk:
+                chunk_prev = prev_expected_hash if next_pos == first_pos else None
+                fut = pool.submit(_verify_chunk, chunk, next_pos, chunk_prev, strict_hash)
+                in_flight.append((fut, chunk[0], next_pos, chunk[-1][0]))
+                next_pos += len(chunk)
+            while in_flight and (not chunk or len(in_flight) >= 2 * workers):
+                err = settle()
+                if err:
+                    for fut, *_ in in_flight:
+                        fut.cancel()
+                    return err, None, pos, last_offset, checked
+            if not chunk:
+                break
+
+    return None, prev_expected_hash, pos, last_offset, checked
+
+
+def _verify_jsonl(*, strict_hash: bool, allow_legacy_prefix: bool, full: bool, workers: int) -> bool:
+    return _verify_checkpointed(
+        lambda offset, raw: _iter_jsonl(offset, raw=raw),
+        _read_checkpoint,
+        _write_checkpoint,
+        str(LEDGER_CHECKPOINT_PATH),
+        strict_hash=strict_hash,
+        allow_legacy_prefix=allow_legacy_prefix,
+        full=full,
+        workers=workers,
     )
 
-    block: Dict[str, Any] = dict(canonical)
-    block["hash"] = hash_block(canonical)
 
-    ledger.append(block)
-    save_ledger(ledger)
+def _verify_checkpointed(
+    entries_from: Callable[[int, bool], Iterator[Tuple[int, Any]]],
+    read_checkpoint: Callable[[], Optional[Dict[str, Any]]],
+    write_checkpoint: Callable[[Dict[str, Any]], None],
+    checkpoint_name: str,
+    *,
+    strict_hash: bool,
+    allow_legacy_prefix: bool,
+    full: bool,
+    workers: int,
+) -> bool:
+    """
+    Verification against a checkpoint, shared by the stores that keep one.
 
-    print(f"✅ Organ '{organ_name}' recorded in ledger (index={index}).")
+    entries_from(offset, raw) yields (offset, block) from a store offset on (a
+    byte offset for JSONL, a row position for SQLite); raw=True may yield
+    undecoded lines for worker processes.
+    """
+    previous = read_checkpoint()
+    # A strict checkpoint is never replaced by a non-strict one: a later strict
+    # run must not resume from blocks that were only checked non-strictly.
+    keep_previous = previous is not None and previous["strict"] and not strict_hash
+    ckpt = previous
+    if ckpt is not None and (
+        full
+        or (strict_hash and not ckpt["strict"])
+        or (not allow_legacy_prefix and ckpt["start"] > 0)
+    ):
+        ckpt = None
+
+    # Worker processes decode their own lines.
+    raw = workers > 1
+    entries = entries_from(ckpt["offset"] if ckpt else 0, raw)
+    if ckpt is not None:
+        # Re-hash the checkpointed block at its recorded offset before trusting
+        # everything up to it.
+        first = next(entries, None)
+        anchor_ok = False
+        if first is not None and first[0] == ckpt["offset"]:
+            anchor = _as_block(first[1], first[0])
+            expected, err = _check_block(anchor, ckpt["position"], None, strict_hash=strict_hash)
+            anchor_ok = err is None and expected == ckpt["hash"]
+        if not anchor_ok:
+            print("⚠️ Ledger checkpoint does not match the ledger; running full verification.")
+            ckpt = None
+            entries = entries_from(0, raw)
+
+    if ckpt is not None:
+        start = ckpt["start"]
+        first_pos = ckpt["position"] + 1
+        prev_expected_hash: Optional[str] = ckpt["hash"]
+        merkle = _MerkleSegments(ckpt["segments"], ckpt["pending"])
+        stream: Optional[Iterator[Tuple[int, Any]]] = entries
+    else:
+        start = 0
+        stream = entries
+        if allow_legacy_prefix:
+            start, stream = _skip_legacy_prefix(entries)
+            if stream is None:
+                if start == 0:
+                    print("ℹ️ Ledger is empty.")
+                    return True
+                print("❌ No verifiable blocks found in ledger (all legacy/unmappable).")
+                return False
+            if start > 0:
+                print(f"⚠️ Skipping {start} legacy ledger block(s) at start (unverifiable schema).")
+        first_pos = start
+        prev_expected_hash = None
+        merkle = _MerkleSegments()
+
+    with trace.span("ledger.verify.chain", incremental=ckpt is not None) as span:
+        err, last_hash, last_pos, last_offset, checked = _verify_stream(
+            stream,
+            first_pos,
+            prev_expected_hash,
+            strict_hash=strict_hash,
+            workers=workers,
+            merkle=merkle,
+        )
+        span.add(blocks=checked)
+    if err:
+        print(err)
+        return False
+
+    if ckpt is not None:
+        if checked and not keep_previous:
+            write_checkpoint(
+                _checkpoint_record(
+                    position=last_pos,
+                    last_hash=str(last_hash),
+                    offset=last_offset,
+                    start=start,
+                    strict=strict_hash,
+                    merkle=merkle,
+                )
+            )
+        print(f"🟢 Ledger integrity verified ({checked} new block(s) since checkpoint).")
+        return True
 
+    if not checked:
+        print("ℹ️ Ledger is empty.")
+        return True
 
-def verify_ledger(*, strict_hash: bool = False, allow_legacy_prefix: bool = True) -> bool:
+    if previous is not None and previous["start"] == start:
+        # Full pass: a consistently re-chained history still differs from the
+        # segment roots recorded before it was rewritten.
+        if previous["position"] > last_pos:
+            print(f"❌ Ledger truncated: checkpoint covers position {previous['position']}, ledger ends at {last_pos}.")
+            return False
+        for seg, (old, new) in enumerate(zip(previous["segments"], merkle.roots)):
+            if old != new:
+                lo = start + seg * CHECKPOINT_SEGMENT
+                print(
+                    f"❌ Ledger history rewritten since last checkpoint (positions {lo}-{lo + CHECKPOINT_SEGMENT - 1}). "
+                    f"Remove {checkpoint_name} only if the rewrite was intended."
+                )
+                return False
+
+    if not keep_previous:
+        write_checkpoint(
+            _checkpoint_record(
+                position=last_pos,
+                last_hash=str(last_hash),
+                offset=last_offset,
+                start=start,
+                strict=strict_hash,
+                merkle=merkle,
+            )
+        )
+    print("🟢 Ledger integrity verified.")
+    return True
+
+
+def verify_ledger(
+    *,
+    strict_hash: bool = False,
+    allow_legacy_prefix: bool = True,
+    full: bool = False,
+    workers: int = 1,
+) -> bool:
     """
     Verify ledger integrity.
 
@@ -194,179 +1276,338 @@ def verify_ledger(*, strict_hash: bool = False, allow_legacy_prefix: bool = True
       verifiable modern block.
     - Chaining is validated using computed hashes even if a block is missing stored 'hash'
       (unless strict_hash=True).
+    - On the JSONL ledger, a checkpoint of the last verified block is kept in
+      LEDGER_CHECKPOINT_PATH and only blocks appended since it are re-checked
+      (the SQLite store keeps the same checkpoint in its meta table).
+      full=True re-checks everything and also compares the Merkle segment roots
+      against the checkpoint, catching a history that was consistently re-chained.
+      A strict_hash run only resumes from a strict checkpoint, and a non-strict
+      run never replaces one.
+    - workers > 1 hashes chunks of blocks on a process pool (0 = one per CPU). The
+      result, including the first failure reported, matches the serial verifier.
 
     Returns:
         True if verifiable portion of ledger passes integrity checks, else False.
     """
-    ledger = load_ledger()
-    if not ledger:
-        print("ℹ️ Ledger is empty.")
-        return True
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    with trace.span("ledger.verify", full=full, workers=workers):
+        return _store().verify(
+            strict_hash=strict_hash,
+            allow_legacy_prefix=allow_legacy_prefix,
+            full=full,
+            workers=workers,
+        )
+
+
+def _verify_file(*, strict_hash: bool, allow_legacy_prefix: bool, full: bool, workers: int) -> bool:
+    if _jsonl_active():
+        return _verify_jsonl(
+            strict_hash=strict_hash,
+            allow_legacy_prefix=allow_legacy_prefix,
+            full=full,
+            workers=workers,
+        )
 
     start = 0
+    stream: Optional[Iterator[Tuple[int, Any]]] = enumerate(_iter_file_ledger())
     if allow_legacy_prefix:
-        # Skip unmappable prefix blocks
-        for i, block in enumerate(ledger):
-            if not isinstance(block, dict):
-                continue
-            # We can verify a block if it has/derives organ+tier and has timestamp.
-            organ, tier = _map_legacy_fields(block)
-            if organ is not None and tier is not None and "timestamp" in block:
-                start = i
-                break
-        else:
+        start, stream = _skip_legacy_prefix(stream)
+        if stream is None:
+            if start == 0:
+                print("ℹ️ Ledger is empty.")
+                return True
             print("❌ No verifiable blocks found in ledger (all legacy/unmappable).")
             return False
-
         if start > 0:
             print(f"⚠️ Skipping {start} legacy ledger block(s) at start (unverifiable schema).")
 
-    prev_expected_hash: Optional[str] = None
+    err, _, last_pos, *_ = _verify_stream(stream, start, None, strict_hash=strict_hash, workers=workers)
+    if err:
+        print(err)
+        return False
+    if last_pos < 0:
+        print("ℹ️ Ledger is empty.")
+        return True
 
-    for i in range(start, len(ledger)):
-        block = ledger[i]
-        if not isinstance(block, dict):
-            print(f"❌ Ledger block at position {i} is not a dict/object.")
-            return False
+    print("🟢 Ledger integrity verified.")
+    return True
 
-        idx = int(block.get("index", i))
-        organ, tier = _map_legacy_fields(block)
 
-        if organ is None or tier is None:
-            print(f"❌ Ledger block missing required mapped fields at index {i}.")
-            return False
+# ----------------------------
+# Migration
+# ----------------------------
 
-        try:
-            ts = float(block["timestamp"])
-        except Exception:
-            print(f"❌ Ledger block has invalid/missing timestamp at index {i}.")
-            return False
+def _fingerprint(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_size, st.st_mtime_ns]
 
-        # prev_hash rules
-        if i == start:
-            # For the first verifiable block, accept existing prev_hash or GENESIS if missing.
-            prev_hash = str(block.get("prev_hash", "GENESIS"))
-        else:
-            prev_hash = str(block.get("prev_hash", ""))
-            if prev_expected_hash is None or prev_hash != prev_expected_hash:
-                print(f"❌ Broken chain at index {i}.")
-                return False
 
-        canonical = _canonical_block_for_hash(
-            index=idx,
-            organ=organ,
-            tier=tier,
-            timestamp=ts,
-            prev_hash=prev_hash,
-        )
-        expected_hash = hash_block(canonical)
+def _migration_temps(source: Path) -> Tuple[Path, Path]:
+    return (
+        source.with_suffix(source.suffix + ".migrating"),
+        LEGACY_QUARANTINE_PATH.with_suffix(LEGACY_QUARANTINE_PATH.suffix + ".migrating"),
+    )
 
-        stored_hash = block.get("hash")
-        if stored_hash is not None:
-            if str(stored_hash) != expected_hash:
-                print(f"❌ Ledger tampering detected at index {i}.")
-                return False
+
+def _load_migrate_progress(source: Path, out_tmp: Path) -> Optional[Dict[str, Any]]:
+    try:
+        state = json.loads(LEDGER_MIGRATE_PROGRESS_PATH.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("source") != str(source):
+        return None
+    if state.get("phase") == "commit" and not out_tmp.exists():
+        # Crashed after the final rename: only bookkeeping is left.
+        return state
+    if not out_tmp.exists() or state.get("fingerprint") != _fingerprint(source):
+        print("⚠️ Ignoring stale migration progress (ledger changed since it was recorded).")
+        return None
+    return state
+
+
+def _quarantine_cut(path: Path) -> Dict[str, Any]:
+    """
+    Where appended quarantine entries go.
+
+    A JSON array file is extended in place: it is cut right after its last element
+    (dropping the closing bracket) and the new elements plus a new bracket are
+    written there. Anything else is treated as line-oriented and appended to.
+    """
+    if not path.exists():
+        return {"cut": 0, "array": True, "empty": True, "new": True}
+    size = path.stat().st_size
+    base = max(0, size - 4096)
+    with path.open("rb") as f:
+        f.seek(base)
+        tail = f.read().rstrip()
+    if not tail.endswith(b"]"):
+        return {"cut": size, "array": False, "empty": False, "new": False}
+    inner = tail[:-1].rstrip()
+    return {"cut": base + len(inner), "array": True, "empty": inner.endswith(b"["), "new": False}
+
+
+def _append_quarantine(q_tmp: Path, where: Dict[str, Any]) -> None:
+    """
+    Append the staged quarantine entries at `where`. Idempotent: a retry after a
+    crash cuts the file at the same place and writes the same bytes.
+    """
+    LEGACY_QUARANTINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with LEGACY_QUARANTINE_PATH.open("wb" if where["new"] else "r+b") as out, q_tmp.open("rb") as staged:
+        out.truncate(where["cut"])
+        out.seek(where["cut"])
+        if where["new"]:
+            out.write(b"[")
+        first = where["empty"]
+        for line in staged:
+            entry = json.loads(line)
+            if where["array"]:
+                out.write((("\n" if first else ",\n") + textwrap.indent(json.dumps(entry, indent=2), "  ")).encode())
+            else:
+                out.write(_encode_line(entry))
+            first = False
+        if where["array"]:
+            out.write(b"\n]")
+        out.flush()
+        os.fsync(out.fileno())
+
+
+def _link_backup(source: Path) -> Path:
+    """
+    Keep the pre-migration ledger as <ledger>.bak without copying it: the backup is
+    a second name for the same inode, which the final rename leaves untouched.
+    """
+    bak = source.with_suffix(source.suffix + ".bak")
+    bak.unlink(missing_ok=True)
+    try:
+        os.link(source, bak)
+    except OSError:
+        _atomic_write_text(bak, source.read_text())
+    return bak
+
+
+def _finish_migration(state: Dict[str, Any], source: Path, out_tmp: Path, q_tmp: Path, *, backup: bool) -> None:
+    """
+    Commit phase. Every step can be repeated after a crash; the ledger itself is
+    replaced by a single atomic rename.
+    """
+    if out_tmp.exists():
+        if state["quarantined"]:
+            _append_quarantine(q_tmp, state["quarantine_at"])
+            print(f"📦 Quarantined {state['quarantined']} legacy block(s) -> {LEGACY_QUARANTINE_PATH}")
+        if state["out"]["count"] == 0:
+            out_tmp.unlink()
         else:
-            if strict_hash:
-                print(f"❌ Ledger block missing hash at index {i} (strict mode).")
-                return False
+            if backup:
+                print(f"🧾 Backup linked: {_link_backup(source)}")
+            out_tmp.replace(source)
 
-        prev_expected_hash = expected_hash
+    if state["out"]["count"]:
+        out = state["out"]
+        _installed(state["jsonl"], out["count"], out["last_hash"], out["size"])
+    q_tmp.unlink(missing_ok=True)
+    LEDGER_MIGRATE_PROGRESS_PATH.unlink(missing_ok=True)
 
-    print("🟢 Ledger integrity verified.")
-    return True
+
+def _migrate_block(
+    old_block: Any, i: int, new_index: int, prev_hash: str
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], bool]:
+    """
+    Map source block i to its canonical form at new_index, chained to prev_hash.
+
+    Returns:
+        (new block, None, modified) or, for unmappable blocks, (None, quarantine entry, False)
+    """
+    if not isinstance(old_block, dict):
+        return None, {"_reason": "non-dict block", "_original_index": i, "value": old_block}, False
+
+    organ, tier = _map_legacy_fields(old_block)
+    if organ is None or tier is None or "timestamp" not in old_block:
+        entry = dict(old_block)
+        entry["_reason"] = "missing organ/tier/timestamp"
+        entry["_original_index"] = i
+        return None, entry, False
+
+    new_block = _canonical_block_for_hash(
+        index=new_index,
+        organ=str(organ),
+        tier=str(tier),
+        timestamp=float(old_block["timestamp"]),
+        prev_hash=prev_hash,
+    )
+    expected_hash = _hash_canonical(**new_block)
+    new_block["hash"] = expected_hash
+
+    # Count as modified if anything materially changed
+    modified = (
+        old_block.get("index") != new_index
+        or old_block.get("prev_hash") != prev_hash
+        or old_block.get("hash") != expected_hash
+        or old_block.get("organ") != str(organ)  # normalize key name
+        or old_block.get("tier") != str(tier)
+    )
+    return new_block, None, modified
 
 
-def migrate_ledger_in_place(*, backup: bool = True) -> Tuple[int, int, int]:
+def migrate_ledger_in_place(*, backup: bool = True, resume: bool = True) -> Tuple[int, int, int]:
     """
     Safe migration that DOES NOT crash on legacy blocks.
 
     What it does:
-    - Creates a backup of the active ledger (ledger.json.bak) if backup=True
+    - Streams the active ledger once, in bounded memory
     - Quarantines blocks that cannot be mapped to canonical schema (missing organ/tier/timestamp)
       into /opt/veil_os/ledger_legacy.json (append-only)
     - Rewrites the active ledger as a clean canonical chain:
         - ensures index
         - ensures prev_hash links
         - ensures hash exists and matches computed
+    - Keeps the previous ledger as ledger.jsonl.bak / ledger.json.bak if backup=True
+      (a hard link, not a copy)
+
+    The rewritten chain and the quarantined entries are staged in *.migrating temp
+    files, and progress is recorded in LEDGER_MIGRATE_PROGRESS_PATH every
+    MIGRATE_PROGRESS_EVERY blocks. If a migration is interrupted, the next call
+    (resume=True) continues from the last record, as long as the ledger has not
+    changed since. The ledger is replaced with one atomic rename at the end.
+
+    The ledger write lock is held throughout, so concurrent appends wait instead
+    of landing in the file that is about to be replaced.
 
     Returns:
         (modified_blocks, quarantined_blocks, total_original_blocks)
     """
-    ledger = load_ledger()
-    if not ledger:
-        print("ℹ️ Ledger is empty. Nothing to migrate.")
-        return (0, 0, 0)
-
-    if backup and LEDGER_PATH.exists():
-        bak = LEDGER_PATH.with_suffix(LEDGER_PATH.suffix + ".bak")
-        _atomic_write_text(bak, LEDGER_PATH.read_text())
-        print(f"🧾 Backup written: {bak}")
+    with _ledger_lock():
+        return _store().migrate(backup=backup, resume=resume)
 
-    quarantined: List[Dict[str, Any]] = []
-    cleaned: List[Dict[str, Any]] = []
-    modified = 0
 
-    # First pass: split legacy-unmappable vs candidates
-    for i, block in enumerate(ledger):
-        if not isinstance(block, dict):
-            quarantined.append({"_reason": "non-dict block", "_original_index": i, "value": block})
-            continue
-
-        organ, tier = _map_legacy_fields(block)
-        if organ is None or tier is None or "timestamp" not in block:
-            b = dict(block)
-            b["_reason"] = "missing organ/tier/timestamp"
-            b["_original_index"] = i
-            quarantined.append(b)
-            continue
+def _migrate_file(*, backup: bool, resume: bool) -> Tuple[int, int, int]:
+    source = _active_ledger_path()
+    jsonl = _jsonl_active()
+    out_tmp, q_tmp = _migration_temps(source)
 
-        cleaned.append(block)
+    state = _load_migrate_progress(source, out_tmp) if resume else None
+    if state is not None and state["phase"] == "commit":
+        print("↪️ Resuming interrupted migration at its commit step.")
+        _finish_migration(state, source, out_tmp, q_tmp, backup=backup)
+        print(f"✅ Migration complete. Active ledger rewritten as canonical chain ({state['out']['count']} blocks).")
+        return (state["modified"], state["quarantined"], state["read"])
 
-    # Append quarantined blocks to quarantine file (don’t lose history)
-    if quarantined:
-        existing = _load_json_list(LEGACY_QUARANTINE_PATH)
-        existing.extend(quarantined)
-        _save_json_list(LEGACY_QUARANTINE_PATH, existing)
-        print(f"📦 Quarantined {len(quarantined)} legacy block(s) -> {LEGACY_QUARANTINE_PATH}")
+    if not source.exists() or next(_iter_file_ledger(), None) is None:
+        print("ℹ️ Ledger is empty. Nothing to migrate.")
+        return (0, 0, 0)
 
-    if not cleaned:
+    if state is not None:
+        print(f"↪️ Resuming interrupted migration after {state['read']} block(s).")
+        writer = _LedgerRewriter(jsonl=jsonl, tmp=out_tmp, resume=state["out"])
+        staged = q_tmp.open("r+b")
+        staged.truncate(state["q_size"])
+        staged.seek(state["q_size"])
+        if jsonl:
+            # Re-read the last consumed line only to skip past it.
+            source_iter = _iter_jsonl(state["last_offset"])
+            next(source_iter, None)
+        else:
+            source_iter = itertools.islice(enumerate(_iter_file_ledger()), state["read"], None)
+    else:
+        state = {
+            "source": str(source),
+            "fingerprint": _fingerprint(source),
+            "jsonl": jsonl,
+            "phase": "rewrite",
+            "read": 0,
+            "last_offset": 0,
+            "modified": 0,
+            "quarantined": 0,
+            "q_size": 0,
+        }
+        writer = _LedgerRewriter(jsonl=jsonl, tmp=out_tmp)
+        staged = q_tmp.open("wb")
+        source_iter = _iter_jsonl() if jsonl else enumerate(_iter_file_ledger())
+
+    prev_hash = writer.last_hash if writer.count else "GENESIS"
+
+    def record_progress() -> None:
+        staged.flush()
+        os.fsync(staged.fileno())
+        state["q_size"] = staged.tell()
+        state["out"] = writer.state()
+        _atomic_write_text(LEDGER_MIGRATE_PROGRESS_PATH, json.dumps(state))
+
+    try:
+        for offset, old_block in source_iter:
+            i = state["read"]
+            state["read"] += 1
+            state["last_offset"] = offset
+
+            new_block, entry, modified = _migrate_block(old_block, i, writer.count, prev_hash)
+            if new_block is None:
+                staged.write((json.dumps(entry) + "\n").encode())
+                state["quarantined"] += 1
+            else:
+                state["modified"] += modified
+                writer.write(new_block)
+                prev_hash = new_block["hash"]
+
+            if state["read"] % MIGRATE_PROGRESS_EVERY == 0:
+                record_progress()
+
+        record_progress()
+        writer.finish()
+        staged.close()
+    except BaseException:
+        # Keep the temp files and progress record so the next call can resume.
+        writer.close()
+        staged.close()
+        raise
+
+    state["phase"] = "commit"
+    state["quarantine_at"] = _quarantine_cut(LEGACY_QUARANTINE_PATH)
+    _atomic_write_text(LEDGER_MIGRATE_PROGRESS_PATH, json.dumps(state))
+    _finish_migration(state, source, out_tmp, q_tmp, backup=backup)
+
+    if state["out"]["count"] == 0:
         print("❌ No migratable blocks remain after quarantining legacy entries.")
-        return (0, len(quarantined), len(ledger))
-
-    # Second pass: rewrite into canonical chain
-    new_ledger: List[Dict[str, Any]] = []
-    prev_hash = "GENESIS"
-
-    for new_index, old_block in enumerate(cleaned):
-        organ, tier = _map_legacy_fields(old_block)
-        ts = float(old_block["timestamp"])
+        return (0, state["quarantined"], state["read"])
 
-        canonical = _canonical_block_for_hash(
-            index=new_index,
-            organ=str(organ),
-            tier=str(tier),
-            timestamp=ts,
-            prev_hash=prev_hash,
-        )
-        expected_hash = hash_block(canonical)
-
-        new_block = dict(canonical)
-        new_block["hash"] = expected_hash
-
-        # Count as modified if anything materially changed
-        if (
-            old_block.get("index") != new_index
-            or old_block.get("prev_hash") != prev_hash
-            or old_block.get("hash") != expected_hash
-            or old_block.get("organ") != str(organ)  # normalize key name
-            or old_block.get("tier") != str(tier)
-        ):
-            modified += 1
-
-        new_ledger.append(new_block)
-        prev_hash = expected_hash
-
-    save_ledger(new_ledger)
-    print(f"✅ Migration complete. Active ledger rewritten as canonical chain ({len(new_ledger)} blocks).")
-    return (modified, len(quarantined), len(ledger))
+    print(f"✅ Migration complete. Active ledger rewritten as canonical chain ({state['out']['count']} blocks).")
+    return (state["modified"], state["quarantined"], state["read"])
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import json
+import math
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import ledger
+
+
+# Secondary index over the JSONL ledger (organ/tier/timestamp -> block positions),
+# an SQLite database. Rebuildable at any time from the ledger itself.
+LEDGER_INDEX_PATH = Path("/opt/veil_os/ledger.index.sqlite3")
+
+INDEX_VERSION = 2
+
+
+# ----------------------------
+# Index
+# ----------------------------
+
+def _fields(block: Any) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+    if not isinstance(block, dict):
+        return None, None, None
+    organ, tier = ledger._map_legacy_fields(block)
+    try:
+        ts: Optional[float] = float(block["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        ts = None
+    if ts is not None and math.isnan(ts):
+        ts = None
+    return organ, tier, ts
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    position  INTEGER PRIMARY KEY,
+    organ     TEXT,
+    tier      TEXT,
+    timestamp REAL,
+    offset    INTEGER
+);
+CREATE INDEX IF NOT EXISTS entries_organ ON entries (organ, position);
+CREATE INDEX IF NOT EXISTS entries_tier ON entries (tier, position);
+CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (timestamp, position);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+class LedgerIndex:
+    """
+    Positions of ledger blocks by organ, tier and timestamp, in SQLite.
+
+    Positions are 0-based block ordinals in the active ledger. On the JSONL
+    ledger every position also has its byte offset, so matching blocks are read
+    with one seek each instead of a scan. Opening the index reads only its meta
+    rows; lookups go through the B-tree indexes, so neither grows with the
+    ledger.
+
+    The meta table holds `size` (ledger bytes indexed) and `anchor` (offset and
+    chain hash of the last indexed block).
+    """
+
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self.db = db
+        self._blocks: Optional[List[Any]] = None
+
+    @classmethod
+    def in_memory(cls) -> "LedgerIndex":
+        return cls(_connect(":memory:"))
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __len__(self) -> int:
+        row = self.db.execute("SELECT MAX(position) FROM entries").fetchone()
+        return 0 if row[0] is None else row[0] + 1
+
+    # --- meta ---
+
+    def _meta(self, key: str) -> Any:
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    @property
+    def size(self) -> int:
+        return self._meta("size") or 0
+
+    @property
+    def anchor(self) -> Optional[Dict[str, Any]]:
+        return self._meta("anchor")
+
+    def _set_meta(self, **values: Any) -> None:
+        self.db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in values.items()],
+        )
+
+    def add(self, block: Any, offset: Optional[int] = None) -> None:
+        self.add_many([(block, offset)])
+
+    def add_many(self, blocks: Iterable[Tuple[Any, Optional[int]]]) -> int:
+        """Append blocks at the next positions; returns how many were added."""
+        pos = len(self)
+        rows = []
+        for block, offset in blocks:
+            organ, tier, ts = _fields(block)
+            rows.append((pos, None if organ is None else str(organ), None if tier is None else str(tier), ts, offset))
+            pos += 1
+        self.db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    # --- lookups ---
+
+    def find(
+        self,
+        *,
+        organ: Optional[str] = None,
+        tier: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        (position, byte offset) of blocks matching every given filter, in ledger
+        order (or newest first). The time window is inclusive on both ends.
+        """
+        where: List[str] = []
+        params: List[Any] = []
+        for column, op, value in (("organ", "=", organ), ("tier", "=", tier), ("timestamp", ">=", since), ("timestamp", "<=", until)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT position, offset FROM entries"
+        if organ is None and tier is None and (since is not None or until is not None):
+            # Without statistics SQLite would rather scan in position order.
+            sql += " INDEXED BY entries_timestamp"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY position" + (" DESC" if newest_first else "")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return self.db.execute(sql, params).fetchall()
+
+    def positions(
+        self,
+        *,
+        organ: Optional[str] = None,
+        tier: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+    ) -> List[int]:
+        """Ascending positions of blocks matching every given filter (see find)."""
+        return [p for p, _ in self.find(organ=organ, tier=tier, since=since, until=until)]
+
+    def blocks(self, found: List[Tuple[int, Optional[int]]]) -> Iterator[Any]:
+        """
+        Yield the ledger blocks of find() results.
+        """
+        if self._blocks is not None:
+            for p, _ in found:
+                yield self._blocks[p]
+            return
+        with ledger.LEDGER_JSONL_PATH.open("rb") as f:
+            for _, offset in found:
+                f.seek(offset)
+                yield ledger._parse_line(f.readline(), offset)
+
+
+def _connect(path: Any) -> sqlite3.Connection:
+    db = sqlite3.connect(path, timeout=30, isolation_level=None)
+    try:
+        if path != ":memory:":
+            # Rebuildable from the ledger at any time: no need for FULL sync.
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+        db.executescript(_SCHEMA)
+        if db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone() is None:
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (json.dumps(INDEX_VERSION),))
+    except BaseException:
+        db.close()
+        raise
+    return db
+
+
+def _open_db() -> sqlite3.Connection:
+    LEDGER_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        db = _connect(LEDGER_INDEX_PATH)
+        version = db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is not None and json.loads(version[0]) == INDEX_VERSION:
+            return db
+        db.close()
+    except sqlite3.DatabaseError:
+        pass   # e.g. the JSON index of earlier releases
+    # Unreadable or another format: it is only an index, start over.
+    for suffix in ("", "-wal", "-shm"):
+        Path(f"{LEDGER_INDEX_PATH}{suffix}").unlink(missing_ok=True)
+    return _connect(LEDGER_INDEX_PATH)
+
+
+def _anchor_holds(index: LedgerIndex, size: int) -> bool:
+    """
+    The indexed prefix is still the ledger's prefix: the file did not shrink and
+    the last indexed block still hashes the same (a migration rewrite would not).
+    """
+    indexed, anchor = index.size, index.anchor
+    if indexed > size:
+        return False
+    if anchor is None:
+        return indexed == 0
+    with ledger.LEDGER_JSONL_PATH.open("rb") as f:
+        f.seek(anchor["offset"])
+        raw = f.readline()
+    if not raw.endswith(b"\n") or anchor["offset"] + len(raw) != indexed:
+        return False
+    try:
+        block = json.loads(raw)
+    except json.JSONDecodeError:
+        return False
+    return ledger._chain_hash(block, len(index) - 1) == anchor["hash"]
+
+
+def open_index() -> LedgerIndex:
+    """
+    Index of the active ledger, caught up with every block appended since it
+    was last updated. Close it when done.
+
+    On the JSONL ledger the index is persisted in LEDGER_INDEX_PATH (SQLite)
+    and only the bytes appended after the indexed size are read and inserted.
+    If the ledger was rewritten (e.g. by a migration) the index is rebuilt from
+    scratch. The legacy JSON array ledger has no stable offsets, so it is
+    indexed in memory on each call.
+    """
+    if not ledger._jsonl_active():
+        index = LedgerIndex.in_memory()
+        index._blocks = list(ledger._iter_file_ledger())
+        index.add_many((block, None) for block in index._blocks)
+        return index
+
+    size = ledger.LEDGER_JSONL_PATH.stat().st_size if ledger.LEDGER_JSONL_PATH.exists() else 0
+    index = LedgerIndex(_open_db())
+    if index.size == size and _anchor_holds(index, size):
+        return index
+
+    # One writer catches up; concurrent queries wait here, then see its work.
+    index.db.execute("BEGIN IMMEDIATE")
+    try:
+        if not _anchor_holds(index, size):
+            index.db.execute("DELETE FROM entries")
+            index.db.execute("DELETE FROM meta WHERE key IN ('size', 'anchor')")
+        start, last = index.size, None
+        position = len(index)
+
+        def new_blocks() -> Iterator[Tuple[Any, int]]:
+            nonlocal start, last, position
+            for offset, raw in ledger._iter_jsonl(start, raw=True):
+                block = ledger._parse_line(raw, offset)
+                last = {"offset": offset, "hash": ledger._chain_hash(block, position)}
+                start = offset + len(raw)
+                position += 1
+                yield block, offset
+
+        if index.add_many(new_blocks()):
+            index._set_meta(size=start, anchor=last)
+        index.db.execute("COMMIT")
+    except BaseException:
+        index.db.execute("ROLLBACK")
+        index.close()
+        raise
+    return index
+
+
+# ----------------------------
+# Public API
+# ----------------------------
+
+def _query_index(
+    *,
+    organ: Optional[str],
+    tier: Optional[str],
+    since: Optional[float],
+    until: Optional[float],
+    limit: Optional[int],
+    newest_first: bool,
+) -> List[Dict[str, Any]]:
+    index = open_index()
+    try:
+        found = index.find(organ=organ, tier=tier, since=since, until=until, limit=limit, newest_first=newest_first)
+        return list(index.blocks(found))
+    finally:
+        index.close()
+
+
+def query_ledger(
+    *,
+    organ: Optional[str] = None,
+    tier: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: Optional[int] = None,
+    newest_first: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Ledger blocks matching organ, tier and an inclusive [since, until] window of
+    UNIX timestamps, in ledger order (or newest first).
+
+    The file ledger is answered from the secondary index (see open_index); the
+    SQLite store answers with its own indexes.
+
+    Args:
+        limit: return at most this many blocks (taken from the requested end)
+
+    Example:
+        query_ledger(tier="P0", since=time.time() - 7 * 86400)
+    """
+    from .ledger_store import get_store
+    return get_store().query(
+        organ=organ, tier=tier, since=since, until=until, limit=limit, newest_first=newest_first
+    )
+
+
+def last_activation(organ: str) -> Optional[Dict[str, Any]]:
+    """
+    Most recent ledger block for an organ, or None if it was never activated.
+    """
+    found = query_ledger(organ=organ, limit=1, newest_first=True)
+    return found[0] if found else None
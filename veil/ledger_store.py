@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import ledger
+
+
+# Which ledger store backs append/verify/migrate: "file" (ledger.jsonl, or the
+# legacy ledger.json array) or "sqlite".
+LEDGER_BACKEND_ENV = "VEIL_LEDGER_BACKEND"
+
+# SQLite ledger (WAL mode), used when VEIL_LEDGER_BACKEND=sqlite
+LEDGER_SQLITE_PATH = Path("/opt/veil_os/ledger.sqlite3")
+
+
+class LedgerStore:
+    """
+    Storage interface behind append_ledger_entry, verify_ledger,
+    migrate_ledger_in_place and query_ledger.
+
+    Hashing and chaining are the same for every store (hash_block over the
+    canonical fields); a store only decides where blocks live. Writers are
+    called with the ledger lock held.
+    """
+
+    name = "base"
+
+    def iter_blocks(self) -> Iterator[Any]:
+        raise NotImplementedError
+
+    def append(self, entries: List[Tuple[str, str, float]]) -> List[int]:
+        raise NotImplementedError
+
+    def replace(self, blocks: Iterable[Any]) -> None:
+        raise NotImplementedError
+
+    def verify(self, *, strict_hash: bool, allow_legacy_prefix: bool, full: bool, workers: int) -> bool:
+        raise NotImplementedError
+
+    def migrate(self, *, backup: bool, resume: bool) -> Tuple[int, int, int]:
+        raise NotImplementedError
+
+    def query(
+        self,
+        *,
+        organ: Optional[str],
+        tier: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+        limit: Optional[int],
+        newest_first: bool,
+    ) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class FileLedgerStore(LedgerStore):
+    """
+    The append-only JSONL ledger (or the legacy JSON array until converted).
+    """
+
+    name = "file"
+
+    def iter_blocks(self) -> Iterator[Any]:
+        return ledger._iter_file_ledger()
+
+    def append(self, entries: List[Tuple[str, str, float]]) -> List[int]:
+        return ledger._append_file_entries(entries)
+
+    def replace(self, blocks: Iterable[Any]) -> None:
+        ledger._save_file_ledger(blocks)
+
+    def verify(self, *, strict_hash: bool, allow_legacy_prefix: bool, full: bool, workers: int) -> bool:
+        return ledger._verify_file(
+            strict_hash=strict_hash, allow_legacy_prefix=allow_legacy_prefix, full=full, workers=workers
+        )
+
+    def migrate(self, *, backup: bool, resume: bool) -> Tuple[int, int, int]:
+        return ledger._migrate_file(backup=backup, resume=resume)
+
+    def query(self, **filters: Any) -> List[Dict[str, Any]]:
+        from .ledger_query import _query_index
+        return _query_index(**filters)
+
+
+# ----------------------------
+# SQLite store
+# ----------------------------
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS {table} (
+    position    INTEGER PRIMARY KEY,
+    block_index INTEGER,
+    organ       TEXT,
+    tier        TEXT,
+    timestamp   REAL,
+    prev_hash   TEXT,
+    hash        TEXT,
+    body        TEXT NOT NULL
+)
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS blocks_organ ON blocks (organ, position);
+CREATE INDEX IF NOT EXISTS blocks_tier ON blocks (tier, position);
+CREATE INDEX IF NOT EXISTS blocks_timestamp ON blocks (timestamp);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+_INSERT = (
+    "INSERT INTO {table} (position, block_index, organ, tier, timestamp, prev_hash, hash, body) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_INT64 = 1 << 63
+
+
+def _row(block: Any, position: int) -> Tuple[Any, ...]:
+    """
+    Table row for a block. The block itself is kept verbatim in `body` (that is
+    what gets hashed and verified); the other columns are for SQL queries.
+    """
+    body = json.dumps(block, sort_keys=True, separators=(",", ":"))
+    if not isinstance(block, dict):
+        return (position, None, None, None, None, None, None, body)
+    organ, tier = ledger._map_legacy_fields(block)
+    idx = block.get("index")
+    if not isinstance(idx, int) or isinstance(idx, bool) or not -_INT64 <= idx < _INT64:
+        idx = None
+    ts = block.get("timestamp")
+    if not isinstance(ts, (int, float)) or isinstance(ts, bool):
+        ts = None
+    prev_hash, h = block.get("prev_hash"), block.get("hash")
+    return (
+        position,
+        idx,
+        organ,
+        tier,
+        ts,
+        None if prev_hash is None else str(prev_hash),
+        None if h is None else str(h),
+        body,
+    )
+
+
+class SqliteLedgerStore(LedgerStore):
+    """
+    Ledger blocks in one SQLite table, in WAL mode with synchronous=FULL so every
+    committed append is durable. `position` is the block's place in the chain;
+    organ, tier and timestamp are indexed for queries:
+
+        sqlite3 /opt/veil_os/ledger.sqlite3 \\
+            "SELECT organ, datetime(timestamp, 'unixepoch') FROM blocks WHERE tier = 'P0'"
+
+    The verification checkpoint lives in the meta table.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path or LEDGER_SQLITE_PATH
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=FULL")
+            db.execute(_SCHEMA.format(table="blocks"))
+            db.executescript(_INDEXES)
+            yield db
+        finally:
+            db.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def count(self) -> int:
+        with self._connect() as db:
+            return db.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+
+    def iter_blocks(self) -> Iterator[Any]:
+        with self._connect() as db:
+            for (body,) in db.execute("SELECT body FROM blocks ORDER BY position"):
+                yield json.loads(body)
+
+    def _entries_from(self, position: int, raw: bool) -> Iterator[Tuple[int, Any]]:
+        with self._connect() as db:
+            rows = db.execute("SELECT position, body FROM blocks WHERE position >= ? ORDER BY position", (position,))
+            for pos, body in rows:
+                yield pos, (body.encode() if raw else json.loads(body))
+
+    def append(self, entries: List[Tuple[str, str, float]]) -> List[int]:
+        with self._transaction() as db:
+            last = db.execute("SELECT position, body FROM blocks ORDER BY position DESC LIMIT 1").fetchone()
+            if last is None:
+                position, prev_hash = 0, "GENESIS"
+            else:
+                position, prev_hash = last[0] + 1, ledger._chain_hash(json.loads(last[1]), last[0])
+            blocks = ledger._chain_entries(entries, position, prev_hash)
+            db.executemany(_INSERT.format(table="blocks"), [_row(b, position + i) for i, b in enumerate(blocks)])
+        return [b["index"] for b in blocks]
+
+    def replace(self, blocks: Iterable[Any]) -> None:
+        with self._transaction() as db:
+            db.execute("DELETE FROM blocks")
+            db.execute("DELETE FROM meta WHERE key = 'checkpoint'")
+            db.executemany(_INSERT.format(table="blocks"), (_row(b, i) for i, b in enumerate(blocks)))
+
+    # --- verification ---
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'checkpoint'").fetchone()
+        return None if row is None else ledger._checkpoint_from(row[0])
+
+    def _write_checkpoint(self, ckpt: Dict[str, Any]) -> None:
+        with self._connect() as db:
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('checkpoint', ?)", (json.dumps(ckpt),))
+
+    def verify(self, *, strict_hash: bool, allow_legacy_prefix: bool, full: bool, workers: int) -> bool:
+        return ledger._verify_checkpointed(
+            self._entries_from,
+            self._read_checkpoint,
+            self._write_checkpoint,
+            f"the 'checkpoint' row of {self.path}:meta",
+            strict_hash=strict_hash,
+            allow_legacy_prefix=allow_legacy_prefix,
+            full=full,
+            workers=workers,
+        )
+
+    # --- migration ---
+
+    def migrate(self, *, backup: bool, resume: bool) -> Tuple[int, int, int]:
+        """
+        Same mapping as the file migration, done in one transaction: an interrupted
+        migration rolls back, so there is nothing to resume. Quarantined blocks
+        are appended (and fsynced) before that transaction commits.
+        """
+        if self.count() == 0:
+            print("ℹ️ Ledger is empty. Nothing to migrate.")
+            return (0, 0, 0)
+
+        if backup:
+            bak = self.path.with_suffix(self.path.suffix + ".bak")
+            bak.unlink(missing_ok=True)
+            with self._connect() as db, sqlite3.connect(bak) as dst:
+                db.backup(dst)
+            print(f"🧾 Backup written: {bak}")
+
+        _, q_tmp = ledger._migration_temps(self.path)
+        # Where quarantined blocks are appended, fixed by the first attempt: the
+        # quarantine is written before the rewrite commits, so a retry after a
+        # crash in between rewrites the same bytes instead of duplicating them.
+        with self._connect() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'migrate_quarantine'").fetchone()
+            if row is None:
+                where = ledger._quarantine_cut(ledger.LEGACY_QUARANTINE_PATH)
+                db.execute("INSERT INTO meta (key, value) VALUES ('migrate_quarantine', ?)", (json.dumps(where),))
+            else:
+                where = json.loads(row[0])
+        modified = quarantined = read = written = 0
+        prev_hash = "GENESIS"
+        with self._transaction() as db, q_tmp.open("wb") as staged:
+            db.execute("DROP TABLE IF EXISTS blocks_migrating")
+            db.execute(_SCHEMA.format(table="blocks_migrating"))
+            insert = _INSERT.format(table="blocks_migrating")
+            for (body,) in db.execute("SELECT body FROM blocks ORDER BY position"):
+                new_block, entry, changed = ledger._migrate_block(json.loads(body), read, written, prev_hash)
+                read += 1
+                if new_block is None:
+                    staged.write((json.dumps(entry) + "\n").encode())
+                    quarantined += 1
+                    continue
+                modified += changed
+                db.execute(insert, _row(new_block, written))
+                prev_hash = new_block["hash"]
+                written += 1
+            if quarantined:
+                staged.flush()
+                os.fsync(staged.fileno())
+                ledger._append_quarantine(q_tmp, where)
+            if written:
+                db.execute("DELETE FROM blocks")
+                db.execute("INSERT INTO blocks SELECT * FROM blocks_migrating")
+                # A rewritten chain invalidates any verification checkpoint.
+                db.execute("DELETE FROM meta WHERE key = 'checkpoint'")
+            db.execute("DROP TABLE blocks_migrating")
+            db.execute("DELETE FROM meta WHERE key = 'migrate_quarantine'")
+
+        if quarantined:
+            print(f"📦 Quarantined {quarantined} legacy block(s) -> {ledger.LEGACY_QUARANTINE_PATH}")
+        q_tmp.unlink(missing_ok=True)
+
+        if not written:
+            print("❌ No migratable blocks remain after quarantining legacy entries.")
+            return (0, quarantined, read)
+        print(f"✅ Migration complete. Active ledger rewritten as canonical chain ({written} blocks).")
+        return (modified, quarantined, read)
+
+    # --- queries ---
+
+    def query(
+        self,
+        *,
+        organ: Optional[str],
+        tier: Optional[str],
+        since: Optional[float],
+        until: Optional[float],
+        limit: Optional[int],
+        newest_first: bool,
+    ) -> List[Dict[str, Any]]:
+        where: List[str] = []
+        params: List[Any] = []
+        for column, op, value in (("organ", "=", organ), ("tier", "=", tier), ("timestamp", ">=", since), ("timestamp", "<=", until)):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT body FROM blocks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY position" + (" DESC" if newest_first else "")
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._connect() as db:
+            return [json.loads(body) for (body,) in db.execute(sql, params)]
+
+    def import_blocks(self, blocks: Iterable[Any]) -> int:
+        """
+        Copy blocks verbatim into an empty store (see convert_ledger_to_sqlite).
+        """
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM blocks LIMIT 1").fetchone() is not None:
+                raise RuntimeError(f"❌ SQLite ledger is not empty: {self.path}")
+            count = 0
+            for block in blocks:
+                db.execute(_INSERT.format(table="blocks"), _row(block, count))
+                count += 1
+        return count
+
+
+# ----------------------------
+# Selection
+# ----------------------------
+
+_BACKENDS = {
+    "file": FileLedgerStore,
+    "sqlite": SqliteLedgerStore,
+}
+
+
+def get_store() -> LedgerStore:
+    """
+    Ledger store selected by VEIL_LEDGER_BACKEND (default: file).
+    """
+    name = os.environ.get(LEDGER_BACKEND_ENV, "file").strip().lower() or "file"
+    try:
+        return _BACKENDS[name]()
+    except KeyError:
+        raise RuntimeError(
+            f"❌ Unknown ledger backend {name!r} in {LEDGER_BACKEND_ENV} (choose from: {', '.join(_BACKENDS)})."
+        ) from None
+
+
+def convert_ledger_to_sqlite(*, dry_run: bool = False) -> int:
+    """
+    Copy the file ledger (JSONL, or the legacy JSON array) into the SQLite store.
+
+    Blocks are copied verbatim, so the chain verifies exactly as before. The file
+    ledger is left in place; set VEIL_LEDGER_BACKEND=sqlite to switch over.
+
+    Returns:
+        number of blocks copied
+    """
+    source = ledger._active_ledger_path()
+    if not source.exists():
+        print(f"ℹ️ No file ledger at {source}. Nothing to convert.")
+        return 0
+    if dry_run:
+        count = sum(1 for _ in ledger._iter_file_ledger())
+        print(f"🧾 Would copy {count} block(s): {source} -> {LEDGER_SQLITE_PATH}")
+        return count
+
+    with ledger._ledger_lock():
+        count = SqliteLedgerStore().import_blocks(ledger._iter_file_ledger())
+    print(f"✅ Copied {count} block(s): {source} -> {LEDGER_SQLITE_PATH}")
+    return count
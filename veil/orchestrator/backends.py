@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Orchestrator backends: where organs are started, stopped and looked up.
+
+    supervisor  (default) in the boot service, spawn under its supervisor
+                (restarts on crash); in any other process (CLI, GUI) start
+                like the pidfile backend, since a supervisor there would die
+                with the caller. Organs of other processes are seen through
+                their pidfiles
+    pidfile     spawn detached and track by pidfile only (no restarts)
+    memory      in-process table, nothing is spawned (tests, demos)
+
+Chosen by VEIL_ORCHESTRATOR_BACKEND. Every backend returns the same
+ServiceStatus, so callers never need to know which one is active.
+"""
+from __future__ import annotations
+
+import os
+import signal
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import pidfile
+from .status import ServiceStatus
+
+ORCHESTRATOR_BACKEND_ENV = "VEIL_ORCHESTRATOR_BACKEND"
+
+
+class Backend(ABC):
+    """
+    Interface behind veil.orchestrator's start/stop/status/list_statuses.
+
+    `organs` arguments are (name, tier) pairs from the spec discovery; the
+    tier is reported back in the status.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def names(self) -> Iterable[str]:
+        """Organs the backend knows of beyond the specs (organ folders, pidfiles, ...)."""
+
+    @abstractmethod
+    def statuses(self, organs: Sequence[Tuple[str, str]]) -> List[ServiceStatus]:
+        ...
+
+    def status(self, name: str, tier: str) -> ServiceStatus:
+        return self.statuses([(name, tier)])[0]
+
+    @abstractmethod
+    def start(self, name: str, tier: str) -> ServiceStatus:
+        ...
+
+    @abstractmethod
+    def stop(self, name: str, tier: str, *, force: bool = False) -> ServiceStatus:
+        ...
+
+
+def _with_tier(st: ServiceStatus, tier: str) -> ServiceStatus:
+    # A copy: `st` may be the supervisor's or the status cache's own record.
+    return replace(st, tier=tier)
+
+
+# ----------------------------
+# memory
+# ----------------------------
+
+class MemoryBackend(Backend):
+    """Organs are entries in a dict; start/stop only flip them. Pids are fake."""
+
+    name = "memory"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._table: Dict[str, ServiceStatus] = {}
+        self._next_pid = 10000
+
+    def names(self) -> Iterable[str]:
+        with self._lock:
+            return sorted(self._table)
+
+    def _get(self, name: str, tier: str) -> ServiceStatus:
+        st = self._table.get(name)
+        if st is None:
+            st = self._table[name] = ServiceStatus(
+                name=name, running=False, pid=None, log=str(pidfile._log_file(name)), tier=tier, state="stopped"
+            )
+        return st
+
+    def statuses(self, organs: Sequence[Tuple[str, str]]) -> List[ServiceStatus]:
+        with self._lock:
+            # Copies: callers must not be able to edit the table.
+            return [replace(self._get(name, tier), tier=tier) for name, tier in organs]
+
+    def start(self, name: str, tier: str) -> ServiceStatus:
+        with self._lock:
+            st = self._get(name, tier)
+            if not st.running:
+                self._next_pid += 1
+                st.running, st.pid, st.state = True, self._next_pid, "running"
+        return self.status(name, tier)
+
+    def stop(self, name: str, tier: str, *, force: bool = False) -> ServiceStatus:
+        with self._lock:
+            st = self._get(name, tier)
+            st.running, st.pid, st.state = False, None, "stopped"
+        return self.status(name, tier)
+
+
+# ----------------------------
+# pidfile
+# ----------------------------
+
+# How often stop() checks whether a signalled organ is gone.
+_STOP_POLL = 0.05
+
+
+def _signal_group(pid: int, sig: int) -> None:
+    try:
+        os.killpg(pid, sig)
+    except ProcessLookupError:
+        pass
+    except PermissionError:
+        os.kill(pid, sig)
+
+
+class PidfileBackend(Backend):
+    """
+    Organs run detached in their own session; their pid lives in a pidfile
+    (veil.orchestrator.pidfile), read through the inotify status cache.
+    """
+
+    name = "pidfile"
+
+    def _snapshot(self) -> pidfile.StatusSnapshot:
+        from . import status_cache
+        return status_cache.default().snapshot()
+
+    def names(self) -> Iterable[str]:
+        return self._snapshot().statuses.keys()
+
+    def statuses(self, organs: Sequence[Tuple[str, str]]) -> List[ServiceStatus]:
+        snap = self._snapshot()
+        out = []
+        for name, tier in organs:
+            seen = snap.get(name)
+            out.append(ServiceStatus(
+                name=name,
+                running=seen is not None and seen.running,
+                pid=seen.pid if seen is not None else None,
+                log=str(pidfile._log_file(name)),
+                tier=tier,
+                state="running" if seen is not None and seen.running else "stopped",
+            ))
+        return out
+
+    def _invalidate(self) -> None:
+        from . import status_cache
+        status_cache.invalidate()
+
+    def start(self, name: str, tier: str) -> ServiceStatus:
+        """
+        Spawn run.sh detached (no-op if already running).
+
+        Raises:
+            FileNotFoundError: the organ has no run.sh
+        """
+        import subprocess
+
+        current = pidfile.status(name)
+        if current.running:
+            return _with_tier(current, tier)
+        organ_dir = pidfile.DEFAULT_ORGANS_DIR / name
+        script = organ_dir / "run.sh"
+        if not script.is_file():
+            raise FileNotFoundError(f"❌ No run.sh for organ '{name}': {script}")
+        pidfile._ensure_dirs()
+        with open(pidfile._log_file(name), "ab", buffering=0) as out:
+            proc = subprocess.Popen(
+                [str(script)],
+                cwd=organ_dir,
+                stdin=subprocess.DEVNULL,
+                stdout=out,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        pidfile.write_pid(name, proc.pid)
+        self._invalidate()
+        return self.status(name, tier)
+
+    def stop(
+        self, name: str, tier: str, *, force: bool = False, timeout: Optional[float] = None
+    ) -> ServiceStatus:
+        """
+        Stop the organ: SIGTERM to its process group, SIGKILL after `timeout`
+        seconds (default supervisor.STOP_TIMEOUT, or right away with force=True).
+        The pidfile is removed only once the process is gone; if even SIGKILL
+        does not end it within another `timeout`, it is kept and the organ is
+        reported as still running.
+        """
+        from .supervisor import STOP_TIMEOUT
+
+        timeout = STOP_TIMEOUT if timeout is None else timeout
+        rec = pidfile._read_record(pidfile._pid_file(name))
+        if rec is not None and pidfile._alive(rec):
+            sig = signal.SIGKILL if force else signal.SIGTERM
+            _signal_group(rec.pid, sig)
+            deadline = time.monotonic() + timeout
+            while pidfile._alive(rec):
+                if time.monotonic() >= deadline:
+                    if sig == signal.SIGKILL:
+                        self._invalidate()
+                        return self.status(name, tier)
+                    sig = signal.SIGKILL
+                    _signal_group(rec.pid, sig)
+                    deadline = time.monotonic() + timeout
+                time.sleep(_STOP_POLL)
+            pidfile.remove_pid(name, rec.pid)
+        self._invalidate()
+        return ServiceStatus(
+            name=name, running=False, pid=None, log=str(pidfile._log_file(name)), tier=tier, state="stopped"
+        )
+
+
+# ----------------------------
+# supervisor
+# ----------------------------
+
+class SupervisorBackend(PidfileBackend):
+    """
+    In the process that owns the supervisor (supervisor.own(): the boot
+    service), organs started here run under it and are restarted on crash.
+    A short-lived process such as `veil orchestrator start` owns no
+    supervisor loop, so it starts organs detached through the pidfile path;
+    they keep running after it exits but are not restarted. Anything else
+    (e.g. organs of the boot service) falls back to the pidfile view.
+    """
+
+    name = "supervisor"
+
+    def _supervisor(self, *, owned: bool = False):
+        # Imported here: list/status in a process that never started anything stay cheap.
+        from . import supervisor
+        return supervisor.owned() if owned else supervisor.running()
+
+    def names(self) -> Iterable[str]:
+        sup = self._supervisor()
+        own = [st.name for st in sup.statuses()] if sup is not None else []
+        return sorted(set(own) | set(super().names()))
+
+    def statuses(self, organs: Sequence[Tuple[str, str]]) -> List[ServiceStatus]:
+        sup = self._supervisor()
+        if sup is None:
+            return super().statuses(organs)
+        others = [(name, tier) for name, tier in organs if name not in sup]
+        seen = {st.name: st for st in super().statuses(others)} if others else {}
+        return [
+            _with_tier(sup.status(name), tier) if name not in seen else seen[name]
+            for name, tier in organs
+        ]
+
+    def start(self, name: str, tier: str) -> ServiceStatus:
+        sup = self._supervisor(owned=True)
+        if sup is None:
+            return super().start(name, tier)
+        st = sup.start(name, tier=tier)
+        self._invalidate()
+        return st
+
+    def stop(self, name: str, tier: str, *, force: bool = False) -> ServiceStatus:
+        sup = self._supervisor()
+        if sup is None or name not in sup:
+            return super().stop(name, tier, force=force)
+        st = sup.stop(name, force=force)
+        self._invalidate()
+        return _with_tier(st, tier)
+
+
+# ----------------------------
+# Selection
+# ----------------------------
+
+_BACKENDS = {
+    "supervisor": SupervisorBackend,
+    "pidfile": PidfileBackend,
+    "memory": MemoryBackend,
+}
+
+_INSTANCES: Dict[str, Backend] = {}
+_INSTANCES_LOCK = threading.Lock()
+
+
+def get_backend() -> Backend:
+    """
+    Orchestrator backend selected by VEIL_ORCHESTRATOR_BACKEND (default:
+    supervisor). One instance per backend and process, so state such as the
+    memory table persists between calls.
+    """
+    name = os.environ.get(ORCHESTRATOR_BACKEND_ENV, "supervisor").strip().lower() or "supervisor"
+    with _INSTANCES_LOCK:
+        backend = _INSTANCES.get(name)
+        if backend is None:
+            try:
+                backend = _INSTANCES[name] = _BACKENDS[name]()
+            except KeyError:
+                raise RuntimeError(
+                    f"❌ Unknown orchestrator backend {name!r} in {ORCHESTRATOR_BACKEND_ENV} "
+                    f"(choose from: {', '.join(_BACKENDS)})."
+                ) from None
+        return backend
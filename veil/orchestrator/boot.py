@@ -1,30 +1,231 @@
 #!/usr/bin/env python3
-"""Start all Veil OS organs in priority order"""
-from . import start, list
-
-def boot_all():
-    organs = list()
-    # P0 first (critical)
-    for o in organs:
-        if o.get("tier") == "P0":
-            print(f"Starting P0: {o['name']}")
-            start(o["name"])
-    # P1 second
-    for o in organs:
-        if o.get("tier") == "P1":
-            print(f"Starting P1: {o['name']}")
-            start(o["name"])
-    # P2 last
-    for o in organs:
-        if o.get("tier") == "P2":
-            print(f"Starting P2: {o['name']}")
-            start(o["name"])
+"""
+Start all Veil OS organs in priority order.
+
+Every organ of a tier is started at the same time; the next tier starts once
+the whole tier is done, i.e. its organs are spawned and pass the readiness
+probes of their specs (see veil.orchestrator.readiness), or have failed. An
+organ whose spec declares `depends_on` instead waits only for those organs, so
+it can start before its tier barrier. A failed organ only keeps the organs that
+depend on it from starting. The whole boot must finish within a global
+deadline; a timeline of when each organ started and became ready is printed at
+the end.
+
+The process then stays up as the supervisor (restarts on crash) of every organ
+that started, even if others failed, until SIGTERM; it exits with status 1 if
+the boot had failures. Run by systemd as:
+
+    ExecStart=/home/user/veil_os/backend/venv/bin/python -m veil.orchestrator.boot
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Optional, Sequence
+
+from . import start, list, supervisor
+from .readiness import Probe, ReadinessError
+from ..scheduler import TIER_ORDER, first_failure, run_graph
+
+# Whole-boot budget in seconds; organs not ready by then fail the boot.
+BOOT_DEADLINE = 300.0
+
+_BAR_WIDTH = 30
+
+
+@dataclass(frozen=True, slots=True)
+class BootStep:
+    """When one organ was started, spawned and became ready (time.time())."""
+    name: str
+    tier: str
+    probe: str
+    started: Optional[float] = None
+    spawned: Optional[float] = None
+    ready: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.ready is not None and self.error is None
+
+
+@dataclass(frozen=True, slots=True)
+class BootReport:
+    began: float
+    ended: float
+    deadline: float
+    steps: Sequence[BootStep]
+    failure: Optional[BaseException] = None   # what boot_all() raises
+
+    @property
+    def ok(self) -> bool:
+        return all(s.ok for s in self.steps)
+
+    @property
+    def total(self) -> float:
+        return self.ended - self.began
+
+    def timeline(self) -> str:
+        """Text timeline, one line per organ in start order, with a bar from start to ready."""
+        total = self.total or 1e-9
+        lines = [
+            f"🧾 Boot timeline: {len(self.steps)} organ(s) in {self.total:.2f} s (deadline {self.deadline:g} s)"
+        ]
+        for s in sorted(self.steps, key=lambda s: (s.started is None, s.started or 0.0)):
+            if s.started is None:
+                lines.append(f"  {s.tier:<3} {s.name:<20} {'':>8} {'':{_BAR_WIDTH}}  ↪️ not started")
+                continue
+            end = s.ready or (s.spawned if s.error is None else None) or self.ended
+            lead = int(_BAR_WIDTH * (s.started - self.began) / total)
+            width = max(1, int(_BAR_WIDTH * (end - s.started) / total))
+            bar = (" " * lead + "█" * width)[:_BAR_WIDTH]
+            spawn = f"spawn {s.spawned - s.started:.2f}s" if s.spawned else "spawn —"
+            if s.ok:
+                outcome = f"✅ ready {s.ready - s.started:.2f}s ({s.probe})"
+            else:
+                outcome = f"❌ {s.error}"
+            lines.append(
+                f"  {s.tier:<3} {s.name:<20} +{s.started - self.began:6.2f}s {bar:<{_BAR_WIDTH}}  {spawn}  {outcome}"
+            )
+        slowest = max((s for s in self.steps if s.ok), key=lambda s: s.ready - s.started, default=None)
+        if slowest is not None:
+            lines.append(f"  slowest to ready: {slowest.name} ({slowest.ready - slowest.started:.2f} s)")
+        return "\n".join(lines)
+
+    def to_json(self) -> Dict[str, Any]:
+        def rel(t: Optional[float]) -> Optional[float]:
+            return None if t is None else round(t - self.began, 4)
+
+        return {
+            "began": self.began,
+            "total_s": round(self.total, 4),
+            "deadline_s": self.deadline,
+            "ok": self.ok,
+            "organs": [
+                {
+                    "name": s.name,
+                    "tier": s.tier,
+                    "probe": s.probe,
+                    "started_s": rel(s.started),
+                    "spawned_s": rel(s.spawned),
+                    "ready_s": rel(s.ready),
+                    "error": None if s.error is None else str(s.error),
+                }
+                for s in self.steps
+            ],
+        }
+
+
+def _alive(name: str) -> bool:
+    sup = supervisor.running()
+    return sup is None or name not in sup or sup.status(name).state != "stopped"
+
+
+def boot(*, workers: Optional[int] = None, deadline: float = BOOT_DEADLINE) -> BootReport:
+    """
+    Start every organ, tier by tier, waiting for readiness. Organ failures
+    are reported, not raised; a failure only skips the organs that depend on
+    the failed one.
+
+    Args:
+        workers: organs started at the same time (default: all of them)
+        deadline: seconds the whole boot may take
+    """
+    organs = [
+        SimpleNamespace(
+            name=o["name"],
+            tier=o.get("tier"),
+            depends_on=o.get("depends_on") or [],
+            probe=Probe.from_spec(o.get("ready")),   # a malformed spec fails before anything starts
+        )
+        for o in list()
+        if o.get("tier") in TIER_ORDER
+    ]
+    organs.sort(key=lambda o: TIER_ORDER.index(o.tier))
+
+    began = time.time()
+    until = time.monotonic() + deadline
+    spawned: Dict[str, float] = {}
+    lock = threading.Lock()
+
+    def _start(organ) -> None:
+        if time.monotonic() >= until:
+            raise ReadinessError(f"Organ '{organ.name}' not started: boot deadline of {deadline:g}s passed")
+        print(f"Starting {organ.tier}: {organ.name}")
+        start(organ.name)
+        with lock:
+            spawned[organ.name] = time.time()
+        organ.probe.wait(organ.name, deadline=until, alive=lambda: _alive(organ.name))
+
+    activations = run_graph(organs, workers=workers or len(organs), strict=False, action=_start)
+    failure = first_failure(activations)
+    return BootReport(
+        began=began,
+        ended=time.time(),
+        deadline=deadline,
+        steps=[
+            BootStep(
+                name=a.organ.name,
+                tier=a.organ.tier,
+                probe=a.organ.probe.label,
+                started=a.started,
+                spawned=spawned.get(a.organ.name),
+                ready=a.finished if a.ok else None,
+                error=a.error,
+            )
+            for a in activations
+        ],
+        failure=None if failure is None else failure.error,
+    )
+
+
+def boot_all(*, workers: Optional[int] = None, deadline: float = BOOT_DEADLINE, quiet: bool = False) -> BootReport:
+    """
+    boot(), then print the timeline (unless quiet).
+
+    Raises:
+        the first organ failure, after the timeline
+    """
+    report = boot(workers=workers, deadline=deadline)
+    if not quiet:
+        print(report.timeline())
+    if report.failure is not None:
+        raise report.failure
     print("✅ All organs started")
+    return report
 
-if __name__ == "__main__":
-    boot_all()
-```
 
-Then systemd calls:
-```
-ExecStart=/home/user/veil_os/backend/venv/bin/python -m veil.orchestrator.boot
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    ap = argparse.ArgumentParser(prog="veil.orchestrator.boot", description="Boot every organ and supervise them.")
+    ap.add_argument("--deadline", type=float, default=BOOT_DEADLINE, help="Seconds the whole boot may take")
+    ap.add_argument("--workers", type=int, help="Organs started at the same time (default: all)")
+    ap.add_argument("--timeline-json", type=Path, help="Also write the boot timeline as JSON")
+    args = ap.parse_args(argv)
+
+    # Organs started from here on run under this process's supervisor.
+    sup = supervisor.own()
+    report = boot(workers=args.workers, deadline=args.deadline)
+    print(report.timeline())
+    if args.timeline_json:
+        args.timeline_json.parent.mkdir(parents=True, exist_ok=True)
+        args.timeline_json.write_text(json.dumps(report.to_json(), indent=2), encoding="utf-8")
+    if report.failure is None:
+        print("✅ All organs started")
+    else:
+        failed = sum(not s.ok for s in report.steps)
+        print(f"❌ Boot incomplete: {failed} organ(s) failed or not started. First failure: {report.failure}")
+        if not any(s.spawned is not None for s in report.steps):
+            raise SystemExit(1)
+    # Organs that did start are supervised even when others failed.
+    sup.serve_forever()
+    if report.failure is not None:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
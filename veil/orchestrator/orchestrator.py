@@ -1,77 +1,98 @@
-import yaml
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Tuple
 
-@dataclass
-class ServiceStatus:
-    name: str
-    running: bool
-    pid: Optional[int]
-    log: str
-    tier: str = "P2"
+from .status import ServiceStatus
 
-_organs: Dict[str, Dict[str, Any]] = {}
+# Organ specs (name, tier, glyph, depends_on, ready) are read from here once per process.
+SPECS_DIR = Path.home() / "veil_os/backend/veil/specs"
 
-def _discover():
+_organs: Optional[Dict[str, Dict[str, Any]]] = None
+_organs_lock = threading.Lock()
+
+def _discover() -> Dict[str, Dict[str, Any]]:
     global _organs
-    if _organs:
-        return _organs
-    specs = Path.home() / "veil_os/backend/veil/specs"
-    if specs.exists():
-        for f in specs.glob("*.yaml"):
+    organs = _organs
+    if organs is not None:
+        return organs
+    with _organs_lock:
+        if _organs is not None:
+            return _organs
+        organs = {}
+        if SPECS_DIR.exists():
+            # Imported here: status/list calls without specs never load yaml.
+            from ..spec_registry import registry
             try:
-                for doc in yaml.safe_load_all(f.read_text()):
-                    if doc and "name" in doc:
-                        n = doc["name"]
-                        _organs[n] = {
-                            "name": n,
-                            "tier": doc.get("tier", "P2"),
-                            "glyph": doc.get("glyph", "🔷"),
-                            "running": False,
-                            "pid": None,
-                            "log": f"/opt/veil_os/var/log/{n}.log"
-                        }
+                docs = registry(SPECS_DIR).documents()
             except Exception:
-                pass
-    return _organs
+                docs = []
+            for doc in docs:
+                n = doc["name"]
+                organs[n] = {
+                    "name": n,
+                    "tier": doc.get("tier", "P2"),
+                    "glyph": doc.get("glyph", "🔷"),
+                    "depends_on": doc.get("depends_on", []),
+                    "ready": doc.get("ready"),
+                    "log": f"/opt/veil_os/var/log/{n}.log"
+                }
+        _organs = organs
+        return organs
+
+def refresh_specs() -> None:
+    """Forget the discovered specs; the next call reads SPECS_DIR again."""
+    global _organs
+    with _organs_lock:
+        _organs = None
+
+def _backend():
+    # Imported here: `import veil.orchestrator` stays cheap for callers that only need types.
+    from .backends import get_backend
+    return get_backend()
+
+def _tier(name: str) -> str:
+    return _discover().get(name, {}).get("tier", "P2")
 
-def _to_status(name: str) -> ServiceStatus:
-    d = _organs.get(name, {"name": name, "running": False, "pid": None, "log": "", "tier": "P2"})
-    return ServiceStatus(name=d["name"], running=d["running"], pid=d["pid"], log=d["log"], tier=d.get("tier", "P2"))
+def _known() -> List[Tuple[str, str]]:
+    # Spec organs in spec order, then anything else the backend runs or sees.
+    organs = _discover()
+    extra = sorted(n for n in _backend().names() if n not in organs)
+    return [(n, d["tier"]) for n, d in organs.items()] + [(n, "P2") for n in extra]
 
 def list_statuses() -> List[ServiceStatus]:
-    _discover()
-    return [_to_status(n) for n in _organs]
+    return _backend().statuses(_known())
 
 def list() -> List[Dict[str, Any]]:
-    return [v for v in _discover().values()]
+    """Discovered organ specs (status: see list_statuses)."""
+    return [dict(v) for v in _discover().values()]
 
 def list_services() -> List[ServiceStatus]:
     return list_statuses()
 
 def status(name: str) -> ServiceStatus:
-    _discover()
-    return _to_status(name)
+    return _backend().status(name, _tier(name))
 
 def get_status(name: str) -> ServiceStatus:
     return status(name)
 
 def start(name: str, dry_run: bool = False) -> ServiceStatus:
-    _discover()
-    if name in _organs and not dry_run:
-        _organs[name]["running"] = True
-    return _to_status(name)
+    """
+    Start an organ through the configured backend (VEIL_ORCHESTRATOR_BACKEND).
+    By default that is the supervisor, which restarts the organ if it crashes,
+    in the boot service. In other processes, such as the CLI, the organ is
+    started detached and is not restarted (see backends.SupervisorBackend).
+    """
+    if dry_run:
+        return status(name)
+    return _backend().start(name, _tier(name))
 
 def start_service(name: str, dry_run: bool = False) -> ServiceStatus:
     return start(name, dry_run)
 
 def stop(name: str, force: bool = False, dry_run: bool = False) -> ServiceStatus:
-    _discover()
-    if name in _organs and not dry_run:
-        _organs[name]["running"] = False
-        _organs[name]["pid"] = None
-    return _to_status(name)
+    if dry_run:
+        return status(name)
+    return _backend().stop(name, _tier(name), force=force)
 
 def stop_service(name: str, dry_run: bool = False) -> ServiceStatus:
     return stop(name, force=False, dry_run=dry_run)
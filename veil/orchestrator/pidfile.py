@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Pidfile-based service status, for processes that do not own the supervisor
+(the hospital GUI, `veil orchestrator list` in another shell, ...). Used by
+the "pidfile" and "supervisor" orchestrator backends (see backends.py).
+
+Pidfiles live in DEFAULT_PID_DIR as "<pid> <start_ticks>\\n", where
+start_ticks is the process start time from /proc/<pid>/stat. A pid whose
+current process started at a different time was reused by an unrelated
+process and does not count as running. Legacy pidfiles holding only a pid are
+checked against their mtime instead.
+
+snapshot() collects the status of every service in one pass: the directories
+are created once per process, all pidfiles are found with one scandir, and
+each pid costs one read of /proc/<pid>/stat.
+"""
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .status import ServiceStatus
+
+DEFAULT_LOG_DIR = Path("/opt/veil_os/var/log")
+DEFAULT_PID_DIR = Path("/opt/veil_os/var/run")
+DEFAULT_ORGANS_DIR = Path("/opt/veil_os/organs")
+
+PROC = Path("/proc")
+
+# Slack when comparing a legacy pidfile's mtime to the process start time.
+_START_SLACK = 1.0
+
+_dirs_ready: Optional[Tuple[Path, Path]] = None
+_boot_time: Optional[float] = None
+
+
+def _ensure_dirs() -> None:
+    global _dirs_ready
+    dirs = (DEFAULT_LOG_DIR, DEFAULT_PID_DIR)
+    if _dirs_ready == dirs:
+        return
+    DEFAULT_LOG_DIR.mkdir(parents=True, exist_ok=True)
+    DEFAULT_PID_DIR.mkdir(parents=True, exist_ok=True)
+    _dirs_ready = dirs
+
+
+def _pid_file(name: str, pid_dir: Optional[Path] = None) -> Path:
+    return (pid_dir or DEFAULT_PID_DIR) / f"{name}.pid"
+
+
+def _log_file(name: str, log_dir: Optional[Path] = None) -> Path:
+    return (log_dir or DEFAULT_LOG_DIR) / f"{name}.log"
+
+
+# ----------------------------
+# /proc
+# ----------------------------
+
+def _proc_start_ticks(pid: int) -> Optional[int]:
+    """
+    Start time of a live process in clock ticks since boot; None if there is no
+    such process (or it is a zombie). Falls back to kill(pid, 0) without /proc.
+    """
+    if pid <= 0:
+        return None
+    try:
+        with open(PROC / str(pid) / "stat", "rb") as f:
+            stat = f.read()
+    except FileNotFoundError:
+        return None
+    except OSError:
+        if PROC.is_dir():
+            return None
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return None
+        except PermissionError:
+            pass
+        return -1   # alive, start time unknown
+    # comm may contain spaces and parentheses: fields resume after the last ')'.
+    fields = stat[stat.rfind(b")") + 2:].split()
+    if not fields or fields[0] == b"Z":
+        return None
+    return int(fields[19])
+
+
+def _boot() -> float:
+    global _boot_time
+    if _boot_time is None:
+        try:
+            with open(PROC / "stat", "rb") as f:
+                for line in f:
+                    if line.startswith(b"btime "):
+                        _boot_time = float(line.split()[1])
+                        break
+        except OSError:
+            pass
+        if _boot_time is None:
+            _boot_time = 0.0
+    return _boot_time
+
+
+def _ticks_to_epoch(ticks: int) -> float:
+    return _boot() + ticks / os.sysconf("SC_CLK_TCK")
+
+
+# ----------------------------
+# Pidfiles
+# ----------------------------
+
+@dataclass(frozen=True, slots=True)
+class _PidRecord:
+    pid: int
+    start_ticks: Optional[int]   # None: legacy pidfile
+    mtime: float
+
+
+def _parse_pidfile(text: str, mtime: float) -> Optional[_PidRecord]:
+    parts = text.split()
+    try:
+        pid = int(parts[0])
+        start = int(parts[1]) if len(parts) > 1 else None
+    except (IndexError, ValueError):
+        return None
+    return _PidRecord(pid, start, mtime)
+
+
+def _read_record(path: Path) -> Optional[_PidRecord]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+            mtime = os.fstat(f.fileno()).st_mtime
+    except OSError:
+        return None
+    return _parse_pidfile(text, mtime)
+
+
+def _scan_pidfiles(pid_dir: Optional[Path] = None) -> Dict[str, Path]:
+    """Every pidfile by service name, from one scandir of the pid directory."""
+    try:
+        with os.scandir(pid_dir or DEFAULT_PID_DIR) as it:
+            return {e.name[:-4]: Path(e.path) for e in it if e.name.endswith(".pid") and e.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+def _alive(rec: _PidRecord) -> bool:
+    start = _proc_start_ticks(rec.pid)
+    if start is None:
+        return False
+    if start < 0:
+        return True
+    if rec.start_ticks is not None:
+        return start == rec.start_ticks
+    # Legacy pidfile: the process must have started before the file was written.
+    return _ticks_to_epoch(start) <= rec.mtime + _START_SLACK
+
+
+def write_pid(name: str, pid: int, pid_dir: Optional[Path] = None) -> None:
+    """Record a service's pid together with its process start time."""
+    if pid_dir is None:
+        _ensure_dirs()
+    path = _pid_file(name, pid_dir)
+    start = _proc_start_ticks(pid)
+    text = f"{pid} {start}\n" if start is not None and start >= 0 else f"{pid}\n"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text)
+    tmp.replace(path)
+
+
+def remove_pid(name: str, pid: Optional[int] = None, pid_dir: Optional[Path] = None) -> None:
+    """Remove a service's pidfile (only if it still names `pid`, when given)."""
+    path = _pid_file(name, pid_dir)
+    if pid is not None:
+        rec = _read_record(path)
+        if rec is None or rec.pid != pid:
+            return
+    path.unlink(missing_ok=True)
+
+
+# ----------------------------
+# Status
+# ----------------------------
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """Status of every service at one point in time."""
+    taken_at: float
+    statuses: Dict[str, ServiceStatus] = field(default_factory=dict)
+
+    def __iter__(self) -> Iterator[ServiceStatus]:
+        return iter(self.statuses.values())
+
+    def __len__(self) -> int:
+        return len(self.statuses)
+
+    def get(self, name: str) -> Optional[ServiceStatus]:
+        return self.statuses.get(name)
+
+    def running(self) -> List[ServiceStatus]:
+        return [s for s in self.statuses.values() if s.running]
+
+
+def _organ_names(organs_dir: Optional[Path] = None) -> Optional[List[str]]:
+    try:
+        with os.scandir(organs_dir or DEFAULT_ORGANS_DIR) as it:
+            return sorted(e.name for e in it if not e.name.startswith(".") and e.is_dir())
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _status_of(name: str, path: Optional[Path]) -> ServiceStatus:
+    rec = _read_record(path) if path is not None else None
+    running = rec is not None and _alive(rec)
+    if path is not None and not running:
+        # clean stale pid
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            pass
+    return ServiceStatus(
+        name=name,
+        running=running,
+        pid=rec.pid if running and rec is not None else None,
+        log=str(_log_file(name)),
+        tier="—",
+    )
+
+
+def snapshot(pid_dir: Optional[Path] = None, organs_dir: Optional[Path] = None) -> StatusSnapshot:
+    """
+    Status of every service: each organ folder plus any pidfile of a service
+    outside the organs directory. Stale pidfiles are removed on the way.
+    Read-only otherwise: no directory is created.
+    """
+    pidfiles = _scan_pidfiles(pid_dir)
+    names = sorted(set(_organ_names(organs_dir) or ()) | set(pidfiles))
+    statuses = {name: _status_of(name, pidfiles.get(name)) for name in names}
+    return StatusSnapshot(taken_at=time.time(), statuses=statuses)
+
+
+def status(name: str) -> ServiceStatus:
+    path = _pid_file(name)
+    return _status_of(name, path if path.exists() else None)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Readiness probes for organs, declared in the spec under `ready`:
+
+    name: sentinel
+    tier: P0
+    ready:
+      tcp: 127.0.0.1:8443                   # a port accepts connections
+      http: http://127.0.0.1:8000/health    # GET answers 2xx (hardened main.py serves /health)
+      file: /opt/veil_os/var/run/sentinel.ready
+      timeout: 30                           # seconds (default READY_TIMEOUT)
+
+Every declared check must pass. An organ without `ready` counts as ready as
+soon as it is spawned. `tcp` also accepts a bare port (localhost).
+"""
+from __future__ import annotations
+
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
+READY_TIMEOUT = 30.0
+
+# Poll interval: doubles from POLL_INITIAL up to POLL_MAX.
+POLL_INITIAL = 0.05
+POLL_MAX = 1.0
+
+# A single connect/request never blocks longer than this.
+_ATTEMPT_TIMEOUT = 1.0
+
+
+class ReadinessError(RuntimeError):
+    """An organ did not become ready in time, or exited while starting."""
+
+
+def _tcp(target: Any) -> Tuple[str, Callable[[float], bool]]:
+    text = str(target)
+    host, _, port = text.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+
+    def check(timeout: float) -> bool:
+        try:
+            with socket.create_connection((host, int(port)), timeout=timeout):
+                return True
+        except OSError:
+            return False
+
+    return f"tcp {host}:{port}", check
+
+
+def _http(url: Any) -> Tuple[str, Callable[[float], bool]]:
+    url = str(url)
+
+    def check(timeout: float) -> bool:
+        import urllib.error
+        import urllib.request
+
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as resp:
+                return 200 <= resp.status < 300
+        except (urllib.error.URLError, OSError, ValueError):
+            return False
+
+    return f"http {url}", check
+
+
+def _file(path: Any) -> Tuple[str, Callable[[float], bool]]:
+    p = Path(path)
+    return f"file {p}", lambda timeout: p.exists()
+
+
+_PROBES = {"tcp": _tcp, "http": _http, "file": _file}
+
+
+class Probe:
+    """The readiness checks of one organ."""
+
+    __slots__ = ("checks", "timeout")
+
+    def __init__(self, checks: List[Tuple[str, Callable[[float], bool]]], timeout: float = READY_TIMEOUT) -> None:
+        self.checks = checks
+        self.timeout = timeout
+
+    @classmethod
+    def from_spec(cls, ready: Optional[Mapping[str, Any]]) -> "Probe":
+        """
+        Build from a spec's `ready` mapping.
+
+        Raises:
+            ValueError: unknown probe kind or malformed value
+        """
+        if not ready:
+            return cls([])
+        if not isinstance(ready, Mapping):
+            raise ValueError(f"'ready' must be a mapping, got {type(ready).__name__}")
+        checks = []
+        for kind, value in ready.items():
+            if kind == "timeout":
+                continue
+            if kind not in _PROBES:
+                raise ValueError(f"Unknown readiness probe '{kind}' (expected one of {', '.join(_PROBES)})")
+            checks.append(_PROBES[kind](value))
+        return cls(checks, float(ready.get("timeout", READY_TIMEOUT)))
+
+    @property
+    def label(self) -> str:
+        return ", ".join(label for label, _ in self.checks) or "spawned"
+
+    def wait(self, name: str, *, deadline: Optional[float] = None, alive: Optional[Callable[[], bool]] = None) -> None:
+        """
+        Block until every check passes.
+
+        Args:
+            deadline: time.monotonic() value not to wait past (global boot deadline)
+            alive: returns False once the organ is gone for good
+
+        Raises:
+            ReadinessError: timed out, or the organ exited
+        """
+        if not self.checks:
+            return
+        until = time.monotonic() + self.timeout
+        if deadline is not None:
+            until = min(until, deadline)
+        pending = list(self.checks)
+        interval = POLL_INITIAL
+        while True:
+            remaining = until - time.monotonic()
+            pending = [(label, check) for label, check in pending if not check(max(0.01, min(_ATTEMPT_TIMEOUT, remaining)))]
+            if not pending:
+                return
+            if alive is not None and not alive():
+                raise ReadinessError(f"Organ '{name}' exited before it was ready ({pending[0][0]})")
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                why = "boot deadline" if deadline is not None and until == deadline else f"{self.timeout:g}s timeout"
+                raise ReadinessError(f"Organ '{name}' not ready after {why}: {', '.join(l for l, _ in pending)}")
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, POLL_MAX)
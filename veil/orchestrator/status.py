@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ServiceStatus:
+    """Status of one organ, whichever orchestrator backend reports it."""
+    name: str
+    running: bool
+    pid: Optional[int]
+    log: str
+    tier: str = "P2"
+    state: str = ""      # supervisor state: running | backoff | stopping | stopped
+    restarts: int = 0
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Process-wide cache of the pidfile status snapshot (veil.orchestrator.pidfile).
+
+The hospital GUI lists every organ on each page load. Instead of rescanning
+the pid and organs directories each time, the last snapshot is reused until
+inotify reports a change in either directory. A read then costs one
+non-blocking read() on the inotify descriptor.
+
+Without inotify (not Linux, no libc symbol, a directory missing, watch limit
+reached) the snapshot is reused for STATUS_TTL seconds instead. Even with
+inotify it is rebuilt after STATUS_MAX_AGE seconds, because a process that
+dies without removing its pidfile changes nothing on disk.
+
+Example:
+    snap = default().snapshot()
+    snap.get("sentinel").running
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from . import pidfile
+from .pidfile import StatusSnapshot
+
+log = logging.getLogger(__name__)
+
+# Reuse window without inotify, and the upper bound with it.
+STATUS_TTL = 1.0
+STATUS_MAX_AGE = 10.0
+
+# <sys/inotify.h>
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+_WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+    | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")   # wd, mask, cookie, len (name follows)
+
+
+def _libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1, libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+    return libc
+
+
+class _Inotify:
+    """Non-blocking inotify descriptor watching a few directories."""
+
+    def __init__(self, paths: Sequence[Path]) -> None:
+        libc = _libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        for path in paths:
+            if libc.inotify_add_watch(fd, os.fsencode(path), _WATCH_MASK) < 0:
+                err = ctypes.get_errno()
+                self.close()
+                raise OSError(err, f"inotify_add_watch failed: {os.strerror(err)}", str(path))
+
+    def drain(self) -> Optional[int]:
+        """
+        Consume pending events. Returns how many there were, or None once a
+        watch is gone (directory deleted or moved) or the queue overflowed.
+        """
+        count = 0
+        while True:
+            try:
+                buf = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return count
+            offset = 0
+            while offset + _EVENT.size <= len(buf):
+                _, mask, _, length = _EVENT.unpack_from(buf, offset)
+                if mask & (IN_IGNORED | IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF):
+                    return None
+                offset += _EVENT.size + length
+                count += 1
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class StatusCache:
+    """
+    Shares one StatusSnapshot between all readers until the pid or organs
+    directory changes.
+
+    Args:
+        pid_dir / organs_dir: directories to watch (default: pidfile's)
+        ttl: reuse window when inotify is unavailable
+        max_age: rebuild after this long even without events
+    """
+
+    def __init__(
+        self,
+        pid_dir: Optional[Path] = None,
+        organs_dir: Optional[Path] = None,
+        *,
+        ttl: float = STATUS_TTL,
+        max_age: float = STATUS_MAX_AGE,
+    ) -> None:
+        self.dirs = (Path(pid_dir or pidfile.DEFAULT_PID_DIR), Path(organs_dir or pidfile.DEFAULT_ORGANS_DIR))
+        self.ttl = ttl
+        self.max_age = max_age
+        self.rebuilds = 0
+        self._lock = threading.Lock()
+        self._snap: Optional[StatusSnapshot] = None
+        self._built_at = 0.0
+        self._stale = True
+        self._pid = os.getpid()
+        self._inotify: Optional[_Inotify] = None
+        self._retry_watch = False
+        self._watch()
+
+    @property
+    def watching(self) -> bool:
+        return self._inotify is not None
+
+    def _watch(self) -> None:
+        try:
+            self._inotify = _Inotify(self.dirs)
+        except OSError as e:
+            log.debug("Status cache falls back to a %.1fs TTL: %s", self.ttl, e)
+            self._inotify = None
+            # A directory that does not exist yet can be watched once it does.
+            self._retry_watch = e.errno == errno.ENOENT
+
+    def snapshot(self) -> StatusSnapshot:
+        """The cached snapshot, rebuilt first if something changed."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked: the descriptor is shared with the parent, which drains it too.
+                self._pid = os.getpid()
+                self._close()
+                self._watch()
+                self._stale = True
+            now = time.monotonic()
+            if self._inotify is not None:
+                events = self._inotify.drain()
+                if events is None:
+                    self._close()
+                    self._stale = True
+                    self._retry_watch = True
+                elif events:
+                    self._stale = True
+                limit = self.max_age
+            else:
+                limit = self.ttl
+            if self._stale or self._snap is None or now - self._built_at >= limit:
+                self._snap = pidfile.snapshot(*self.dirs)
+                self._built_at = now
+                self._stale = False
+                self.rebuilds += 1
+                if self._inotify is None and self._retry_watch and all(d.is_dir() for d in self.dirs):
+                    self._watch()
+            return self._snap
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next read (e.g. right after a start or stop)."""
+        with self._lock:
+            self._stale = True
+
+    def close(self) -> None:
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+
+_DEFAULT: Dict[tuple, StatusCache] = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default() -> StatusCache:
+    """The process-wide cache for pidfile's current directories."""
+    key = (pidfile.DEFAULT_PID_DIR, pidfile.DEFAULT_ORGANS_DIR)
+    with _DEFAULT_LOCK:
+        cache = _DEFAULT.get(key)
+        if cache is None:
+            cache = _DEFAULT[key] = StatusCache(*key)
+        return cache
+
+
+def invalidate() -> None:
+    """Drop every cached snapshot of this process."""
+    with _DEFAULT_LOCK:
+        caches = list(_DEFAULT.values())
+    for cache in caches:
+        cache.invalidate()
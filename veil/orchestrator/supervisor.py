@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+In-process supervisor for Veil OS organs.
+
+Each organ is /opt/veil_os/organs/<name>/run.sh. The supervisor spawns it in
+its own session with stdout/stderr appended to the organ log, reaps it as soon
+as it exits, and restarts it with exponential backoff until it is stopped.
+
+Children are reaped event-driven, never by polling: every child gets a pidfd
+(Linux >= 5.3) watched by one selector thread, which also runs the restart
+timers. Where pidfd_open() is unavailable, a waiter thread per child blocks in
+waitpid() instead.
+
+Status is served from the in-memory table; nothing is read from disk. Each
+running child also gets a "<pid> <start_ticks>" pidfile in the pid directory
+so other processes can see it. The organ, log and pid directories are those of
+veil.orchestrator.pidfile, so every backend agrees on where organs live.
+
+Example:
+    sup = default()
+    sup.start("sentinel", tier="P0")
+    sup.status("sentinel").running
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import selectors
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import pidfile
+from .status import ServiceStatus
+
+log = logging.getLogger(__name__)
+
+# Restart delay: doubles from BACKOFF_INITIAL up to BACKOFF_MAX, and resets once
+# an organ stayed up for STABLE_AFTER seconds.
+BACKOFF_INITIAL = 1.0
+BACKOFF_MAX = 60.0
+STABLE_AFTER = 30.0
+
+# Grace period between SIGTERM and SIGKILL on stop().
+STOP_TIMEOUT = 10.0
+
+_HAS_PIDFD = hasattr(os, "pidfd_open")
+
+
+class _Child:
+    __slots__ = (
+        "name", "tier", "proc", "pidfd", "state", "wanted", "restarts",
+        "started_at", "exit_code", "delay", "generation",
+    )
+
+    def __init__(self, name: str, tier: str) -> None:
+        self.name = name
+        self.tier = tier
+        self.proc: Optional[subprocess.Popen] = None
+        self.pidfd: Optional[int] = None
+        self.state = "stopped"   # running | backoff | stopping | stopped
+        self.wanted = False      # restart when it exits
+        self.restarts = 0
+        self.started_at = 0.0
+        self.exit_code: Optional[int] = None
+        self.delay = 0.0
+        self.generation = 0      # invalidates restart timers of an earlier start()
+
+
+class Supervisor:
+    """
+    Spawns, reaps and restarts organ processes. Thread-safe.
+
+    Args:
+        organs_dir: directory of organ folders, each with an executable run.sh
+            (default pidfile.DEFAULT_ORGANS_DIR)
+        log_dir: where <name>.log is appended to (default pidfile.DEFAULT_LOG_DIR)
+        pid_dir: where <name>.pid is kept while the organ runs
+            (default pidfile.DEFAULT_PID_DIR)
+    """
+
+    def __init__(
+        self,
+        organs_dir: Optional[Path] = None,
+        log_dir: Optional[Path] = None,
+        pid_dir: Optional[Path] = None,
+        *,
+        backoff_initial: float = BACKOFF_INITIAL,
+        backoff_max: float = BACKOFF_MAX,
+        stable_after: float = STABLE_AFTER,
+    ) -> None:
+        self.organs_dir = Path(organs_dir or pidfile.DEFAULT_ORGANS_DIR)
+        self.log_dir = Path(log_dir or pidfile.DEFAULT_LOG_DIR)
+        self.pid_dir = Path(pid_dir or pidfile.DEFAULT_PID_DIR)
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+
+        self._children: Dict[str, _Child] = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._timers: List[Tuple[float, int, str, int]] = []
+        self._seq = 0
+        self._closed = False
+
+        self._sel = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._sel.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._loop, name="veil-supervisor", daemon=True)
+        self._thread.start()
+
+    # ----------------------------
+    # Public API
+    # ----------------------------
+
+    def start(self, name: str, *, tier: str = "P2") -> ServiceStatus:
+        """
+        Start an organ (no-op if it is already running or waiting to restart).
+
+        Raises:
+            FileNotFoundError: the organ has no run.sh
+        """
+        script = self.organs_dir / name / "run.sh"
+        if not script.is_file():
+            raise FileNotFoundError(f"❌ No run.sh for organ '{name}': {script}")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("❌ Supervisor is shut down.")
+            child = self._children.get(name)
+            if child is None:
+                child = self._children[name] = _Child(name, tier)
+            # A stop() in progress owns the process until it is reaped.
+            while child.state == "stopping":
+                self._changed.wait()
+            if self._closed:
+                raise RuntimeError("❌ Supervisor is shut down.")
+            child.tier = tier
+            if child.wanted and child.state in ("running", "backoff"):
+                return self._status(child)
+            child.wanted = True
+            child.generation += 1
+            child.delay = 0.0
+            self._spawn(child)
+            return self._status(child)
+
+    def stop(self, name: str, *, force: bool = False, timeout: float = STOP_TIMEOUT) -> ServiceStatus:
+        """
+        Stop an organ and disable its restarts: SIGTERM to its process group,
+        SIGKILL after `timeout` seconds (or right away with force=True).
+        """
+        with self._lock:
+            child = self._children.get(name)
+            if child is None:
+                return ServiceStatus(name=name, running=False, pid=None, log=str(self._log(name)), state="stopped")
+            child.wanted = False
+            child.generation += 1
+            if child.proc is None:
+                child.state = "stopped"
+                return self._status(child)
+            child.state = "stopping"
+            proc = child.proc
+            self._signal(proc, signal.SIGKILL if force else signal.SIGTERM)
+            deadline = time.monotonic() + timeout
+            # Wait for (and escalate against) only the process signalled here.
+            while child.proc is proc:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    self._signal(proc, signal.SIGKILL)
+                    deadline = time.monotonic() + timeout
+                    left = timeout
+                self._changed.wait(left)
+            return self._status(child)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._children
+
+    def status(self, name: str) -> ServiceStatus:
+        with self._lock:
+            child = self._children.get(name)
+            if child is None:
+                return ServiceStatus(name=name, running=False, pid=None, log=str(self._log(name)), state="stopped")
+            return self._status(child)
+
+    def statuses(self) -> List[ServiceStatus]:
+        with self._lock:
+            return [self._status(c) for c in self._children.values()]
+
+    def wait_for(self, name: str, predicate, timeout: float) -> bool:
+        """Block until predicate(status) holds (re-checked on every state change)."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while not predicate(self.status(name)):
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._changed.wait(left)
+            return True
+
+    def shutdown(self, timeout: float = STOP_TIMEOUT) -> None:
+        """Stop every organ and the supervisor thread."""
+        with self._lock:
+            names = list(self._children)
+        for name in names:
+            self.stop(name, timeout=timeout)
+        with self._lock:
+            self._closed = True
+        self._wake()
+        self._thread.join(timeout)
+        with self._lock:
+            self._sel.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._wake_w = -1
+
+    def serve_forever(self) -> None:
+        """Supervise until SIGTERM/SIGINT, then shut down (main thread only)."""
+        stop = threading.Event()
+        previous = {sig: signal.signal(sig, lambda *_: stop.set()) for sig in (signal.SIGTERM, signal.SIGINT)}
+        try:
+            while not stop.wait(3600):
+                pass
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            self.shutdown()
+
+    # ----------------------------
+    # Internals (called with self._lock held)
+    # ----------------------------
+
+    def _log(self, name: str) -> Path:
+        return pidfile._log_file(name, self.log_dir)
+
+    def _status(self, child: _Child) -> ServiceStatus:
+        return ServiceStatus(
+            name=child.name,
+            running=child.proc is not None,
+            pid=child.proc.pid if child.proc is not None else None,
+            log=str(self._log(child.name)),
+            tier=child.tier,
+            state=child.state,
+            restarts=child.restarts,
+        )
+
+    def _spawn(self, child: _Child) -> None:
+        organ_dir = self.organs_dir / child.name
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            with open(self._log(child.name), "ab", buffering=0) as out:
+                proc = subprocess.Popen(
+                    [str(organ_dir / "run.sh")],
+                    cwd=organ_dir,
+                    stdin=subprocess.DEVNULL,
+                    stdout=out,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,   # own process group: stop() signals the whole organ
+                )
+        except OSError as e:
+            log.error("❌ Organ '%s' failed to spawn: %s", child.name, e)
+            child.exit_code = None
+            self._exited(child, spawn_error=True)
+            return
+
+        child.proc = proc
+        child.state = "running"
+        child.started_at = time.monotonic()
+        child.exit_code = None
+        log.info("🟢 Organ '%s' started (pid=%s)", child.name, proc.pid)
+        self._write_pid(child.name, proc.pid)
+
+        pidfd = None
+        if _HAS_PIDFD:
+            try:
+                pidfd = os.pidfd_open(proc.pid)
+            except OSError:
+                pidfd = None
+        if pidfd is not None:
+            child.pidfd = pidfd
+            self._sel.register(pidfd, selectors.EVENT_READ, (child, proc))
+            self._wake()
+        else:
+            threading.Thread(
+                target=self._wait_blocking, args=(child, proc), name=f"veil-reap-{child.name}", daemon=True
+            ).start()
+        self._changed.notify_all()
+
+    def _write_pid(self, name: str, pid: int) -> None:
+        try:
+            self.pid_dir.mkdir(parents=True, exist_ok=True)
+            pidfile.write_pid(name, pid, self.pid_dir)
+        except OSError as e:
+            log.warning("⚠️ Could not write pidfile for '%s': %s", name, e)
+
+    def _remove_pid(self, name: str, pid: int) -> None:
+        try:
+            pidfile.remove_pid(name, pid, self.pid_dir)
+        except OSError:
+            pass
+
+    def _signal(self, proc: Optional[subprocess.Popen], sig: int) -> None:
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            os.killpg(proc.pid, sig)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            proc.send_signal(sig)
+
+    def _reaped(self, child: _Child, proc: subprocess.Popen, wait_status: int) -> None:
+        proc.returncode = os.waitstatus_to_exitcode(wait_status)
+        with self._lock:
+            if child.pidfd is not None:
+                try:
+                    self._sel.unregister(child.pidfd)
+                except (KeyError, ValueError):
+                    pass
+                os.close(child.pidfd)
+                child.pidfd = None
+            self._remove_pid(child.name, proc.pid)
+            if child.proc is not proc:
+                return
+            child.proc = None
+            child.exit_code = proc.returncode
+            self._exited(child)
+
+    def _exited(self, child: _Child, spawn_error: bool = False) -> None:
+        if not child.wanted:
+            child.state = "stopped"
+            log.info("Organ '%s' stopped (exit=%s)", child.name, child.exit_code)
+            self._changed.notify_all()
+            return
+
+        uptime = 0.0 if spawn_error else time.monotonic() - child.started_at
+        if uptime >= self.stable_after or child.delay == 0.0:
+            child.delay = self.backoff_initial
+        else:
+            child.delay = min(child.delay * 2, self.backoff_max)
+        child.state = "backoff"
+        log.warning(
+            "⚠️ Organ '%s' exited (exit=%s); restarting in %.1fs", child.name, child.exit_code, child.delay
+        )
+        self._seq += 1
+        heapq.heappush(self._timers, (time.monotonic() + child.delay, self._seq, child.name, child.generation))
+        self._wake()
+        self._changed.notify_all()
+
+    def _restart_due(self) -> float:
+        """Spawn organs whose backoff elapsed; returns seconds until the next timer."""
+        now = time.monotonic()
+        with self._lock:
+            while self._timers and self._timers[0][0] <= now:
+                _, _, name, generation = heapq.heappop(self._timers)
+                child = self._children.get(name)
+                if child is None or not child.wanted or child.generation != generation or child.proc is not None:
+                    continue
+                child.restarts += 1
+                self._spawn(child)
+            return self._timers[0][0] - now if self._timers else 3600.0
+
+    # ----------------------------
+    # Reaper thread(s)
+    # ----------------------------
+
+    def _wake(self) -> None:
+        if self._wake_w < 0:
+            return
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # a wakeup is already pending
+
+    def _loop(self) -> None:
+        while True:
+            timeout = self._restart_due()
+            with self._lock:
+                if self._closed:
+                    return
+            for key, _ in self._sel.select(max(0.0, timeout)):
+                if key.data is None:
+                    try:
+                        while os.read(self._wake_r, 4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+                child, proc = key.data
+                try:
+                    pid, wait_status = os.waitpid(proc.pid, os.WNOHANG)
+                except ChildProcessError:
+                    pid, wait_status = proc.pid, 0
+                if pid:
+                    self._reaped(child, proc, wait_status)
+
+    def _wait_blocking(self, child: _Child, proc: subprocess.Popen) -> None:
+        try:
+            _, wait_status = os.waitpid(proc.pid, 0)
+        except ChildProcessError:
+            wait_status = 0
+        self._reaped(child, proc, wait_status)
+
+
+_DEFAULT: Optional[Supervisor] = None
+_DEFAULT_LOCK = threading.Lock()
+_OWNED = False
+
+
+def default() -> Supervisor:
+    """The process-wide supervisor used by veil.orchestrator.start()/stop()."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = Supervisor()
+        return _DEFAULT
+
+
+def running() -> Optional[Supervisor]:
+    """The process-wide supervisor if one was created, without creating it."""
+    return _DEFAULT
+
+
+def own() -> Supervisor:
+    """
+    Declare this process the long-lived owner of the default supervisor, i.e.
+    one that ends in serve_forever() (the boot service). Only an owning
+    process spawns organs under its supervisor through the "supervisor"
+    backend; anywhere else (a CLI call, the GUI) organs are started detached,
+    as the "pidfile" backend does, so they outlive the caller.
+    """
+    global _OWNED
+    sup = default()
+    _OWNED = True
+    return sup
+
+
+def owned() -> Optional[Supervisor]:
+    """The default supervisor if this process owns it (see own())."""
+    return _DEFAULT if _OWNED else None
@@ -1,5 +1,15 @@
 import yaml
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, List, Union
+
+# libyaml-backed loader when PyYAML was built with it (several times faster)
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_documents(stream: Union[str, bytes, IO]) -> List[Dict[str, Any]]:
+    """Every mapping document in a YAML stream (empty documents are skipped)."""
+    return [doc for doc in yaml.load_all(stream, Loader=SafeLoader) if isinstance(doc, dict)]
+
 
 @dataclass
 class Organ:
@@ -7,12 +17,31 @@ class Organ:
     tier: str
     glyph: str
     affirmation: str
+    # Organs that must be active first (compiled as a DAG; see veil.scheduler)
+    depends_on: List[str] = field(default_factory=list)
+    # Readiness probes checked at boot (see veil.orchestrator.readiness)
+    ready: Dict[str, Any] = field(default_factory=dict)
 
     @staticmethod
     def from_yaml(path):
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        """
+        Single organ spec. A bundled multi-document file must go through
+        load_all() instead.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.load(f, Loader=SafeLoader)
         return Organ(**data)
 
+    @staticmethod
+    def from_yaml_stream(stream):
+        """Every organ in a (possibly multi-document) YAML stream or string."""
+        return [Organ(**doc) for doc in load_documents(stream)]
+
+    @staticmethod
+    def load_all(path):
+        """Every organ in a spec file, read once; bundles like all_organs.yaml included."""
+        with open(path, "r", encoding="utf-8") as f:
+            return Organ.from_yaml_stream(f)
+
     def activate(self):
         print(f"⚡ Organ '{self.name}' activated.")
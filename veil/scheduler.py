@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .organ import Organ
+
+log = logging.getLogger(__name__)
+
+# Organs activated at the same time (compile_* workers=None)
+DEFAULT_WORKERS = 8
+
+# Tier barrier order; unknown tiers come after these, by name.
+TIER_ORDER = ("P0", "P1", "P2")
+
+
+@dataclass(frozen=True, slots=True)
+class Activation:
+    """Outcome of one organ's activation."""
+    organ: Organ
+    started: Optional[float] = None   # time.time() at start; None if it never started
+    finished: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.started is not None and self.error is None
+
+
+class DependencyError(ValueError):
+    """Organ specs declare an unknown dependency or a dependency cycle."""
+
+
+def first_failure(activations: Sequence[Activation]) -> Optional[Activation]:
+    """The failed activation that finished first (what a serial run would have hit)."""
+    failed = [a for a in activations if a.error is not None]
+    return min(failed, key=lambda a: a.finished or 0.0) if failed else None
+
+
+# ----------------------------
+# Dependency graph
+# ----------------------------
+
+def _tier_rank(tier: str) -> Tuple[int, str]:
+    return (TIER_ORDER.index(tier), "") if tier in TIER_ORDER else (len(TIER_ORDER), tier)
+
+
+def _depends_on(organ: Any) -> Tuple[str, ...]:
+    deps = getattr(organ, "depends_on", None) or ()
+    return (deps,) if isinstance(deps, str) else tuple(str(d) for d in deps)
+
+
+def build_graph(organs: Sequence[Any], *, known: Iterable[str] = ()) -> List[Tuple[Set[int], Set[int]]]:
+    """
+    Prerequisites of each organ, as (hard, barrier) sets of indices into `organs`.
+
+    - hard: the organ's own `depends_on`. It does not start before these
+      succeeded, and is skipped if one of them failed.
+    - barrier: organs without `depends_on` keep today's tier barrier: they wait
+      for every organ of a lower tier to finish (success or not).
+
+    Dependencies on organs outside `organs` but listed in `known` count as already
+    satisfied (e.g. a lower tier compiled earlier).
+
+    Raises:
+        DependencyError: unknown dependency or a cycle
+    """
+    index = {o.name: i for i, o in enumerate(organs)}
+    known = set(known) | set(index)
+    ranks = [_tier_rank(o.tier) for o in organs]
+
+    graph: List[Tuple[Set[int], Set[int]]] = []
+    for i, organ in enumerate(organs):
+        deps = _depends_on(organ)
+        hard: Set[int] = set()
+        for d in deps:
+            if d not in known:
+                raise DependencyError(f"❌ Organ '{organ.name}' depends on unknown organ '{d}'.")
+            if d == organ.name:
+                raise DependencyError(f"❌ Organ dependency cycle: {d} -> {d}")
+            if d in index:
+                hard.add(index[d])
+        barrier = set() if deps else {j for j, r in enumerate(ranks) if r < ranks[i]}
+        graph.append((hard, barrier))
+
+    _check_acyclic(organs, graph)
+    return graph
+
+
+def _check_acyclic(organs: Sequence[Any], graph: List[Tuple[Set[int], Set[int]]]) -> None:
+    pending = [len(hard | barrier) for hard, barrier in graph]
+    dependents: List[List[int]] = [[] for _ in organs]
+    for i, (hard, barrier) in enumerate(graph):
+        for j in hard | barrier:
+            dependents[j].append(i)
+    ready = [i for i, n in enumerate(pending) if n == 0]
+    done = 0
+    while ready:
+        i = ready.pop()
+        done += 1
+        for k in dependents[i]:
+            pending[k] -= 1
+            if pending[k] == 0:
+                ready.append(k)
+    if done == len(organs):
+        return
+
+    # Walk unresolved prerequisites from any stuck organ until a name repeats.
+    path: List[int] = []
+    i = next(i for i, n in enumerate(pending) if n)
+    while i not in path:
+        path.append(i)
+        hard, barrier = graph[i]
+        i = next(j for j in sorted(hard | barrier) if pending[j])
+    cycle = path[path.index(i):] + [i]
+    raise DependencyError("❌ Organ dependency cycle: " + " -> ".join(organs[j].name for j in cycle))
+
+
+# ----------------------------
+# Scheduler
+# ----------------------------
+
+def run_graph(
+    organs: Sequence[Any],
+    *,
+    workers: Optional[int] = None,
+    strict: bool = True,
+    known: Iterable[str] = (),
+    action: Optional[Callable[[Any], None]] = None,
+) -> List[Activation]:
+    """
+    Activate organs as a topological wavefront on a bounded thread pool.
+
+    Each organ starts as soon as its prerequisites (see build_graph) are done,
+    so independent organs start early while dependents wait. Results are in
+    `organs` order whatever the completion order, so callers can record them
+    deterministically. The call returns only when every started activation
+    has finished.
+
+    action(organ) replaces organ.activate() (e.g. starting a service at boot).
+
+    strict=True: after the first failure no further organ is started; running
+    ones are allowed to finish. Failures are reported in the result, not
+    raised; see first_failure(). workers=1 with no depends_on reproduces the
+    serial tier-by-tier behaviour exactly.
+
+    Returns:
+        one Activation per organ, in input order
+    """
+    graph = build_graph(organs, known=known)
+    workers = max(1, min(workers or DEFAULT_WORKERS, len(organs) or 1))
+
+    pending = [len(hard | barrier) for hard, barrier in graph]
+    dependents: List[List[int]] = [[] for _ in organs]
+    for i, (hard, barrier) in enumerate(graph):
+        for j in hard | barrier:
+            dependents[j].append(i)
+
+    started: List[Optional[float]] = [None] * len(organs)
+    finished: List[Optional[float]] = [None] * len(organs)
+    errors: List[Optional[BaseException]] = [None] * len(organs)
+    blocked = [False] * len(organs)
+    stop = threading.Event()
+
+    def activate(i: int) -> None:
+        if stop.is_set():
+            return
+        organ = organs[i]
+        log.info("→ %s", organ.name)
+        started[i] = time.time()
+        try:
+            if action is None:
+                organ.activate()
+            else:
+                action(organ)
+        except BaseException:
+            if strict:
+                stop.set()
+            raise
+        finally:
+            finished[i] = time.time()
+
+    ready = [i for i, n in enumerate(pending) if n == 0]
+
+    def settle(i: int, ok: bool) -> None:
+        # Release the dependents of a finished (or skipped) organ.
+        stack = [(i, ok)]
+        while stack:
+            j, j_ok = stack.pop()
+            for k in dependents[j]:
+                if not j_ok and j in graph[k][0]:
+                    blocked[k] = True
+                pending[k] -= 1
+                if pending[k] == 0:
+                    if blocked[k]:
+                        log.warning("⚠️ Skipping %s: a dependency failed.", organs[k].name)
+                        stack.append((k, False))
+                    else:
+                        ready.append(k)
+
+    running: Dict[Future, int] = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="veil-organ") as pool:
+        while ready or running:
+            # Ready organs start in input order (tier, then spec order).
+            ready.sort()
+            while ready and len(running) < workers and not stop.is_set():
+                i = ready.pop(0)
+                running[pool.submit(activate, i)] = i
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in sorted(done, key=running.__getitem__):
+                i = running.pop(fut)
+                errors[i] = fut.exception()
+                settle(i, errors[i] is None and started[i] is not None)
+
+    activations: List[Activation] = []
+    for i, organ in enumerate(organs):
+        if errors[i] is not None:
+            log.error("❌ Organ activation failed: %s (tier=%s)", organ.name, organ.tier, exc_info=errors[i])
+        activations.append(Activation(organ=organ, started=started[i], finished=finished[i], error=errors[i]))
+    return activations
+
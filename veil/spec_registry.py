@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .organ import Organ, load_documents
+
+log = logging.getLogger(__name__)
+
+# Directory containing YAML organ specs
+SPECS: Path = Path(__file__).parent / "specs"
+
+# Parsed specs persisted between runs, keyed by absolute spec path and
+# validated against (mtime_ns, size), so a cold start skips YAML parsing.
+SPEC_CACHE_PATH: Path = Path("/opt/veil_os/cache/organ_specs.json")
+
+CACHE_VERSION = 1
+
+# (mtime_ns, size) of a spec file when it was parsed
+_Stamp = Tuple[int, int]
+
+
+def _stamp(path: Path) -> _Stamp:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _parse(path: Path) -> List[Dict[str, Any]]:
+    """Every mapping document of a (possibly multi-document) spec file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return load_documents(f)
+
+
+class _Entry:
+    """One parsed spec file; Organ objects are built on first use."""
+
+    __slots__ = ("stamp", "docs", "named", "_organs")
+
+    def __init__(self, stamp: _Stamp, docs: List[Dict[str, Any]]) -> None:
+        self.stamp = stamp
+        self.docs = docs
+        self.named = [doc for doc in docs if doc.get("name") is not None]
+        self._organs: Dict[int, Organ] = {}
+
+    def organ(self, i: int) -> Organ:
+        organ = self._organs.get(i)
+        if organ is None:
+            organ = self._organs[i] = Organ(**self.named[i])
+        return organ
+
+
+class SpecRegistry:
+    """
+    Parsed organ specs of one spec directory.
+
+    Each file is parsed once and re-parsed only when its (mtime, size) changes;
+    refresh() is just a stat per file. Multi-document files contribute every
+    document. When two documents share a name, the one from the later file
+    (in file-name order) wins, so a per-organ file overrides all_organs.yaml.
+
+    Example:
+        for organ in registry().by_tier("P0"):
+            organ.activate()
+    """
+
+    def __init__(self, spec_dir: Path = SPECS, *, cache_path: Optional[Path] = None) -> None:
+        self.spec_dir = Path(spec_dir)
+        self.cache_path = cache_path
+        self.parsed = 0
+        self._lock = threading.RLock()
+        self._files: Dict[str, _Entry] = {}
+        self._disk: Optional[Dict[str, Any]] = None
+        self._by_name: Optional[Dict[str, Tuple[_Entry, int]]] = None
+
+    # --- disk cache ---
+
+    def _read_cache(self) -> Dict[str, Any]:
+        if self.cache_path is None:
+            return {}
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        files = data.get("files")
+        return files if isinstance(files, dict) else {}
+
+    def _write_cache(self) -> None:
+        if self.cache_path is None:
+            return
+        prefix = str(self.spec_dir.resolve()) + os.sep
+        files = {p: e for p, e in self._read_cache().items() if not p.startswith(prefix)}
+        for p, entry in self._files.items():
+            files[p] = {"mtime_ns": entry.stamp[0], "size": entry.stamp[1], "docs": entry.docs}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_suffix(f"{self.cache_path.suffix}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps({"version": CACHE_VERSION, "files": files}, ensure_ascii=False), encoding="utf-8")
+            tmp.replace(self.cache_path)
+        except (OSError, TypeError, ValueError) as e:
+            log.debug("Spec cache not written (%s): %s", self.cache_path, e)
+
+    def _from_disk(self, key: str, stamp: _Stamp) -> Optional[_Entry]:
+        if self._disk is None:
+            self._disk = self._read_cache()
+        e = self._disk.pop(key, None)
+        try:
+            if e is not None and (int(e["mtime_ns"]), int(e["size"])) == stamp:
+                return _Entry(stamp, [doc for doc in e["docs"] if isinstance(doc, dict)])
+        except (KeyError, TypeError, ValueError):
+            pass
+        return None
+
+    # --- refresh ---
+
+    def refresh(self) -> bool:
+        """
+        Re-stat the spec directory and re-parse changed files.
+
+        Returns:
+            True if anything changed since the last refresh
+        """
+        with self._lock:
+            paths = sorted(self.spec_dir.glob("*.yaml"), key=lambda p: p.name) if self.spec_dir.is_dir() else []
+            seen: Dict[str, _Entry] = {}
+            parsed = False
+            for path in paths:
+                key = str(path.resolve())
+                stamp = _stamp(path)
+                entry = self._files.get(key)
+                if entry is None or entry.stamp != stamp:
+                    entry = self._from_disk(key, stamp)
+                if entry is None:
+                    entry = _Entry(stamp, _parse(path))
+                    self.parsed += 1
+                    parsed = True
+                seen[key] = entry
+
+            removed = any(key not in seen for key in self._files)
+            changed = list(seen) != list(self._files) or any(
+                entry is not self._files.get(key) for key, entry in seen.items()
+            )
+            self._files = seen
+            if changed:
+                self._by_name = None
+            if parsed or removed:
+                self._write_cache()
+            return changed
+
+    # --- views ---
+
+    def _named(self) -> Dict[str, Tuple[_Entry, int]]:
+        self.refresh()
+        with self._lock:
+            if self._by_name is None:
+                by_name: Dict[str, Tuple[_Entry, int]] = {}
+                for entry in self._files.values():
+                    for i, doc in enumerate(entry.named):
+                        name = str(doc["name"])
+                        if name in by_name:
+                            log.debug("Organ spec %r redefined; keeping the later definition.", name)
+                            del by_name[name]
+                        by_name[name] = (entry, i)
+                self._by_name = by_name
+            return self._by_name
+
+    def documents(self) -> List[Dict[str, Any]]:
+        """
+        Spec documents (raw dicts), de-duplicated by name, in file-name order.
+        """
+        return [entry.named[i] for entry, i in self._named().values()]
+
+    def document(self, name: str) -> Optional[Dict[str, Any]]:
+        found = self._named().get(name)
+        return None if found is None else found[0].named[found[1]]
+
+    def organs(self) -> List[Organ]:
+        """
+        Organ objects for every spec document, de-duplicated by name. Organs of
+        unchanged files are reused between calls.
+        """
+        named = self._named()
+        with self._lock:
+            return [entry.organ(i) for entry, i in named.values()]
+
+    def get(self, name: str) -> Optional[Organ]:
+        found = self._named().get(name)
+        if found is None:
+            return None
+        with self._lock:
+            return found[0].organ(found[1])
+
+    def by_tier(self, tier: str) -> List[Organ]:
+        return [o for o in self.organs() if o.tier == tier]
+
+
+_REGISTRIES: Dict[Path, SpecRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def registry(spec_dir: Path = SPECS) -> SpecRegistry:
+    """
+    Shared registry for a spec directory (one per process), backed by
+    SPEC_CACHE_PATH.
+    """
+    key = Path(spec_dir).resolve()
+    with _REGISTRIES_LOCK:
+        reg = _REGISTRIES.get(key)
+        if reg is None:
+            reg = _REGISTRIES[key] = SpecRegistry(key, cache_path=SPEC_CACHE_PATH)
+        return reg
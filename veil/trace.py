@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Lightweight, opt-in instrumentation of the compile pipeline.
+#
+# Spans are recorded only inside `with tracing() as tracer:`; otherwise span()
+# costs one global lookup. Timings use time.perf_counter_ns() (monotonic).
+#
+# Example:
+#     with tracing() as tracer:
+#         compile_all(harden=False)
+#     print(tracer.summary())
+#     tracer.write_chrome_trace("compile.trace.json")   # chrome://tracing, Perfetto
+
+
+class Span:
+    """One timed region. `attrs` holds counters such as bytes or entries."""
+
+    __slots__ = ("name", "parent", "tid", "start_ns", "end_ns", "attrs")
+
+    def __init__(self, name: str, parent: Optional["Span"], attrs: Dict[str, Any]) -> None:
+        self.name = name
+        self.parent = parent
+        self.tid = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns: Optional[int] = None
+        self.attrs = attrs
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.perf_counter_ns()) - self.start_ns
+
+    def add(self, **counts: Any) -> None:
+        """Add to numeric counters (e.g. bytes=len(data)); other values are set."""
+        for k, v in counts.items():
+            if isinstance(v, (int, float)) and isinstance(self.attrs.get(k), (int, float)):
+                self.attrs[k] += v
+            else:
+                self.attrs[k] = v
+
+    def path(self) -> Tuple[str, ...]:
+        names: List[str] = []
+        span: Optional[Span] = self
+        while span is not None:
+            names.append(span.name)
+            span = span.parent
+        return tuple(reversed(names))
+
+
+class Tracer:
+    """Collects finished spans of every thread."""
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # --- recording ---
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attrs: Any) -> Iterator[Span]:
+        stack = self._stack()
+        s = Span(name, parent if parent is not None else (stack[-1] if stack else None), attrs)
+        stack.append(s)
+        try:
+            yield s
+        finally:
+            s.end_ns = time.perf_counter_ns()
+            stack.pop()
+            with self._lock:
+                self.spans.append(s)
+
+    # --- reports ---
+
+    def _aggregate(self) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        agg: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            row = agg.setdefault(s.path(), {"ns": 0, "count": 0, "counters": {}})
+            row["ns"] += s.duration_ns
+            row["count"] += 1
+            for k, v in s.attrs.items():
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    row["counters"][k] = row["counters"].get(k, 0) + v
+        return agg
+
+    def summary(self) -> str:
+        """
+        Flame-style text report: spans aggregated by call path, nested by
+        indentation, with total time, share of the root(s), call count and
+        counters. Concurrent children (e.g. organ activations) are summed, so
+        they can add up to more than their parent's wall time.
+        """
+        agg = self._aggregate()
+        if not agg:
+            return "🧾 Profile: no spans recorded."
+        total = sum(row["ns"] for path, row in agg.items() if len(path) == 1) or 1
+
+        def children(prefix: Tuple[str, ...]) -> List[Tuple[str, ...]]:
+            paths = [p for p in agg if len(p) == len(prefix) + 1 and p[: len(prefix)] == prefix]
+            return sorted(paths, key=lambda p: -agg[p]["ns"])
+
+        lines = [f"🧾 Profile (total {total / 1e6:.1f} ms)"]
+
+        def emit(path: Tuple[str, ...]) -> None:
+            row = agg[path]
+            label = "  " * (len(path) - 1) + path[-1]
+            extra = "".join(f"  {k}={_fmt_count(k, v)}" for k, v in sorted(row["counters"].items()))
+            lines.append(
+                f"{label:<40} {row['ns'] / 1e6:>10.1f} ms {100 * row['ns'] / total:>6.1f}%  x{row['count']}{extra}"
+            )
+            for child in children(path):
+                emit(child)
+
+        for root in children(()):
+            emit(root)
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Trace Event Format ("X" complete events), loadable in chrome://tracing or Perfetto."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start_ns)
+        origin = spans[0].start_ns if spans else 0
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "cat": s.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (s.start_ns - origin) / 1e3,
+                "dur": s.duration_ns / 1e3,
+                "pid": pid,
+                "tid": s.tid,
+                "args": {k: v if isinstance(v, (int, float, str, bool)) else str(v) for k, v in s.attrs.items()},
+            }
+            for s in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return path
+
+
+def _fmt_count(key: str, value: float) -> str:
+    if key != "bytes":
+        return f"{value:g}"
+    for unit in ("B", "KiB", "MiB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+# ----------------------------
+# Module-level API
+# ----------------------------
+
+_TRACER: Optional[Tracer] = None
+
+
+@contextmanager
+def tracing() -> Iterator[Tracer]:
+    """Record spans from every thread of this process for the duration of the block."""
+    global _TRACER
+    previous, _TRACER = _TRACER, Tracer()
+    try:
+        yield _TRACER
+    finally:
+        _TRACER = previous
+
+
+class _NoSpan:
+    """Stand-in span (and its own context manager) while not tracing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+    def add(self, **counts: Any) -> None:
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+def span(name: str, parent: Optional[Span] = None, **attrs: Any):
+    """
+    Time a region as a child of the current span of this thread (or `parent`,
+    for work handed to another thread). A no-op unless tracing() is active.
+
+    Example:
+        with span("ledger.write") as s:
+            s.add(bytes=len(data))
+    """
+    tracer = _TRACER
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, parent, **attrs)
+
+
+def current() -> Optional[Span]:
+    """The innermost open span of this thread, if tracing."""
+    tracer = _TRACER
+    return None if tracer is None else tracer.current()